@@ -0,0 +1,25 @@
+import { readFileSync } from 'fs';
+import { join } from 'path';
+
+import { scenarioSchema } from '../../src/data-schemas/scenario';
+
+const serverSchemaPath = join(
+  __filename,
+  '../../../../server/macquette/v2/schemas/assessment-data-1.json',
+);
+
+describe('server JSON Schema for assessment data', () => {
+  // The server checks saves against its own copy of the scenario schema, which
+  // has to be kept in step by hand.
+  it('has the same scenario fields as the client schema', () => {
+    // SAFETY: if it has another shape, the test fails
+    // eslint-disable-next-line @typescript-eslint/consistent-type-assertions
+    const serverSchema = JSON.parse(readFileSync(serverSchemaPath, 'utf-8')) as {
+      definitions: { scenario: { properties: Record<string, unknown> } };
+    };
+    const serverFields = Object.keys(serverSchema.definitions.scenario.properties);
+    const clientFields = Object.keys(scenarioSchema.unwrap().shape);
+
+    expect(serverFields.sort()).toEqual(clientFields.sort());
+  });
+});
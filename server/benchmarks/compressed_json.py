@@ -0,0 +1,141 @@
+"""
+Compare storing JSON in a `jsonb` column, which Postgres compresses with pglz,
+with storing it zstd-compressed in a `bytea` column, as CompressedJSONField
+does, with and without a trained dictionary.
+
+Run from the server directory against a database you don't mind writing to
+(everything happens in a temporary table):
+
+    DATABASE_URL=postgres://... python -m benchmarks.compressed_json [--scenarios N]
+
+For each kind of document this prints the size of the stored value, and the
+time to encode and insert it and to select and decode it again.  The
+dictionary is trained on variations of the same documents, so it does better
+here than it would on real data.
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import statistics
+import time
+
+import orjson
+import psycopg2
+import psycopg2.extras
+import zstandard
+
+from .json_rendering import assessment_document
+
+LEVEL = 3
+
+
+def variations(document: dict, count: int) -> list[dict]:
+    """Copies of `document` with its numbers changed, like different houses."""
+
+    rng = random.Random(0)
+
+    def vary(value):
+        if isinstance(value, dict):
+            return {key: vary(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [vary(item) for item in value]
+        if isinstance(value, float):
+            return round(value * rng.uniform(0.5, 1.5), 3)
+        return value
+
+    return [vary(copy.deepcopy(document)) for _ in range(count)]
+
+
+class JSONB:
+    column = "jsonb"
+
+    def encode(self, value):
+        return json.dumps(value)
+
+    def decode(self, stored):
+        # JSONField decodes with json.loads
+        return json.loads(stored)
+
+
+class Zstd:
+    column = "bytea"
+
+    def __init__(self, dictionary=None):
+        kwargs = {"dict_data": dictionary} if dictionary else {}
+        self.compressor = zstandard.ZstdCompressor(level=LEVEL, **kwargs)
+        self.decompressor = zstandard.ZstdDecompressor(**kwargs)
+
+    def encode(self, value):
+        return self.compressor.compress(orjson.dumps(value))
+
+    def decode(self, stored):
+        # psycopg2 gives us a memoryview, CompressedJSONField copies it to bytes
+        return orjson.loads(self.decompressor.decompress(bytes(stored)))
+
+
+def measure(cursor, codec, documents: list[dict]):
+    cursor.execute(f"CREATE TEMPORARY TABLE bench (id serial, value {codec.column})")
+    if codec.column == "bytea":
+        cursor.execute("ALTER TABLE bench ALTER COLUMN value SET STORAGE EXTERNAL")
+
+    writes = []
+    for document in documents:
+        start = time.perf_counter()
+        cursor.execute(
+            "INSERT INTO bench (value) VALUES (%s)", [codec.encode(document)]
+        )
+        writes.append(time.perf_counter() - start)
+
+    reads = []
+    for pk in range(1, len(documents) + 1):
+        start = time.perf_counter()
+        cursor.execute("SELECT value FROM bench WHERE id = %s", [pk])
+        (stored,) = cursor.fetchone()
+        codec.decode(stored)
+        reads.append(time.perf_counter() - start)
+
+    cursor.execute("SELECT avg(pg_column_size(value)) FROM bench")
+    (size,) = cursor.fetchone()
+    cursor.execute("DROP TABLE bench")
+
+    return float(size), statistics.median(writes), statistics.median(reads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--documents", type=int, default=50)
+    args = parser.parse_args()
+
+    connection = psycopg2.connect(os.environ["DATABASE_URL"])
+    # jsonb comes back as text, as Django has it
+    psycopg2.extras.register_default_jsonb(connection, loads=lambda text: text)
+    cursor = connection.cursor()
+
+    for scenarios in args.scenarios:
+        documents = variations(assessment_document(scenarios)["data"], args.documents)
+        raw = len(orjson.dumps(documents[0]))
+        dictionary = zstandard.train_dictionary(
+            112 * 1024, [orjson.dumps(document) for document in documents]
+        )
+
+        print(f"assessment ({scenarios} scenarios), {raw / 1024:.0f} KiB of JSON")
+        for label, codec in [
+            ("jsonb", JSONB()),
+            ("zstd", Zstd()),
+            ("zstd+dict", Zstd(dictionary)),
+        ]:
+            size, write, read = measure(cursor, codec, documents)
+            print(
+                f"  {label:<10} {size / 1024:8.1f} KiB stored"
+                f"  write {write * 1000:7.3f} ms  read {read * 1000:7.3f} ms"
+            )
+
+    connection.rollback()
+
+
+if __name__ == "__main__":
+    main()
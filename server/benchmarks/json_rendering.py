@@ -0,0 +1,113 @@
+"""
+Compare DRF's JSON renderer and parser with the orjson-backed ones we use.
+
+Run from the server directory:
+
+    python -m benchmarks.json_rendering [--scenarios N] [--library-items N]
+
+The assessment document is built from the scenario in the client's test
+fixture, copied into as many scenarios as requested, to approximate the size of
+a real assessment's `data`.  The library document is an elements library with
+the given number of items.
+"""
+
+import argparse
+import copy
+import functools
+import io
+import json
+import pathlib
+import timeit
+
+import django
+from django.conf import settings
+
+FIXTURE = (
+    pathlib.Path(__file__).resolve().parents[2]
+    / "client"
+    / "test"
+    / "fixtures"
+    / "floating-deductible.json"
+)
+
+
+def assessment_document(scenarios: int) -> dict:
+    with FIXTURE.open() as f:
+        assessment = json.load(f)
+
+    master = assessment["data"]["master"]
+    assessment["data"] = {
+        "master": master,
+        **{f"scenario{n}": copy.deepcopy(master) for n in range(1, scenarios)},
+    }
+    return assessment
+
+
+def library_document(items: int) -> dict:
+    return {
+        "id": "1",
+        "name": "Benchmark elements",
+        "type": "elements",
+        "data": {
+            f"SWU_{n:04}": {
+                "tags": ["Wall"],
+                "name": f"225mm uninsulated brick wall {n}",
+                "description": "225mm uninsulated solid brick wall, plaster internally",
+                "location": "",
+                "source": "Salford University on site monitoring/ SAP table 1e, p.195",
+                "uvalue": 1.9,
+                "kvalue": 135,
+                "g": 0,
+                "gL": 0,
+                "ff": 0,
+            }
+            for n in range(items)
+        },
+    }
+
+
+def parse(parser, body: bytes):
+    return parser.parse(io.BytesIO(body))
+
+
+def bench(label: str, func, number: int):
+    best = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<10} {best * 1000:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", type=int, default=10)
+    parser.add_argument("--library-items", type=int, default=2000)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    settings.configure()
+    django.setup()
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from macquette.parsers import ORJSONParser
+    from macquette.renderers import ORJSONRenderer
+
+    documents = {
+        f"assessment ({args.scenarios} scenarios)": assessment_document(args.scenarios),
+        f"library ({args.library_items} items)": library_document(args.library_items),
+    }
+
+    for name, document in documents.items():
+        body = JSONRenderer().render(document)
+        print(f"{name}, {len(body) / 1024:.0f} KiB")
+
+        print(" render")
+        for label, renderer in [("drf", JSONRenderer()), ("orjson", ORJSONRenderer())]:
+            bench(label, functools.partial(renderer.render, document), args.number)
+
+        print(" parse")
+        for label, parser in [("drf", JSONParser()), ("orjson", ORJSONParser())]:
+            bench(label, functools.partial(parse, parser, body), args.number)
+
+
+if __name__ == "__main__":
+    main()
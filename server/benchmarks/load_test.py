@@ -0,0 +1,236 @@
+"""
+Replay assessors' sessions against a running server and report the throughput
+and latency of each endpoint, to size the number of gunicorn workers.
+
+Seed the database with `manage.py seed_load_test_data` and start the server with
+FAKE_EXPENSIVE_DATA set first (see docs/playbooks/load-testing.rst), then run
+from the server directory:
+
+    python -m benchmarks.load_test [--url URL] [--users N] [--duration S]
+
+Each simulated user takes one of the seeded sessions and, until the time is up,
+lists their assessments, opens one, searches for an address, and edits it for a
+while, autosaving every few seconds, sometimes uploading a photo or previewing
+the report on the way.  Address lookups are left out, because even with fake
+data they call the LSOA and elevation APIs.
+"""
+
+import argparse
+import copy
+import io
+import json
+import math
+import random
+import secrets
+import string
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import PIL.Image
+import requests
+
+
+@dataclass
+class Results:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, endpoint: str, latency: float, ok: bool):
+        with self.lock:
+            self.latencies[endpoint].append(latency)
+            if not ok:
+                self.errors[endpoint] += 1
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    """Return the `p`th percentile of a sorted list, by the nearest-rank method."""
+    rank = max(1, math.ceil(len(ordered) * p / 100))
+    return ordered[rank - 1]
+
+
+def photo() -> bytes:
+    """Return a JPEG about the size of a photo from a phone."""
+    image = PIL.Image.effect_noise((2000, 1500), 64).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+class User:
+    def __init__(  # noqa: PLR0913
+        self,
+        base_url: str,
+        session: dict,
+        results: Results,
+        stop_at: float,
+        autosave_interval: float,
+        photo: bytes,
+        seed: int,
+    ):
+        self.base_url = base_url
+        self.assessments = session["assessments"]
+        self.results = results
+        self.stop_at = stop_at
+        self.autosave_interval = autosave_interval
+        self.photo = photo
+        self.random = random.Random(seed)
+
+        # Any well-formed token will do, as long as the cookie and header match.
+        csrf_token = "".join(
+            secrets.choice(string.ascii_letters + string.digits) for _ in range(32)
+        )
+        self.http = requests.Session()
+        self.http.cookies.set("sessionid", session["session"])
+        self.http.cookies.set("csrftoken", csrf_token)
+        self.http.headers["X-CSRFToken"] = csrf_token
+
+    def request(self, endpoint: str, method: str, path: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.http.request(
+                method, self.base_url + path, timeout=60, **kwargs
+            )
+        except requests.RequestException:
+            self.results.record(endpoint, time.perf_counter() - started, ok=False)
+            return None
+        self.results.record(endpoint, time.perf_counter() - started, response.ok)
+        return response
+
+    def pause(self, seconds: float) -> bool:
+        """Wait about this long, and return whether there is still time left."""
+        time.sleep(min(self.random.uniform(0.5, 1.5) * seconds, self.time_left()))
+        return self.time_left() > 0
+
+    def time_left(self) -> float:
+        return max(0.0, self.stop_at - time.monotonic())
+
+    def run(self):
+        while self.time_left() > 0:
+            self.session()
+
+    def session(self):
+        self.request("list assessments", "GET", "/v2/api/assessments/")
+        if not self.pause(2):
+            return
+
+        pk = self.random.choice(self.assessments)
+        response = self.request("open assessment", "GET", f"/v2/api/assessments/{pk}/")
+        if response is None or not response.ok:
+            return
+        data = response.json()["data"]
+
+        for query in ["33", "33 Heath", "33 Heathcliffe Ter"]:
+            self.request(
+                "address suggestions",
+                "GET",
+                "/address-search/v1/suggestions/",
+                params={"q": query},
+            )
+            if not self.pause(0.5):
+                return
+
+        for edit in range(self.random.randint(10, 30)):
+            if not self.pause(self.autosave_interval):
+                return
+
+            data = copy.deepcopy(data)
+            data.setdefault("master", {})["load_test_edit"] = edit
+            self.request(
+                "autosave",
+                "PATCH",
+                f"/v2/api/assessments/{pk}/",
+                json={"data": data},
+            )
+
+            if self.random.random() < 0.05:
+                self.request(
+                    "upload image",
+                    "POST",
+                    f"/v2/api/assessments/{pk}/images/",
+                    files={"file": ("photo.jpg", self.photo, "image/jpeg")},
+                )
+            if self.random.random() < 0.05:
+                self.request(
+                    "report preview",
+                    "POST",
+                    f"/v2/api/assessments/{pk}/reports/preview",
+                    json={"context": {"edit": edit}, "graphs": {}},
+                )
+
+
+def report(results: Results, elapsed: float, as_json: bool):
+    rows = []
+    for endpoint, latencies in sorted(results.latencies.items()):
+        ordered = sorted(latencies)
+        rows.append(
+            {
+                "endpoint": endpoint,
+                "requests": len(ordered),
+                "errors": results.errors[endpoint],
+                "throughput": len(ordered) / elapsed,
+                **{f"p{p}_ms": percentile(ordered, p) * 1000 for p in (50, 95, 99)},
+            }
+        )
+
+    if as_json:
+        json.dump(rows, sys.stdout, indent=2)
+        return
+
+    print(
+        f"{'endpoint':20} {'requests':>8} {'errors':>6} {'req/s':>7}"
+        f" {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for row in rows:
+        print(
+            f"{row['endpoint']:20} {row['requests']:8} {row['errors']:6}"
+            f" {row['throughput']:7.2f} {row['p50_ms']:8.0f} {row['p95_ms']:8.0f}"
+            f" {row['p99_ms']:8.0f}"
+        )
+    total = sum(row["requests"] for row in rows)
+    print(f"{total} requests in {elapsed:.0f} s, {total / elapsed:.2f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--sessions", default="load-test-sessions.json")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=300, help="seconds")
+    parser.add_argument("--autosave-interval", type=float, default=3, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    with open(args.sessions) as f:
+        sessions = json.load(f)
+
+    results = Results()
+    started = time.monotonic()
+    image = photo()
+    users = [
+        User(
+            args.url.rstrip("/"),
+            sessions[n % len(sessions)],
+            results,
+            stop_at=started + args.duration,
+            autosave_interval=args.autosave_interval,
+            photo=image,
+            seed=args.seed + n,
+        )
+        for n in range(args.users)
+    ]
+    threads = [threading.Thread(target=user.run) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report(results, time.monotonic() - started, args.json)
+
+
+if __name__ == "__main__":
+    main()
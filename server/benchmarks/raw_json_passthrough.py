@@ -0,0 +1,72 @@
+"""
+Compare decoding an assessment's `data` and re-encoding it with passing the
+JSON text from Postgres straight through to the response.
+
+Run from the server directory:
+
+    python -m benchmarks.raw_json_passthrough [--scenarios N]
+
+"decode" is what happens without the passthrough: JSONField decodes the text
+from the database with json.loads, then the renderer encodes the result.
+"passthrough" wraps the text in RawJSON and renders that.  Both are timed, and
+the peak memory allocated while handling one response is measured with
+tracemalloc.
+"""
+
+import argparse
+import functools
+import json
+import timeit
+import tracemalloc
+
+import django
+from django.conf import settings
+
+from .json_rendering import assessment_document
+
+
+def decode(renderer, envelope: dict, text: str):
+    return renderer.render({**envelope, "data": json.loads(text)})
+
+
+def passthrough(renderer, envelope: dict, text: str):
+    from macquette.renderers import RawJSON
+
+    return renderer.render({**envelope, "data": RawJSON(text)})
+
+
+def peak_allocation(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", type=int, default=10)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    settings.configure()
+    django.setup()
+
+    from macquette.renderers import ORJSONRenderer
+
+    envelope = assessment_document(args.scenarios)
+    # Postgres's jsonb output uses the same separators as json.dumps
+    text = json.dumps(envelope.pop("data"))
+    print(f"assessment ({args.scenarios} scenarios), {len(text) / 1024:.0f} KiB")
+
+    renderer = ORJSONRenderer()
+    for label, func in [("decode", decode), ("passthrough", passthrough)]:
+        call = functools.partial(func, renderer, envelope, text)
+        best = min(timeit.repeat(call, number=args.number, repeat=5)) / args.number
+        peak = peak_allocation(call)
+        print(f"  {label:<12} {best * 1000:8.3f} ms  {peak / 1024:8.0f} KiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measure how long checking assessment data against its JSON Schema adds to each
+save, next to the time it takes to parse the request body.
+
+Run from the server directory:
+
+    python -m benchmarks.schema_validation [--scenarios N ...] [--check]
+
+The documents are built as in benchmarks.json_rendering.  Compiling the schema
+happens once per process, so it is reported separately.  With --check, exits
+non-zero if validating the largest document takes longer than the budget.
+"""
+
+import argparse
+import sys
+import time
+import timeit
+
+import orjson
+
+from macquette.v2.validators import (
+    ASSESSMENT_DATA_SCHEMA_VERSION,
+    assessment_data_validator,
+)
+
+from .json_rendering import assessment_document
+
+VALIDATION_BUDGET_MS = 10
+
+
+def best(func, number: int) -> float:
+    """Return the best time of a call to `func`, in milliseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--number", type=int, default=50)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    validate = assessment_data_validator(ASSESSMENT_DATA_SCHEMA_VERSION)
+    print(f"compile   {(time.perf_counter() - start) * 1000:8.1f} ms, once")
+
+    validation_ms = 0.0
+    for scenarios in args.scenarios:
+        document = assessment_document(scenarios)["data"]
+        body = orjson.dumps(document)
+        parse_ms = best(lambda body=body: orjson.loads(body), args.number)
+        validation_ms = best(lambda document=document: validate(document), args.number)
+        print(
+            f"{scenarios:3} scenarios, {len(body) / 1024:5.0f} KiB:"
+            f"  parse {parse_ms:7.3f} ms  validate {validation_ms:7.3f} ms"
+        )
+
+    if args.check and validation_ms > VALIDATION_BUDGET_MS:
+        print(f"over budget ({VALIDATION_BUDGET_MS} ms)", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Measure what the search document's update trigger adds to an autosave, i.e. an
+update of an assessment's data that doesn't change its address.
+
+Run from the server directory against a migrated database you don't mind
+writing to (everything is rolled back):
+
+    DATABASE_URL=postgres://... python -m benchmarks.search_trigger [--scenarios N ...]
+
+Each update writes one of two versions of the same document, which differ only
+outside the household, as pre-encoded JSON text, so only the time spent in
+Postgres is measured.  Updates are made in short runs with the trigger enabled
+and disabled in turn, so that the table growing affects both alike, and the
+median update of each is reported.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+import django
+
+from .json_rendering import assessment_document
+
+TRIGGER = "v2_assessment_search_document_update"
+RUN_LENGTH = 20
+
+
+def time_autosaves(cursor, pk: int, versions: list[str], number: int):
+    """Return the median time of an update with and without the trigger, in ms."""
+    times: dict[bool, list[float]] = {True: [], False: []}
+    for run in range(number // RUN_LENGTH):
+        enabled = run % 2 == 0
+        action = "ENABLE" if enabled else "DISABLE"
+        cursor.execute(f"ALTER TABLE v2_assessment {action} TRIGGER {TRIGGER}")
+        for n in range(RUN_LENGTH):
+            start = time.perf_counter()
+            cursor.execute(
+                "UPDATE v2_assessment SET data = %s WHERE id = %s",
+                [versions[n % len(versions)], pk],
+            )
+            times[enabled].append(time.perf_counter() - start)
+    cursor.execute(f"ALTER TABLE v2_assessment ENABLE TRIGGER {TRIGGER}")
+    return (
+        statistics.median(times[True]) * 1000,
+        statistics.median(times[False]) * 1000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--number", type=int, default=1000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+    django.setup()
+
+    from django.db import connection, transaction
+
+    from macquette.users.models import User
+    from macquette.v2.models import Assessment
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Deferred foreign key checks would stop the trigger being disabled.
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        owner = User.objects.create(username="benchmark-search-trigger")
+        for scenarios in args.scenarios:
+            data = assessment_document(scenarios)["data"]
+            assessment = Assessment.objects.create(owner=owner, name="Bench", data=data)
+            versions = [
+                json.dumps({**data, "master": {**data["master"], "scenario_name": n}})
+                for n in ("A", "B")
+            ]
+
+            enabled, disabled = time_autosaves(
+                cursor, assessment.pk, versions, args.number
+            )
+
+            print(
+                f"{scenarios:3} scenarios, {len(versions[0]) / 1024:5.0f} KiB:"
+                f"  with trigger {enabled:7.3f} ms  without {disabled:7.3f} ms"
+            )
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Measure how long a fresh worker process takes to import everything it needs
+to serve a request, and how much memory it is using once it has.
+
+Run from the server directory:
+
+    python -m benchmarks.startup [--repeat N] [--top N] [--check]
+
+Each run starts a new interpreter with `python -X importtime`, loads the WSGI
+application and the URLconf (which imports every view), and reports the total
+import time, the peak RSS of the process and the slowest top-level imports.
+The median of the runs is reported.
+
+With --check, exits non-zero if the import time or RSS is over budget, or if a
+module that should only be imported on first use (see LAZY_MODULES) was
+imported at startup.  CI runs this, so a change that makes startup slower than
+the budget fails the build; raise the budget deliberately if it has to go up.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# Only needed to render reports, to profile a request or to search for an
+# address, and slow to import.
+LAZY_MODULES = [
+    "matplotlib",
+    "numpy",
+    "adjustText",
+    "weasyprint",
+    "pyinstrument",
+    "aiohttp",
+]
+
+IMPORT_BUDGET_MS = 1500
+RSS_BUDGET_MIB = 128
+
+CHILD = f"""
+import json, resource, sys
+from config.wsgi import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({{
+    "rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "lazy": [name for name in {LAZY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+@dataclass
+class Run:
+    import_ms: float
+    rss_mib: float
+    lazy_imported: list[str]
+    top_level: dict[str, float]
+
+
+def parse_importtime(output: str) -> dict[str, float]:
+    """
+    Return the cumulative import time in milliseconds of each top-level import
+    in the output of `python -X importtime`.
+
+    Lines look like `import time:   self [us] | cumulative | package`, with
+    the package indented by two spaces for each level of nesting.
+    """
+
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, package = line.split("|")
+        if not cumulative.strip().isdigit() or package.startswith("  "):
+            continue
+        times[package.strip()] = int(cumulative) / 1000
+    return times
+
+
+def measure() -> Run:
+    env = {"DJANGO_SETTINGS_MODULE": "config.settings.test", **os.environ}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],  # noqa: S603
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    child = json.loads(result.stdout.splitlines()[-1])
+    top_level = parse_importtime(result.stderr)
+    return Run(
+        import_ms=sum(top_level.values()),
+        rss_mib=child["rss_kib"] / 1024,
+        lazy_imported=child["lazy"],
+        top_level=top_level,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--rss-budget", type=float, default=RSS_BUDGET_MIB)
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.repeat)]
+    import_ms = statistics.median(run.import_ms for run in runs)
+    rss_mib = statistics.median(run.rss_mib for run in runs)
+
+    print(f"imports  {import_ms:8.0f} ms   (budget {args.import_budget:.0f} ms)")
+    print(f"rss      {rss_mib:8.1f} MiB  (budget {args.rss_budget:.0f} MiB)")
+    print("slowest top-level imports:")
+    slowest = sorted(runs[-1].top_level.items(), key=lambda item: -item[1])
+    for package, ms in slowest[: args.top]:
+        print(f"  {ms:8.1f} ms  {package}")
+
+    failures = []
+    if import_ms > args.import_budget:
+        failures.append("import time is over budget")
+    if rss_mib > args.rss_budget:
+        failures.append("RSS is over budget")
+    if lazy := runs[-1].lazy_imported:
+        failures.append(f"imported at startup: {', '.join(lazy)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
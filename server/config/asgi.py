@@ -0,0 +1,22 @@
+"""
+ASGI config for Macquette project.
+
+This exposes the same application as config/wsgi.py to ASGI servers, so that
+async views (the address search) don't hold a worker while they wait on other
+services.  scripts/webserver serves it with gunicorn's uvicorn workers when
+ASGI is set to true.
+"""
+import os
+import sys
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# macquette directory.
+app_path = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+)
+sys.path.append(os.path.join(app_path, "macquette"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+application = get_asgi_application()
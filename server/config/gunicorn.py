@@ -0,0 +1,28 @@
+"""
+Gunicorn settings, loaded by scripts/webserver.
+
+Each worker records its metrics (see macquette.metrics) in files in
+PROMETHEUS_MULTIPROC_DIR, so that any worker can report them all.  The
+variable has to be set here, in the arbiter, so that it is set in every worker
+before prometheus_client is imported.
+"""
+
+import os
+import shutil
+import tempfile
+
+metrics_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "metrics")
+)
+
+
+def on_starting(server):
+    # Don't carry metrics over from the last run.
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
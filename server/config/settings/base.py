@@ -97,6 +97,26 @@ if SENTRY_DSN:
 DATABASES = {"default": env.db("DATABASE_URL")}
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
 
+# CACHES
+# ------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/dev/ref/settings/#caches
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "",
+    },
+    # See macquette.middleware.APICompressionMiddleware.  Keys are digests of the
+    # uncompressed body, so entries never go stale, but they expire so that bodies
+    # nobody asks for again don't stay in memory.  Entries are at most 128 KiB,
+    # so this is at most 12.5 MiB per process.
+    "compressed_responses": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "compressed_responses",
+        "TIMEOUT": 10 * 60,
+        "OPTIONS": {"MAX_ENTRIES": 100},
+    },
+}
+
 # URLS
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#root-urlconf
@@ -116,6 +136,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     # "django.contrib.humanize", # Handy template tags
     "django.contrib.admin",
+    "django.contrib.postgres",
 ]
 THIRD_PARTY_APPS = [
     "corsheaders",
@@ -128,6 +149,7 @@ THIRD_PARTY_APPS = [
 LOCAL_APPS = [
     "macquette.users.apps.UsersConfig",
     "macquette.organisations",
+    "macquette.profiling",
     "macquette.v2",
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -199,14 +221,19 @@ AUTH_PASSWORD_VALIDATORS = [
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "macquette.middleware.APICompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "macquette.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "macquette.middleware.HealthCheckMiddleware",
+    "macquette.middleware.MetricsMiddleware",
+    "macquette.middleware.QueryAuditMiddleware",
+    "macquette.middleware.RequestBodyLimitMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "macquette.profiling.middleware.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "waffle.middleware.WaffleMiddleware",
@@ -228,6 +255,10 @@ STATICFILES_FINDERS = [
 ]
 # http://whitenoise.evans.io/en/stable/django.html#add-compression-and-caching-support
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+# The URLs of the app's static files as JSON, for the client.  This is written at
+# build time by `manage.py build_static_manifest`; without it the static directory
+# is walked when the URLs are first needed.
+STATIC_URLS_MANIFEST = str(ROOT_DIR("static-urls.json"))
 
 # MEDIA
 # ------------------------------------------------------------------------------
@@ -344,7 +375,16 @@ CORS_ALLOW_HEADERS = list(default_headers)
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         ["rest_framework.authentication.SessionAuthentication"]
-    )
+    ),
+    "DEFAULT_RENDERER_CLASSES": [
+        "macquette.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "macquette.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 API_KEY = {
@@ -355,3 +395,50 @@ if ENV == "production":
     FAKE_EXPENSIVE_DATA = False
 else:
     FAKE_EXPENSIVE_DATA = env.bool("FAKE_EXPENSIVE_DATA", default=False)
+
+# Assessment revisions store a full copy of the data every this many revisions
+# and a patch against the previous revision otherwise.  Reading a revision
+# applies at most this many patches, less one.
+ASSESSMENT_REVISION_KEYFRAME_INTERVAL = env.int(
+    "ASSESSMENT_REVISION_KEYFRAME_INTERVAL", default=20
+)
+
+# Scrapes of /.well-known/metrics must send this as a bearer token.  If it's not
+# set, the metrics aren't served.
+METRICS_TOKEN = env.str("METRICS_TOKEN", default="")
+
+# Each worker checks whether Waffle's flags, switches or samples have changed at
+# most this often, in seconds (see macquette.features).
+FEATURE_FLAGS_MAX_AGE = env.int("FEATURE_FLAGS_MAX_AGE", default=10)
+
+# Lets staff profile a request by sending an `X-Profile: 1` header or adding
+# `profile=1` to the query string (see macquette.profiling).
+PROFILING_ENABLED = env.bool("PROFILING_ENABLED", default=True)
+
+# A fraction of requests have their queries watched, and warnings are logged for
+# too many queries, slow queries and repeated queries (see macquette.queries).
+QUERY_AUDIT_SAMPLE_RATE = env.float("QUERY_AUDIT_SAMPLE_RATE", default=0.05)
+QUERY_AUDIT_MAX_QUERIES = env.int("QUERY_AUDIT_MAX_QUERIES", default=50)
+QUERY_AUDIT_SLOW_QUERY_MS = env.float("QUERY_AUDIT_SLOW_QUERY_MS", default=500)
+QUERY_AUDIT_REPEATED_QUERIES = env.int("QUERY_AUDIT_REPEATED_QUERIES", default=10)
+
+# Requests with a body larger than this many bytes are refused with a 413 before
+# the body is read.  Views that take larger bodies have their own limits, by URL
+# name, in REQUEST_BODY_LIMITS.
+REQUEST_BODY_LIMIT = env.int("REQUEST_BODY_LIMIT", default=10 * 1024 * 1024)
+REQUEST_BODY_LIMITS = {
+    **{
+        name: 50 * 1024 * 1024
+        for name in [
+            "v2:list-create-assessments",
+            "v2:list-create-organisation-assessments",
+            "v2:retrieve-update-destroy-assessment",
+            "v2:list-create-libraries",
+            "v2:create-organisation-libraries",
+            "v2:update-destroy-library",
+        ]
+    },
+    # These read the body as it arrives rather than all at once.
+    "v2:import-assessments": 500 * 1024 * 1024,
+    "v2:import-libraries": 500 * 1024 * 1024,
+}
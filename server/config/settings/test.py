@@ -22,15 +22,11 @@ TEST_RUNNER = "django.test.runner.DiscoverRunner"
 # Turn off whitenoise for test runs
 STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
 
-# CACHES
-# ------------------------------------------------------------------------------
-# https://docs.djangoproject.com/en/dev/ref/settings/#caches
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "",
-    }
-}
+# Check for changed feature flags on every request
+FEATURE_FLAGS_MAX_AGE = 0
+
+# Only watch queries in the tests that ask for it
+QUERY_AUDIT_SAMPLE_RATE = 0
 
 # PASSWORDS
 # ------------------------------------------------------------------------------
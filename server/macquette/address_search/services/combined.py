@@ -1,3 +1,4 @@
+import asyncio
 import random
 
 from django.conf import settings
@@ -9,9 +10,9 @@ from .lsoa import get_lsoa
 from .resolve_address import ResolveResult, resolve_address
 
 
-def get_combined_address_data(id: str):
+async def get_combined_address_data(id: str):
     if not settings.FAKE_EXPENSIVE_DATA:
-        main_data_r = resolve_address(id)
+        main_data_r = await resolve_address(id)
     else:
         is_error = random.choice([True, False, False, False, False])  # noqa: S311
         if is_error:
@@ -34,11 +35,6 @@ def get_combined_address_data(id: str):
                 )
             )
 
-    lsoa_r = main_data_r.bind(lambda result: get_lsoa(result.postcode))
-    elevation_r = main_data_r.bind(
-        lambda result: get_elevation(result.latitude, result.longitude)
-    )
-
     try:
         main_data = main_data_r.unwrap()
     except UnwrapFailedError:
@@ -46,23 +42,28 @@ def get_combined_address_data(id: str):
             "error": main_data_r.failure(),
             "result": None,
         }
-    else:
-        return {
-            "error": None,
-            "result": {
-                "id": id,
-                "address": {
-                    "line_1": main_data.line_1,
-                    "line_2": main_data.line_2,
-                    "line_3": main_data.line_3,
-                    "post_town": main_data.post_town,
-                    "postcode": main_data.postcode,
-                    "country": main_data.country,
-                },
-                "uprn": main_data.uprn,
-                "local_authority": main_data.district,
-                "coordinates": [main_data.latitude, main_data.longitude],
-                "elevation": elevation_r.value_or(None),
-                "lsoa": lsoa_r.value_or(None),
+
+    # These are independent, so make both requests at once.
+    lsoa_r, elevation_r = await asyncio.gather(
+        get_lsoa(main_data.postcode),
+        get_elevation(main_data.latitude, main_data.longitude),
+    )
+    return {
+        "error": None,
+        "result": {
+            "id": id,
+            "address": {
+                "line_1": main_data.line_1,
+                "line_2": main_data.line_2,
+                "line_3": main_data.line_3,
+                "post_town": main_data.post_town,
+                "postcode": main_data.postcode,
+                "country": main_data.country,
             },
-        }
+            "uprn": main_data.uprn,
+            "local_authority": main_data.district,
+            "coordinates": [main_data.latitude, main_data.longitude],
+            "elevation": elevation_r.value_or(None),
+            "lsoa": lsoa_r.value_or(None),
+        },
+    }
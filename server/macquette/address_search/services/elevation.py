@@ -2,10 +2,13 @@ import dataclasses
 import logging
 from typing import Literal
 
-import requests
 import typedload
 from returns.result import Failure, Result, Success
 
+from macquette.metrics import observe_external_api
+
+from .http import RequestError, get_json
+
 
 @dataclasses.dataclass
 class _APIError:
@@ -39,18 +42,18 @@ def _parse_elevation_response(data: dict) -> _APISuccess | _APIError:
         return typedload.load(data, _APISuccess)
 
 
-def get_elevation(latitude: float, longitude: float) -> Result[int, str]:
+@observe_external_api("opentopodata")
+async def get_elevation(latitude: float, longitude: float) -> Result[int, str]:
     try:
-        response = requests.get(
-            "https://api.opentopodata.org/v1/eudem25m"
-            f"?locations={latitude},{longitude}",
-            timeout=3,
+        data = await get_json(
+            "https://api.opentopodata.org/v1/eudem25m",
+            params={"locations": f"{latitude},{longitude}"},
         )
-    except requests.exceptions.RequestException:
+    except RequestError:
         logging.exception("Network error while fetching address data")
         return Failure("Couldn't fetch elevation")
 
-    result = _parse_elevation_response(response.json())
+    result = _parse_elevation_response(data)
     if isinstance(result, _APIError):
         logging.error(f"Error getting address data: {result.error}")
         return Failure(f"Couldn't fetch elevation ({result.error})")
@@ -0,0 +1,29 @@
+import asyncio
+
+
+class RequestError(Exception):
+    """A request failed or timed out."""
+
+
+async def get_json(url: str, **kwargs) -> dict:
+    """
+    GET a URL and decode the response as JSON, whatever its status.
+
+    A session is made for each request because under WSGI each request has its
+    own event loop, and a session can't outlive its loop.  Proxy settings are
+    taken from the environment, as requests does.
+    """
+    # Only imported on first use, as it is slow to import; see
+    # benchmarks.startup.
+    import aiohttp
+
+    try:
+        async with (
+            aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=3), trust_env=True
+            ) as session,
+            session.get(url, **kwargs) as response,
+        ):
+            return await response.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise RequestError(f"{url}: {e!r}") from e
@@ -1,10 +1,13 @@
 import dataclasses
 import logging
 
-import requests
 import typedload
 from returns.result import Failure, Result, Success
 
+from macquette.metrics import observe_external_api
+
+from .http import RequestError, get_json
+
 
 @dataclasses.dataclass
 class _APIError:
@@ -30,16 +33,15 @@ def _parse_lsoa_response(data: dict) -> _APISuccess | _APIError:
         return typedload.load(data, _APISuccess)
 
 
-def get_lsoa(postcode: str) -> Result[str, str]:
+@observe_external_api("postcodes_io")
+async def get_lsoa(postcode: str) -> Result[str, str]:
     try:
-        response = requests.get(
-            f"https://api.postcodes.io/postcodes/{postcode}", timeout=3
-        )
-    except requests.exceptions.RequestException:
+        data = await get_json(f"https://api.postcodes.io/postcodes/{postcode}")
+    except RequestError:
         logging.exception("Network error while fetching address data")
         return Failure("Couldn't fetch LSOA")
 
-    result = _parse_lsoa_response(response.json())
+    result = _parse_lsoa_response(data)
     if isinstance(result, _APIError):
         logging.error(f"Error getting address data: {result.error}")
         return Failure(f"Couldn't fetch LSOA ({result.error})")
@@ -1,11 +1,14 @@
 import dataclasses
 import logging
 
-import requests
 import typedload
 from django.conf import settings
 from returns.result import Failure, Result, Success
 
+from macquette.metrics import observe_external_api
+
+from .http import RequestError, get_json
+
 
 @dataclasses.dataclass
 class _APIError:
@@ -42,22 +45,22 @@ def _parse_address_lookup_response(data: dict) -> _APISuccess | _APIError:
         return typedload.load(data, _APISuccess)
 
 
-def resolve_address(id: str) -> Result[ResolveResult, str]:
+@observe_external_api("ideal_postcodes_resolve")
+async def resolve_address(id: str) -> Result[ResolveResult, str]:
     api_key = settings.API_KEY["IDEAL_POSTCODES"]
     if api_key is None:
         return Failure("Address lookup not enabled")
 
     try:
-        response = requests.get(
+        data = await get_json(
             f"https://api.ideal-postcodes.co.uk/v1/autocomplete/addresses/{id}/gbr",
             headers={"Authorization": f'api_key="{api_key}"'},
-            timeout=3,
         )
-    except requests.exceptions.RequestException:
+    except RequestError:
         logging.exception("Network error while fetching address data")
         return Failure("Couldn't fetch address data")
 
-    result = _parse_address_lookup_response(response.json())
+    result = _parse_address_lookup_response(data)
     if isinstance(result, _APIError):
         logging.error(f"Error getting address data: {result}")
         return Failure("Couldn't fetch address data")
@@ -2,11 +2,14 @@ import dataclasses
 import logging
 import random
 
-import requests
 import typedload
 from django.conf import settings
 from returns.result import Failure, Result, Success
 
+from macquette.metrics import observe_external_api
+
+from .http import RequestError, get_json
+
 
 @dataclasses.dataclass
 class _APIError:
@@ -39,7 +42,8 @@ def _parse_address_suggestion_response(data: dict) -> _APISuccess | _APIError:
         return typedload.load(data, _APISuccess)
 
 
-def get_suggestions(query: str) -> Result[list[AddressSuggestion], str]:
+@observe_external_api("ideal_postcodes_suggestions")
+async def get_suggestions(query: str) -> Result[list[AddressSuggestion], str]:
     if settings.FAKE_EXPENSIVE_DATA:
         return fake_suggestions()
 
@@ -48,16 +52,16 @@ def get_suggestions(query: str) -> Result[list[AddressSuggestion], str]:
         return Failure("Address suggestions not enabled")
 
     try:
-        response = requests.get(
-            f"https://api.ideal-postcodes.co.uk/v1/autocomplete/addresses?q={query}",
+        data = await get_json(
+            "https://api.ideal-postcodes.co.uk/v1/autocomplete/addresses",
+            params={"q": query},
             headers={"Authorization": f'api_key="{api_key}"'},
-            timeout=3,
         )
-    except requests.exceptions.RequestException:
+    except RequestError:
         logging.exception("Network error while fetching address suggestions")
         return Failure("Couldn't fetch address suggestions")
 
-    result = _parse_address_suggestion_response(response.json())
+    result = _parse_address_suggestion_response(data)
     if isinstance(result, _APIError):
         logging.error(f"Error getting address suggestions ({result})")
         return Failure("Couldn't fetch address suggestions")
@@ -1,4 +1,5 @@
 import pytest
+from asgiref.sync import async_to_sync
 from django.test import override_settings
 from returns.result import Failure, Success
 
@@ -8,14 +9,14 @@ from . import services
 @override_settings(API_KEY={"IDEAL_POSTCODES": None}, FAKE_EXPENSIVE_DATA=False)
 def test_suggestions_no_api_key():
     """Having no API key should result in an error"""
-    result = services.get_suggestions("Downing Street")
+    result = async_to_sync(services.get_suggestions)("Downing Street")
     assert isinstance(result, Failure)
 
 
 @pytest.mark.skip("Requires a key")
 def test_suggestions_community_api_key():
     """Using the community API key should produce some results"""
-    result_r = services.get_suggestions("Downing Street")
+    result_r = async_to_sync(services.get_suggestions)("Downing Street")
     assert isinstance(result_r, Success)
 
     result = result_r.unwrap()
@@ -24,23 +25,23 @@ def test_suggestions_community_api_key():
 
 
 def test_lookup_lsoa_valid_postcode_should_produce_result():
-    result = services.get_lsoa("M13 0PQ")
+    result = async_to_sync(services.get_lsoa)("M13 0PQ")
     assert result == Success("Manchester 027F")
 
 
 def test_lookup_lsoa_invalid_postcode_should_produce_failure():
-    result = services.get_lsoa("nonsense")
+    result = async_to_sync(services.get_lsoa)("nonsense")
     assert result == Failure("Couldn't fetch LSOA (Invalid postcode)")
 
 
 def test_elevation_lookup():
-    result = services.get_elevation(41.161758, -8.583933)
+    result = async_to_sync(services.get_elevation)(41.161758, -8.583933)
     assert result == Success(113)
 
 
 @pytest.mark.skip("Requires a key & costs money to run")
 def test_full_lookup():
-    result = services.get_combined_address_data("paf_14407651")
+    result = async_to_sync(services.get_combined_address_data)("paf_14407651")
     assert result == {
         "error": None,
         "result": {
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import random
+import sys
+from types import FrameType, SimpleNamespace
+
+import pytest
+from asgiref.sync import AsyncToSync
+from asgiref.testing import ApplicationCommunicator
+from django.test import Client, override_settings
+from returns.result import Failure, Success
+
+from macquette.users.tests.factories import UserFactory
+
+from . import services
+from .services import combined
+
+pytestmark = pytest.mark.django_db
+
+SUGGESTIONS = "/address-search/v1/suggestions/"
+LOOKUP = "/address-search/v1/lookup/"
+
+
+@pytest.fixture()
+def logged_in(client):
+    client.force_login(UserFactory.create())
+    return client
+
+
+def test_anonymous_users_are_refused(client):
+    assert client.get(SUGGESTIONS, {"q": "33"}).status_code == 403
+    assert client.post(LOOKUP, {"id": "1"}, "application/json").status_code == 403
+
+
+def test_input_is_validated(logged_in):
+    response = logged_in.get(SUGGESTIONS)
+    assert response.status_code == 400
+    assert response.json() == {"q": ["This field is required."]}
+
+    response = logged_in.post(LOOKUP, {}, "application/json")
+    assert response.status_code == 400
+    assert response.json() == {"id": ["This field is required."]}
+
+    response = logged_in.post(LOOKUP, "{", "application/json")
+    assert response.status_code == 400
+
+
+@override_settings(FAKE_EXPENSIVE_DATA=True)
+def test_suggestions(logged_in):
+    response = logged_in.get(SUGGESTIONS, {"q": "33 Heathcliffe"})
+
+    assert response.status_code == 200
+    body = response.json()
+    if body["error"] is None:
+        assert len(body["results"]) > 0
+    else:
+        assert body["results"] == []
+
+
+@override_settings(API_KEY={"IDEAL_POSTCODES": None}, FAKE_EXPENSIVE_DATA=False)
+def test_lookup_failure(logged_in):
+    response = logged_in.post(LOOKUP, {"id": "paf_1"}, "application/json")
+
+    assert response.status_code == 200
+    assert response.json() == {"error": "Address lookup not enabled", "result": None}
+
+
+def _meeting(*names: str):
+    """
+    Return a coroutine function that waits until it has been called with each of
+    `names`, and a list that gets whether each call saw all the others, i.e.
+    whether they were in flight at once, rather than timing out.
+    """
+    arrived = {name: asyncio.Event() for name in names}
+    met: list[bool] = []
+
+    async def meet(name: str):
+        arrived[name].set()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(event.wait() for event in arrived.values())),
+                timeout=5,
+            )
+        except asyncio.TimeoutError:
+            met.append(False)
+        else:
+            met.append(True)
+
+    return meet, met
+
+
+@override_settings(FAKE_EXPENSIVE_DATA=True)
+def test_lookup_fetches_lsoa_and_elevation_at_once(logged_in, monkeypatch):
+    meet, met = _meeting("lsoa", "elevation")
+
+    async def get_lsoa(postcode):
+        await meet("lsoa")
+        return Success("Scarfolk 001A")
+
+    async def get_elevation(latitude, longitude):
+        await meet("elevation")
+        return Failure("No elevation")
+
+    monkeypatch.setattr(combined, "get_lsoa", get_lsoa)
+    monkeypatch.setattr(combined, "get_elevation", get_elevation)
+    # The fake address itself fails at random.  Only patch this module's use of
+    # random: asgiref uses random.choice too.
+    monkeypatch.setattr(
+        combined,
+        "random",
+        SimpleNamespace(choice=lambda options: False, uniform=random.uniform),
+    )
+
+    response = logged_in.post(LOOKUP, {"id": "fake_1"}, "application/json")
+
+    assert response.status_code == 200
+    result = response.json()["result"]
+    assert result["lsoa"] == "Scarfolk 001A"
+    assert result["elevation"] is None
+    assert met == [True, True]
+
+
+@override_settings(DEBUG=True)
+def test_middleware_is_all_async_under_asgi(caplog):
+    from django.core.handlers.asgi import ASGIHandler
+
+    # Django logs each sync middleware it has to adapt, but only when DEBUG is on.
+    with caplog.at_level(logging.DEBUG, logger="django.request"):
+        handler = ASGIHandler()
+
+    assert asyncio.iscoroutinefunction(handler._middleware_chain)
+    assert [r.message for r in caplog.records if "adapted" in r.message] == []
+
+
+def _threads_blocked_on_async_code() -> int:
+    """Count the threads waiting in async_to_sync, i.e. held by async code."""
+    count = 0
+    for top in sys._current_frames().values():
+        frame: FrameType | None = top
+        while frame is not None:
+            if frame.f_code is AsyncToSync.__call__.__code__:
+                count += 1
+                break
+            frame = frame.f_back
+    return count
+
+
+async def _get(application, path: str, query_string: bytes, session: str):
+    communicator = ApplicationCommunicator(
+        application,
+        {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query_string,
+            "root_path": "",
+            "headers": [
+                (b"host", b"testserver"),
+                (b"cookie", f"sessionid={session}".encode()),
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        },
+    )
+    await communicator.send_input({"type": "http.request", "body": b""})
+    start = await communicator.receive_output(timeout=5)
+    await communicator.receive_output(timeout=5)
+    return start["status"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_lookups_overlap_under_asgi(monkeypatch):
+    from config.asgi import application
+
+    client = Client()
+    client.force_login(UserFactory.create())
+    session = client.cookies["sessionid"].value
+
+    meet, met = _meeting("1", "2")
+    blocked_threads = []
+
+    async def get_suggestions(query):
+        await meet(query)
+        blocked_threads.append(_threads_blocked_on_async_code())
+        return Success([])
+
+    monkeypatch.setattr(services, "get_suggestions", get_suggestions)
+
+    async def both():
+        return await asyncio.gather(
+            _get(application, SUGGESTIONS, b"q=1", session),
+            _get(application, SUGGESTIONS, b"q=2", session),
+        )
+
+    statuses = asyncio.run(both())
+
+    assert statuses == [200, 200]
+    assert met == [True, True]
+    # Under a sync middleware chain, each lookup would hold a thread waiting on
+    # it in async_to_sync.
+    assert blocked_threads == [0, 0]
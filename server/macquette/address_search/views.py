@@ -1,29 +1,51 @@
+import json
+
+from asgiref.sync import sync_to_async
 from django.db import transaction
+from django.http import JsonResponse
 from django.utils.decorators import method_decorator
-from rest_framework import permissions, serializers
-from rest_framework.response import Response
-from rest_framework.views import APIView
+from django.views import View
+from rest_framework import serializers
 from returns.result import Success
 
 from . import services
 
+# These views spend nearly all their time waiting for external APIs, so they are
+# async: under ASGI, a worker can have many lookups in flight at once.  DRF
+# doesn't support async views, so they check authentication and validate input
+# themselves, and answer in the same shape DRF would.
+
+
+async def _is_authenticated(request) -> bool:
+    # Loading the user from the session touches the database, which can't be done
+    # from async code directly.
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+def _not_authenticated() -> JsonResponse:
+    return JsonResponse(
+        {"detail": "Authentication credentials were not provided."}, status=403
+    )
+
 
 # Non-atomic because it doesn't write to the DB or require consistent state,
-# so let's avoid it blocking anyone.
+# so let's avoid it blocking anyone.  (Async views can't be atomic anyway.)
 @method_decorator(transaction.non_atomic_requests, name="dispatch")
-class ListSuggestions(APIView):
-    permission_classes = [permissions.IsAuthenticated]
-
+class ListSuggestions(View):
     class InputSerializer(serializers.Serializer):
         q = serializers.CharField()
 
-    def get(self, request, format=None):
+    async def get(self, request, format=None):
+        if not await _is_authenticated(request):
+            return _not_authenticated()
+
         serializer = self.InputSerializer(data=request.GET)
-        serializer.is_valid(raise_exception=True)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=400)
 
-        suggestions_r = services.get_suggestions(serializer.data["q"])
+        suggestions_r = await services.get_suggestions(serializer.data["q"])
 
-        return Response(
+        return JsonResponse(
             suggestions_r.map(
                 lambda hits: {
                     "error": None,
@@ -45,16 +67,25 @@ class ListSuggestions(APIView):
 
 
 # Non-atomic because it doesn't write to the DB or require consistent state,
-# so let's avoid it blocking anyone.
+# so let's avoid it blocking anyone.  (Async views can't be atomic anyway.)
 @method_decorator(transaction.non_atomic_requests, name="dispatch")
-class PerformLookup(APIView):
-    permission_classes = [permissions.IsAuthenticated]
-
+class PerformLookup(View):
     class InputSerializer(serializers.Serializer):
         id = serializers.CharField()
 
-    def post(self, request, format=None):
-        serializer = self.InputSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+    async def post(self, request, format=None):
+        if not await _is_authenticated(request):
+            return _not_authenticated()
 
-        return Response(services.get_combined_address_data(serializer.data["id"]))
+        try:
+            data = json.loads(request.body) if request.body else {}
+        except ValueError as exc:
+            return JsonResponse({"detail": f"JSON parse error - {exc}"}, status=400)
+
+        serializer = self.InputSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=400)
+
+        return JsonResponse(
+            await services.get_combined_address_data(serializer.data["id"])
+        )
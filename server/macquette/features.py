@@ -0,0 +1,193 @@
+"""
+Feature flags, switches and samples from Waffle, evaluated without going back to
+the database or cache for every flag on every page.
+
+Each process keeps a snapshot of every flag, switch and sample definition,
+including which users and groups each flag is active for.  The snapshot is
+tagged with a version, made of the number of rows and the latest modification
+time in each table (or for the tables of flags' users and groups, which have
+no modification time, the highest ID), and is reloaded when the version in the
+database changes.
+The version is checked at most once every FEATURE_FLAGS_MAX_AGE seconds, so a
+change made in the admin takes up to that long to reach every worker.
+
+The set of features that are active for a request is worked out once and kept
+on the request, and the user's groups are looked up at most once to do it.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.db.models import Count, Max, Model, TextField, Value
+from django.db.models.functions import Cast
+from django.http import HttpRequest
+from waffle import get_waffle_flag_model
+from waffle.models import AbstractBaseFlag, Sample, Switch
+from waffle.utils import get_setting
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: tuple[Any, ...]
+    flags: list[Any]
+    flag_users: dict[int, frozenset[int]]
+    flag_groups: dict[int, frozenset[int]]
+    switches: frozenset[str]
+    samples: list[Sample]
+
+
+_snapshot: Snapshot | None = None
+_checked_at = 0.0
+
+
+def _tables() -> list[tuple[type[Model], Max]]:
+    """Return each model the snapshot is made from, and what marks its latest row."""
+    flag_model = get_waffle_flag_model()
+    models: list[type[Model]] = [flag_model, Switch, Sample]
+    # Rows in these are only ever added or deleted, e.g. by `flag.users.add()`
+    # outside the admin, which doesn't touch the flag's modification time.
+    throughs: list[type[Model]] = [
+        # Waffle's flag model has these, though its abstract base doesn't.
+        flag_model.users.through,  # type: ignore[attr-defined]
+        flag_model.groups.through,  # type: ignore[attr-defined]
+    ]
+    return [
+        *((model, Max("modified")) for model in models),
+        *((through, Max("id")) for through in throughs),
+    ]
+
+
+def _version() -> tuple[Any, ...]:
+    """Return the current version of the definitions, in one query."""
+    first, *rest = (
+        model._default_manager.annotate(table=Value(model._meta.db_table))
+        .values("table")
+        .annotate(count=Count("id"), latest=Cast(latest, TextField()))
+        .values_list("table", "count", "latest")
+        .order_by()
+        for model, latest in _tables()
+    )
+    return tuple(sorted(first.union(*rest, all=True)))
+
+
+def _load(version: tuple[Any, ...]) -> Snapshot:
+    flag_model = get_waffle_flag_model()
+    flags = list(flag_model.objects.prefetch_related("users", "groups"))
+    return Snapshot(
+        version=version,
+        flags=flags,
+        flag_users={
+            flag.pk: frozenset(user.pk for user in flag.users.all()) for flag in flags
+        },
+        flag_groups={
+            flag.pk: frozenset(group.pk for group in flag.groups.all())
+            for flag in flags
+        },
+        switches=frozenset(
+            switch.name for switch in Switch.objects.filter(active=True)
+        ),
+        samples=list(Sample.objects.all()),
+    )
+
+
+def snapshot() -> Snapshot:
+    """Return the process's snapshot, reloading it first if it has changed."""
+    global _snapshot, _checked_at  # noqa: PLW0603
+
+    now = time.monotonic()
+    if _snapshot is None or now - _checked_at >= settings.FEATURE_FLAGS_MAX_AGE:
+        version = _version()
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = _load(version)
+        _checked_at = now
+
+    return _snapshot
+
+
+def clear():
+    """Forget the snapshot, so that the next request reloads it."""
+    global _snapshot  # noqa: PLW0603
+    _snapshot = None
+
+
+def _flag_is_active(
+    flag, request: HttpRequest, current: Snapshot, group_ids: frozenset[int]
+) -> bool:
+    """
+    Evaluate a flag the way `Flag.is_active` does, but using the user and group
+    IDs from the snapshot rather than looking them up in the cache.  `group_ids`
+    are the IDs of the user's groups.
+    """
+
+    # These read the query string or cookies and set cookies on the response (via
+    # WaffleMiddleware), so leave them to Waffle.
+    if get_setting("OVERRIDE") or flag.testing or flag.percent:
+        return bool(flag.is_active(request))
+
+    if flag.everyone is not None:
+        return flag.everyone
+
+    user = getattr(request, "user", None)
+    return bool(
+        _flag_is_active_for_language(flag, request)
+        or (
+            user is not None
+            and _flag_is_active_for_user(flag, user, current, group_ids)
+        )
+    )
+
+
+def _flag_is_active_for_language(flag, request: HttpRequest) -> bool:
+    if not flag.languages:
+        return False
+    languages = [language.strip() for language in flag.languages.split(",")]
+    return getattr(request, "LANGUAGE_CODE", None) in languages
+
+
+def _flag_is_active_for_user(
+    flag, user, current: Snapshot, group_ids: frozenset[int]
+) -> bool:
+    return bool(
+        # This checks the authenticated, staff and superusers options.
+        AbstractBaseFlag.is_active_for_user(flag, user)
+        or user.pk in current.flag_users[flag.pk]
+        or not current.flag_groups[flag.pk].isdisjoint(group_ids)
+    )
+
+
+def _group_ids(request: HttpRequest, current: Snapshot) -> frozenset[int]:
+    """Return the IDs of the user's groups, if any flag is active for a group."""
+    user = getattr(request, "user", None)
+    if (
+        user is None
+        or not user.is_authenticated
+        or not any(current.flag_groups.values())
+    ):
+        return frozenset()
+    return frozenset(user.groups.values_list("pk", flat=True))
+
+
+def active_features(request: HttpRequest) -> frozenset[str]:
+    """Return the names of the flags, switches and samples active for a request."""
+    features: frozenset[str] | None = getattr(request, "_active_features", None)
+    if features is not None:
+        return features
+
+    current = snapshot()
+    group_ids = _group_ids(request, current)
+    features = frozenset(
+        [
+            *(
+                flag.name
+                for flag in current.flags
+                if _flag_is_active(flag, request, current, group_ids)
+            ),
+            *current.switches,
+            # Samples are random each time, so only within a request are they fixed.
+            *(sample.name for sample in current.samples if sample.is_active()),
+        ]
+    )
+    request._active_features = features  # type: ignore[attr-defined]
+    return features
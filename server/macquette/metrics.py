@@ -0,0 +1,129 @@
+"""
+Prometheus metrics.
+
+Under gunicorn each worker writes its metrics to files in the directory named by
+PROMETHEUS_MULTIPROC_DIR (see config/gunicorn.py), and `render` collects the
+files of every worker, so it doesn't matter which worker serves a scrape.
+Without that variable, e.g. under runserver or in tests, metrics are kept in the
+process.
+
+MetricsMiddleware serves `render` at /.well-known/metrics and records the
+request and database metrics; the rest are recorded where the work happens.
+"""
+
+import functools
+import inspect
+import os
+import time
+from collections.abc import Callable
+from typing import Any, ParamSpec, TypeVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from returns.result import Failure
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Reports and graphs can take a while to render.
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+REQUEST_DURATION = Histogram(
+    "macquette_request_duration_seconds",
+    "Time to handle a request, by URL name",
+    ["view", "method", "status"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "macquette_request_db_queries",
+    "Number of database queries made by a request, by URL name",
+    ["view"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+REQUEST_DB_DURATION = Histogram(
+    "macquette_request_db_duration_seconds",
+    "Time a request spent waiting for database queries, by URL name",
+    ["view"],
+)
+REPORT_RENDER_DURATION = Histogram(
+    "macquette_report_render_duration_seconds",
+    "Time to render a report, as HTML or as PDF",
+    ["format"],
+    buckets=SLOW_BUCKETS,
+)
+GRAPH_RENDER_DURATION = Histogram(
+    "macquette_graph_render_duration_seconds",
+    "Time to render one graph for a report",
+    buckets=SLOW_BUCKETS,
+)
+IMAGE_PROCESSING_DURATION = Histogram(
+    "macquette_image_processing_duration_seconds",
+    "Time to make a thumbnail of an uploaded image",
+    buckets=SLOW_BUCKETS,
+)
+EXTERNAL_API_DURATION = Histogram(
+    "macquette_external_api_duration_seconds",
+    "Time taken by calls to external APIs, by service and outcome",
+    ["service", "outcome"],
+)
+
+
+def observe_external_api(service: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Record the duration of calls to the decorated function in
+    EXTERNAL_API_DURATION, with an outcome of "error" if it raises or returns a
+    `Failure` and "success" otherwise.  Calls to a coroutine function are timed
+    until the coroutine finishes.
+    """
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                started = time.perf_counter()
+                outcome = "error"
+                try:
+                    result = await func(*args, **kwargs)
+                    if not isinstance(result, Failure):
+                        outcome = "success"
+                    return result
+                finally:
+                    EXTERNAL_API_DURATION.labels(service, outcome).observe(
+                        time.perf_counter() - started
+                    )
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = func(*args, **kwargs)
+                if not isinstance(result, Failure):
+                    outcome = "success"
+                return result
+            finally:
+                EXTERNAL_API_DURATION.labels(service, outcome).observe(
+                    time.perf_counter() - started
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def render() -> tuple[bytes, str]:
+    """Return the current metrics in the text exposition format, and its type."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -1,7 +1,81 @@
-from django.http import HttpResponse
+import hashlib
+import hmac
+import logging
+import random
+import time
 
+import brotli
+import whitenoise.middleware
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.http import (
+    HttpResponse,
+    HttpResponseForbidden,
+    HttpResponseNotFound,
+    JsonResponse,
+)
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
 
-class HealthCheckMiddleware:
+from . import metrics
+from .queries import QueryAudit, async_execute_wrapper
+
+compression_logger = logging.getLogger("macquette.compression")
+queries_logger = logging.getLogger("macquette.queries")
+
+
+class SyncAndAsyncMiddleware:
+    """
+    Base for middleware that can be part of a sync or an async middleware chain.
+
+    Under ASGI, Django runs everything below a sync-only middleware in a thread,
+    so an async view (the address search) would hold that thread for as long as
+    it waits on other services.  As with Django's MiddlewareMixin, subclasses
+    whose `__call__` does more than pass the request on must return
+    `self.__acall__(request)` in async mode.
+    """
+
+    sync_capable = async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+
+class WhiteNoiseMiddleware(whitenoise.middleware.WhiteNoiseMiddleware):
+    """WhiteNoise's middleware, able to be part of an async middleware chain."""
+
+    sync_capable = async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class HealthCheckMiddleware(SyncAndAsyncMiddleware):
     """
     Respond to a health check with 200 message.
 
@@ -13,10 +87,354 @@ class HealthCheckMiddleware:
     MIDDLEWARE list.
     """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
     def __call__(self, request):
         if request.path == "/.well-known/x-healthcheck":
             return HttpResponse("ok")
         return self.get_response(request)
+
+
+class _QueryTimer:
+    """An execute_wrapper that counts queries and the time spent on them."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):  # noqa: PLR0913
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+class MetricsMiddleware(SyncAndAsyncMiddleware):
+    """
+    Serve Prometheus metrics at /.well-known/metrics, and record the duration and
+    database queries of every other request by the name of the URL it matched.
+
+    Scrapes must send METRICS_TOKEN as a bearer token; if it isn't set, the
+    metrics aren't served at all.
+
+    This should be placed just below HealthCheckMiddleware in the MIDDLEWARE list,
+    so that health checks aren't counted.
+    """
+
+    methods = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if request.path == "/.well-known/metrics":
+            return self.serve(request)
+
+        queries = _QueryTimer()
+        started = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        self.record(request, response, queries, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        if request.path == "/.well-known/metrics":
+            return await sync_to_async(self.serve)(request)
+
+        queries = _QueryTimer()
+        started = time.perf_counter()
+        async with async_execute_wrapper(queries):
+            response = await self.get_response(request)
+        self.record(request, response, queries, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, queries: _QueryTimer, duration: float):
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "unmatched"
+        method = request.method if request.method in self.methods else "other"
+        metrics.REQUEST_DURATION.labels(view, method, response.status_code).observe(
+            duration
+        )
+        metrics.REQUEST_DB_QUERIES.labels(view).observe(queries.count)
+        metrics.REQUEST_DB_DURATION.labels(view).observe(queries.duration)
+
+    def serve(self, request):
+        if not settings.METRICS_TOKEN:
+            return HttpResponseNotFound()
+        if not hmac.compare_digest(
+            request.headers.get("Authorization", ""),
+            f"Bearer {settings.METRICS_TOKEN}",
+        ):
+            return HttpResponseForbidden()
+
+        body, content_type = metrics.render()
+        return HttpResponse(body, content_type=content_type)
+
+
+class QueryAuditMiddleware(SyncAndAsyncMiddleware):
+    """
+    Watch the queries made by a sample of requests, and log a warning to
+    `macquette.queries` for each request that makes more than
+    QUERY_AUDIT_MAX_QUERIES queries, each query slower than
+    QUERY_AUDIT_SLOW_QUERY_MS, and each query shape repeated at least
+    QUERY_AUDIT_REPEATED_QUERIES times (which is usually an N+1).
+
+    QUERY_AUDIT_SAMPLE_RATE is the fraction of requests that are watched; the
+    rest only pay for a random number.  See macquette.queries.
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if random.random() >= settings.QUERY_AUDIT_SAMPLE_RATE:  # noqa: S311
+            return self.get_response(request)
+
+        audit = QueryAudit(settings.QUERY_AUDIT_SLOW_QUERY_MS / 1000)
+        with connection.execute_wrapper(audit):
+            response = self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        self.report(request, match.view_name if match else "unmatched", audit)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= settings.QUERY_AUDIT_SAMPLE_RATE:  # noqa: S311
+            return await self.get_response(request)
+
+        audit = QueryAudit(settings.QUERY_AUDIT_SLOW_QUERY_MS / 1000)
+        async with async_execute_wrapper(audit):
+            response = await self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        self.report(request, match.view_name if match else "unmatched", audit)
+        return response
+
+    @staticmethod
+    def report(request, view: str, audit: QueryAudit):
+        context = {"view": view, "method": request.method, "path": request.path}
+
+        if audit.count > settings.QUERY_AUDIT_MAX_QUERIES:
+            queries_logger.warning(
+                "%s %s (%s): %d queries in %.1f ms",
+                request.method,
+                request.path,
+                view,
+                audit.count,
+                audit.duration * 1000,
+                extra={
+                    **context,
+                    "query_count": audit.count,
+                    "query_duration": audit.duration,
+                },
+            )
+
+        for query in audit.slow:
+            queries_logger.warning(
+                "%s %s (%s): slow query from %s took %.1f ms: %s",
+                request.method,
+                request.path,
+                view,
+                query.origin,
+                query.duration * 1000,
+                query.sql,
+                extra={
+                    **context,
+                    "origin": query.origin,
+                    "sql": query.sql,
+                    "query_duration": query.duration,
+                },
+            )
+
+        for sql, shape in audit.repeated(settings.QUERY_AUDIT_REPEATED_QUERIES):
+            queries_logger.warning(
+                "%s %s (%s): possible N+1, %d queries from %s in %.1f ms: %s",
+                request.method,
+                request.path,
+                view,
+                shape.count,
+                shape.origin,
+                shape.duration * 1000,
+                sql,
+                extra={
+                    **context,
+                    "origin": shape.origin,
+                    "sql": sql,
+                    "query_count": shape.count,
+                    "query_duration": shape.duration,
+                },
+            )
+
+
+class RequestBodyLimitMiddleware(SyncAndAsyncMiddleware):
+    """
+    Refuse requests whose body is larger than the limit for the view they are
+    for with a 413, before anything has read the body.
+
+    The limit is REQUEST_BODY_LIMITS[URL name], or REQUEST_BODY_LIMIT for views
+    not listed.  Only the Content-Length is checked, as neither Django nor the
+    server reads more of the body than that.  A chunked body without one is
+    refused with a 411: under WSGI Django would read it as empty, but under ASGI
+    it would be read whole.  Under ASGI the body has already been spooled to a
+    temporary file by the time this runs, so there the limit only saves parsing
+    it.
+
+    This must be placed above django.middleware.csrf.CsrfViewMiddleware in the
+    MIDDLEWARE list, because its process_view reads form bodies.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        try:
+            length = int(request.META.get("CONTENT_LENGTH") or "")
+        except ValueError:
+            # Without a Content-Length, a request only has a body if it's chunked.
+            if "HTTP_TRANSFER_ENCODING" in request.META:
+                return JsonResponse(
+                    {"detail": "Request body must have a Content-Length."}, status=411
+                )
+            return None
+
+        limit = settings.REQUEST_BODY_LIMITS.get(
+            request.resolver_match.view_name, settings.REQUEST_BODY_LIMIT
+        )
+        if length > limit:
+            return JsonResponse(
+                {"detail": f"Request body is {length} bytes; the limit is {limit}."},
+                status=413,
+            )
+        return None
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Return the codings in an Accept-Encoding header mapped to their q-values."""
+    codings = {}
+    for part in header.split(","):
+        coding, *params = (token.strip() for token in part.split(";"))
+        if not coding:
+            continue
+
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding.lower()] = q
+    return codings
+
+
+class APICompressionMiddleware(SyncAndAsyncMiddleware):
+    """
+    Compress JSON responses with Brotli or gzip, whichever the client prefers.
+
+    Whitenoise compresses static files, but API responses would otherwise be sent
+    uncompressed.  Compressed GET bodies above `cache_min_length` are cached by
+    the digest of the uncompressed body, so that a response that doesn't change
+    between requests (e.g. a library that hasn't been updated) is only compressed
+    once per process.  Compressed bodies above `cache_max_length` aren't cached,
+    so that with the cache's MAX_ENTRIES the cache has a bounded size.
+
+    Each compressed response is logged at debug level to `macquette.compression`
+    with its size before and after and the CPU time spent compressing it.
+
+    This must be placed above any middleware that reads or changes the response
+    body in the MIDDLEWARE list.
+    """
+
+    content_types = ("application/json",)
+    min_length = 200
+    brotli_quality = 5
+    cache_alias = "compressed_responses"
+    cache_min_length = 16 * 1024
+    cache_max_length = 128 * 1024
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        # Compressing a large body takes long enough to hold up the event loop.
+        return await sync_to_async(self.process_response)(request, response)
+
+    def process_response(self, request, response):
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or not response.get("Content-Type", "").startswith(self.content_types)
+            or len(response.content) < self.min_length
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = self.choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        body = response.content
+        started = time.thread_time()
+        compressed, cached = self.compress(request, body, encoding)
+        cpu_time = time.thread_time() - started
+
+        compression_logger.debug(
+            "%s %s: %s %d -> %d bytes (ratio %.1f) in %.2f ms CPU%s",
+            request.method,
+            request.path,
+            encoding,
+            len(body),
+            len(compressed),
+            len(body) / len(compressed),
+            cpu_time * 1000,
+            " (cached)" if cached else "",
+        )
+
+        if len(compressed) >= len(body):
+            return response
+
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        response.headers["Content-Encoding"] = encoding
+
+        # As in django.middleware.gzip, a strong ETag must be made weak when the
+        # body is transformed (RFC 7232 section 2.1).
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+
+        return response
+
+    @staticmethod
+    def choose_encoding(accept_encoding: str) -> str | None:
+        codings = parse_accept_encoding(accept_encoding)
+        wildcard = codings.get("*", 0.0)
+        br = codings.get("br", wildcard)
+        gzip = codings.get("gzip", wildcard)
+
+        if br > 0 and br >= gzip:
+            return "br"
+        if gzip > 0:
+            return "gzip"
+        return None
+
+    def compress(self, request, body: bytes, encoding: str) -> tuple[bytes, bool]:
+        """Return the compressed body and whether it came from the cache."""
+        if request.method != "GET" or len(body) < self.cache_min_length:
+            return self._compress(body, encoding), False
+
+        cache = caches[self.cache_alias]
+        key = f"{encoding}:{hashlib.sha256(body).hexdigest()}"
+        compressed = cache.get(key)
+        if compressed is not None:
+            return compressed, True
+
+        compressed = self._compress(body, encoding)
+        if len(compressed) <= self.cache_max_length:
+            cache.set(key, compressed)
+        return compressed, False
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return compress_string(body)
@@ -0,0 +1,46 @@
+import codecs
+import io
+
+import orjson
+from django.conf import settings
+from rest_framework.parsers import BaseParser, JSONParser
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """
+    A drop-in replacement for DRF's JSONParser that uses orjson.
+
+    Anything orjson rejects is passed to the standard JSONParser, so input it
+    accepts (e.g. lone surrogate escapes) still parses and errors are reported
+    the same way.  The one difference is that integers too big for 64 bits are
+    parsed as floats.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+
+
+class StreamingJSONParser(BaseParser):
+    """
+    Accepts JSON bodies but leaves them unread: `request.data` is the stream, for
+    views that parse the body incrementally as it arrives.  A request without a
+    body has an empty dict as its `data`, as with other parsers.
+    """
+
+    media_type = "application/json"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream
@@ -0,0 +1,55 @@
+from django.contrib import admin
+from django.utils.html import format_html, format_html_join
+
+from .models import Profile
+
+
+@admin.register(Profile)
+class ProfileAdmin(admin.ModelAdmin):
+    list_display = [
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "duration",
+        "query_count",
+        "query_duration",
+        "user",
+    ]
+    list_filter = ["view_name", "method", "status_code"]
+    search_fields = ["path", "view_name"]
+    date_hierarchy = "created_at"
+    exclude = ["queries"]
+    readonly_fields = [
+        "created_at",
+        "user",
+        "method",
+        "path",
+        "view_name",
+        "status_code",
+        "duration",
+        "query_count",
+        "query_duration",
+        "flamegraph",
+        "query_log",
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Queries")
+    def query_log(self, profile):
+        rows = format_html_join(
+            "",
+            "<tr><td>{:.2f}</td><td><code>{}</code></td><td><pre>{}</pre></td></tr>",
+            (
+                (query["duration"] * 1000, query["origin"], query["sql"])
+                for query in profile.queries
+            ),
+        )
+        return format_html(
+            "<table><tr><th>ms</th><th>Origin</th><th>SQL</th></tr>{}</table>", rows
+        )
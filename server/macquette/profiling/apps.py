@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class ProfilingConfig(AppConfig):
+    name = "macquette.profiling"
+    verbose_name = _("Profiling")
@@ -0,0 +1,122 @@
+import time
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.urls import reverse
+
+from macquette.middleware import SyncAndAsyncMiddleware
+from macquette.queries import query_origin
+
+from .models import Profile
+
+
+class QueryLog:
+    """An execute_wrapper that records each query's SQL, duration and origin."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.entries: list[dict] = []
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):  # noqa: PLR0913
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            if len(self.entries) < self.limit:
+                self.entries.append(
+                    {"sql": sql, "duration": duration, "origin": query_origin()}
+                )
+
+
+class ProfilingMiddleware(SyncAndAsyncMiddleware):
+    """
+    Profile a request when a staff user asks for it, with an `X-Profile: 1`
+    header or a `profile=1` query parameter.
+
+    The request runs under pyinstrument's sampling profiler, and the result is
+    saved as a `Profile` along with a log of the request's queries.  The URL of
+    the profile in the admin is returned in the response's X-Profile header.
+    Other requests only pay for looking at the header and query string.
+
+    Setting PROFILING_ENABLED to False removes this middleware altogether.
+
+    This must be placed below AuthenticationMiddleware in the MIDDLEWARE list.
+    """
+
+    # Only the first this many queries are logged, though all are counted.
+    max_logged_queries = 2000
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if self.requested(request) and request.user.is_staff:
+            return self.profile(request, self.get_response)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if (
+            self.requested(request)
+            and await sync_to_async(lambda: request.user.is_staff)()
+        ):
+            # The profiler only samples the thread it was started in, so the
+            # request is profiled from a thread, which the rest of the chain
+            # (and a sync view) then runs in.
+            return await sync_to_async(self.profile)(
+                request, async_to_sync(self.get_response)
+            )
+        return await self.get_response(request)
+
+    @staticmethod
+    def requested(request) -> bool:
+        return (
+            request.headers.get("X-Profile") == "1" or request.GET.get("profile") == "1"
+        )
+
+    def profile(self, request, get_response):
+        # Only imported when needed, so that it costs nothing otherwise.
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        queries = QueryLog(self.max_logged_queries)
+        profiler = Profiler(async_mode="disabled")
+        started = time.perf_counter()
+        with connection.execute_wrapper(queries), profiler:
+            response = get_response(request)
+        duration = time.perf_counter() - started
+
+        match = getattr(request, "resolver_match", None)
+        profile = Profile(
+            user=request.user,
+            method=request.method,
+            path=request.get_full_path(),
+            view_name=match.view_name if match else "",
+            status_code=response.status_code,
+            duration=duration,
+            query_count=queries.count,
+            query_duration=queries.duration,
+            queries=queries.entries,
+        )
+        profile.flamegraph.save(
+            "profile.speedscope.json",
+            ContentFile(profiler.output(SpeedscopeRenderer()).encode()),
+            save=False,
+        )
+        profile.save()
+
+        response["X-Profile"] = reverse(
+            "admin:profiling_profile_change", args=[profile.pk]
+        )
+        return response
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.db import models
+
+
+class Profile(models.Model):
+    """
+    A profile of one request, recorded by ProfilingMiddleware.
+
+    `flamegraph` is a speedscope file (open it at https://www.speedscope.app/),
+    and `queries` lists the request's database queries as objects with `sql`,
+    `duration` (in seconds) and `origin` (the innermost line of our code that
+    made the query).
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    method = models.CharField(max_length=10)
+    path = models.TextField()
+    view_name = models.CharField(max_length=200, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration = models.FloatField(help_text="Seconds")
+    query_count = models.PositiveIntegerField()
+    query_duration = models.FloatField(help_text="Seconds")
+    queries = models.JSONField(default=list)
+    flamegraph = models.FileField(upload_to="profiles/")
+
+    def __str__(self):
+        return f"{self.method} {self.path} at {self.created_at:%Y-%m-%d %H:%M:%S}"
+
+    class Meta:
+        ordering = ["-created_at"]
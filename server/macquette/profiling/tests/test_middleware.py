@@ -0,0 +1,106 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from macquette.users.models import User
+from macquette.users.tests.factories import UserFactory
+
+from ..middleware import ProfilingMiddleware, QueryLog
+from ..models import Profile
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _file_storage(settings):
+    settings.DEFAULT_FILE_STORAGE = "django.core.files.storage.FileSystemStorage"
+
+
+def test_staff_can_profile_a_request(client):
+    user = UserFactory.create(is_staff=True)
+    client.force_login(user)
+
+    response = client.get("/v2/api/assessments/", HTTP_X_PROFILE="1")
+
+    assert response.status_code == 200
+    profile = Profile.objects.get()
+    assert response["X-Profile"] == f"/admin/profiling/profile/{profile.pk}/change/"
+    assert profile.user == user
+    assert profile.method == "GET"
+    assert profile.path == "/v2/api/assessments/"
+    assert profile.view_name == "v2:list-create-assessments"
+    assert profile.status_code == 200
+    assert profile.query_count == len(profile.queries) > 0
+    assert profile.query_duration <= profile.duration
+    # The list is a generic view, so its queries come from DRF.
+    assert any(
+        query["origin"].startswith("rest_framework/") for query in profile.queries
+    )
+    with profile.flamegraph.open() as f:
+        assert json.load(f)["$schema"].startswith("https://www.speedscope.app/")
+
+
+def test_staff_can_profile_a_request_under_asgi(async_client):
+    async_client.force_login(UserFactory.create(is_staff=True))
+
+    response = async_to_sync(async_client.get)("/v2/api/assessments/?profile=1")
+
+    assert response.status_code == 200
+    profile = Profile.objects.get()
+    assert response["X-Profile"] == f"/admin/profiling/profile/{profile.pk}/change/"
+    assert profile.view_name == "v2:list-create-assessments"
+    # The sync view ran in the profiled thread.
+    assert profile.query_count > 0
+
+
+def test_query_log():
+    log = QueryLog(limit=1)
+
+    with connection.execute_wrapper(log):
+        User.objects.count()
+        User.objects.exists()
+
+    assert log.count == 2
+    assert log.duration > 0
+    [query] = log.entries
+    assert query["sql"].startswith("SELECT COUNT(*)")
+    assert query["origin"].startswith("macquette/profiling/tests/test_middleware.py:")
+    assert query["origin"].endswith(" in test_query_log")
+
+
+def test_query_flag_also_profiles(client):
+    client.force_login(UserFactory.create(is_staff=True))
+
+    response = client.get("/v2/api/assessments/?profile=1")
+
+    assert response.status_code == 200
+    assert Profile.objects.get().path == "/v2/api/assessments/?profile=1"
+
+
+def test_only_asked_for_requests_are_profiled(client):
+    client.force_login(UserFactory.create(is_staff=True))
+
+    response = client.get("/v2/api/assessments/")
+
+    assert "X-Profile" not in response
+    assert not Profile.objects.exists()
+
+
+def test_non_staff_cannot_profile(client):
+    client.force_login(UserFactory.create())
+
+    response = client.get("/v2/api/assessments/", HTTP_X_PROFILE="1")
+
+    assert response.status_code == 200
+    assert "X-Profile" not in response
+    assert not Profile.objects.exists()
+
+
+def test_can_be_disabled(settings):
+    settings.PROFILING_ENABLED = False
+
+    with pytest.raises(MiddlewareNotUsed):
+        ProfilingMiddleware(lambda request: None)
@@ -0,0 +1,146 @@
+"""
+Tools for finding out which queries a request makes, and where they come from.
+
+QueryAuditMiddleware uses `QueryAudit` on a sample of requests to log requests
+that make too many queries, slow queries, and N+1 patterns, i.e. the same query
+shape made over and over, usually once per item of a list.  Each is logged to
+`macquette.queries` as a warning, with the details in the record's `extra` so
+that structured log handlers can pick them out.
+"""
+
+import contextlib
+import os
+import re
+import time
+import traceback
+from dataclasses import dataclass, field
+
+import django.core.handlers
+import django.db
+from asgiref.sync import sync_to_async
+from django.db import connection
+
+MACQUETTE_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.dirname(MACQUETTE_DIR)
+# Frames in the execute_wrappers themselves are never where a query came from.
+WRAPPER_FILES = (
+    os.path.abspath(__file__),
+    os.path.join(MACQUETTE_DIR, "middleware.py"),
+    os.path.join(MACQUETTE_DIR, "profiling", "middleware.py"),
+)
+DJANGO_DB_DIR = os.path.dirname(os.path.abspath(django.db.__file__))
+# Frames beyond these are in the middleware or the server, not the view.
+HANDLERS_DIR = os.path.dirname(os.path.abspath(django.core.handlers.__file__))
+
+# Lists of placeholders, e.g. from `pk__in`, vary in length with the data.
+PLACEHOLDER_LIST = re.compile(r"\bIN \(%s(?:, %s)*\)")
+
+
+@contextlib.asynccontextmanager
+async def async_execute_wrapper(wrapper):
+    """
+    As `connection.execute_wrapper`, for async middleware.
+
+    Connections belong to a thread, and under ASGI a request's queries are made
+    from the thread that sync_to_async runs its sync code in, so the wrapper has
+    to be installed on that thread's connection.
+    """
+    # `connection` has to be looked up from that thread too.
+    manager = await sync_to_async(lambda: connection.execute_wrapper(wrapper))()
+    await sync_to_async(manager.__enter__)()
+    try:
+        yield
+    finally:
+        await sync_to_async(manager.__exit__)(None, None, None)
+
+
+def query_origin() -> str:
+    """
+    Return the innermost line of our code in the current stack, or failing that
+    (e.g. for a generic view) the innermost line outside django.db.
+
+    Only the frames inside the view or middleware that made the query are looked
+    at, so that a query made by DRF doesn't look like it came from the outermost
+    middleware.
+    """
+    fallback = ""
+    for frame, lineno in traceback.walk_stack(None):
+        filename = frame.f_code.co_filename
+        if filename.startswith(HANDLERS_DIR):
+            break
+        if filename in WRAPPER_FILES:
+            continue
+        if filename.startswith(MACQUETTE_DIR):
+            path = os.path.relpath(filename, SERVER_DIR)
+            return f"{path}:{lineno} in {frame.f_code.co_name}"
+        if not fallback and not filename.startswith(DJANGO_DB_DIR):
+            path = filename.rpartition("site-packages/")[2]
+            fallback = f"{path}:{lineno} in {frame.f_code.co_name}"
+    return fallback
+
+
+def query_shape(sql: str) -> str:
+    """Return the SQL with any `IN` list of placeholders collapsed."""
+    return PLACEHOLDER_LIST.sub("IN (...)", sql)
+
+
+@dataclass
+class Shape:
+    count: int
+    duration: float
+    # Where the shape was first seen; the rest of an N+1 come from the same place.
+    origin: str
+
+
+@dataclass
+class SlowQuery:
+    sql: str
+    duration: float
+    origin: str
+
+
+@dataclass
+class QueryAudit:
+    """
+    An execute_wrapper that counts queries by shape, and notes the queries that
+    take longer than `slow_query_duration` seconds.
+
+    The stack is only walked for the first query of each shape and for slow
+    queries, so the cost per query is a dictionary lookup.
+    """
+
+    slow_query_duration: float
+    count: int = 0
+    duration: float = 0.0
+    shapes: dict[str, Shape] = field(default_factory=dict)
+    slow: list[SlowQuery] = field(default_factory=list)
+
+    def __call__(self, execute, sql, params, many, context):  # noqa: PLR0913
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+
+            key = query_shape(sql)
+            shape = self.shapes.get(key)
+            if shape is None:
+                shape = self.shapes[key] = Shape(0, 0.0, query_origin())
+            shape.count += 1
+            shape.duration += duration
+
+            if duration >= self.slow_query_duration:
+                self.slow.append(SlowQuery(sql, duration, query_origin()))
+
+    def repeated(self, threshold: int) -> list[tuple[str, Shape]]:
+        """Return the shapes made at least `threshold` times, most first."""
+        return sorted(
+            (
+                (sql, shape)
+                for sql, shape in self.shapes.items()
+                if shape.count >= threshold
+            ),
+            key=lambda item: -item[1].count,
+        )
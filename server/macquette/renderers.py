@@ -0,0 +1,77 @@
+import json
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+
+class RawJSON:
+    """
+    A JSON document that has already been serialised, e.g. a `jsonb` column read
+    as text, to be put into a response as-is instead of being decoded and encoded
+    again.
+    """
+
+    __slots__ = ("contents",)
+
+    def __init__(self, contents: str | bytes):
+        self.contents = contents
+
+    def __repr__(self):
+        return f"RawJSON({self.contents!r})"
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, RawJSON):
+            return json.loads(obj.contents)
+        return super().default(obj)
+
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    if isinstance(obj, RawJSON):
+        return orjson.Fragment(obj.contents)
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    A drop-in replacement for DRF's JSONRenderer that uses orjson.
+
+    Output matches JSONRenderer with its default settings (compact, non-ASCII
+    left as-is, U+2028/U+2029 escaped).  Types orjson doesn't handle natively,
+    like Decimal and timedelta, go through DRF's own encoder.  RawJSON values are
+    copied into the output verbatim.
+
+    The differences are that NaN and infinity are rendered as null rather than
+    raising an error, that integers too big for 64 bits fall back to the
+    standard JSONRenderer, and that exponents of floats are written without a
+    plus sign or leading zero, e.g. 1e20 and 1e-7 rather than 1e+20 and 1e-07.
+    Floats still decode to the same values.  Requests for indented output, e.g.
+    from the browsable API, also fall back to JSONRenderer.
+    """
+
+    encoder_class = JSONEncoder
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # These are valid JSON but not valid JavaScript, so DRF escapes them.
+        # See JSONRenderer.render.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
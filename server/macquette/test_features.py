@@ -0,0 +1,150 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser, Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from waffle import get_waffle_flag_model
+from waffle.models import Sample, Switch
+
+from macquette.users.tests.factories import UserFactory
+
+from . import features
+
+pytestmark = pytest.mark.django_db
+
+Flag = get_waffle_flag_model()
+
+
+@pytest.fixture(autouse=True)
+def _clear_snapshot():
+    features.clear()
+    yield
+    features.clear()
+
+
+def _request(request_factory, user=None):
+    request = request_factory.get("/")
+    request.user = user or AnonymousUser()
+    return request
+
+
+def test_active_features(request_factory):
+    user = UserFactory.create()
+    group = Group.objects.create(name="testers")
+    user.groups.add(group)
+    Flag.objects.create(name="everyone", everyone=True)
+    Flag.objects.create(name="nobody", everyone=False, superusers=True)
+    Flag.objects.create(name="authenticated", authenticated=True)
+    Flag.objects.create(name="staff", staff=True)
+    Flag.objects.create(name="user").users.add(user)
+    Flag.objects.create(name="group").groups.add(group)
+    Switch.objects.create(name="on", active=True)
+    Switch.objects.create(name="off", active=False)
+    Sample.objects.create(name="always", percent=100)
+    Sample.objects.create(name="never", percent=0)
+
+    assert features.active_features(_request(request_factory, user)) == {
+        "everyone",
+        "authenticated",
+        "user",
+        "group",
+        "on",
+        "always",
+    }
+    assert features.active_features(_request(request_factory)) == {
+        "everyone",
+        "on",
+        "always",
+    }
+
+
+def test_language_flags(request_factory):
+    Flag.objects.create(name="welsh", languages="cy, en-gb")
+    request = _request(request_factory)
+    assert features.active_features(request) == set()
+
+    request = _request(request_factory)
+    request.LANGUAGE_CODE = "en-gb"
+    assert features.active_features(request) == {"welsh"}
+
+
+def test_groups_are_looked_up_once_per_request(request_factory):
+    user = UserFactory.create()
+    group = Group.objects.create(name="testers")
+    user.groups.add(group)
+    Flag.objects.create(name="one").groups.add(group)
+    Flag.objects.create(name="two").groups.add(group)
+    Flag.objects.create(name="three").groups.add(Group.objects.create(name="other"))
+    features.active_features(_request(request_factory, user))
+
+    with CaptureQueriesContext(connection) as queries:
+        assert features.active_features(_request(request_factory, user)) == {
+            "one",
+            "two",
+        }
+    # The version, and the user's groups.
+    assert len(queries) == 2
+
+
+def test_features_are_evaluated_once_per_request(request_factory):
+    Flag.objects.create(name="everyone", everyone=True)
+    request = _request(request_factory)
+
+    features.active_features(request)
+    with CaptureQueriesContext(connection) as queries:
+        assert features.active_features(request) == {"everyone"}
+
+    assert len(queries) == 0
+
+
+def test_snapshot_is_reloaded_when_definitions_change(request_factory):
+    flag = Flag.objects.create(name="everyone", everyone=True)
+    features.active_features(_request(request_factory))
+
+    with CaptureQueriesContext(connection) as queries:
+        assert features.active_features(_request(request_factory)) == {"everyone"}
+    # Only the version is checked.
+    assert len(queries) == 1
+
+    flag.everyone = False
+    flag.save()
+    assert features.active_features(_request(request_factory)) == set()
+
+    flag.delete()
+    Switch.objects.create(name="on", active=True)
+    assert features.active_features(_request(request_factory)) == {"on"}
+
+
+def test_snapshot_is_reloaded_when_flag_users_or_groups_change(request_factory):
+    user = UserFactory.create()
+    group = Group.objects.create(name="testers")
+    user.groups.add(group)
+    flag = Flag.objects.create(name="flag")
+    assert features.active_features(_request(request_factory, user)) == set()
+
+    flag.users.add(user)
+    assert features.active_features(_request(request_factory, user)) == {"flag"}
+
+    # Swapping one user for another leaves the count as it was.
+    flag.users.remove(user)
+    flag.users.add(UserFactory.create())
+    assert features.active_features(_request(request_factory, user)) == set()
+
+    flag.groups.add(group)
+    assert features.active_features(_request(request_factory, user)) == {"flag"}
+
+
+def test_version_is_checked_at_most_every_max_age(
+    request_factory, settings, monkeypatch
+):
+    settings.FEATURE_FLAGS_MAX_AGE = 10
+    now = 1000.0
+    monkeypatch.setattr(features.time, "monotonic", lambda: now)
+    features.active_features(_request(request_factory))
+
+    Switch.objects.create(name="on", active=True)
+    with CaptureQueriesContext(connection) as queries:
+        assert features.active_features(_request(request_factory)) == set()
+    assert len(queries) == 0
+
+    now += 10
+    assert features.active_features(_request(request_factory)) == {"on"}
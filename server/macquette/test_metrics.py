@@ -0,0 +1,131 @@
+import pytest
+from asgiref.sync import async_to_sync
+from prometheus_client import REGISTRY
+from returns.result import Failure, Success
+
+from macquette.users.tests.factories import UserFactory
+
+from .metrics import observe_external_api
+
+pytestmark = pytest.mark.django_db
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_scrape(client, settings):
+    settings.METRICS_TOKEN = "secret"
+
+    response = client.get("/.well-known/metrics", HTTP_AUTHORIZATION="Bearer secret")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    assert b"# TYPE macquette_request_duration_seconds histogram" in response.content
+
+
+def test_scrape_needs_token(client, settings):
+    settings.METRICS_TOKEN = ""
+    assert client.get("/.well-known/metrics").status_code == 404
+
+    settings.METRICS_TOKEN = "secret"
+    assert client.get("/.well-known/metrics").status_code == 403
+    assert (
+        client.get(
+            "/.well-known/metrics", HTTP_AUTHORIZATION="Bearer wrong"
+        ).status_code
+        == 403
+    )
+    assert (
+        client.get(
+            "/.well-known/metrics", HTTP_AUTHORIZATION="Bearer secret"
+        ).status_code
+        == 200
+    )
+
+
+def test_requests_are_recorded_by_url_name(client):
+    view = "v2:list-create-assessments"
+    before = _value(
+        "macquette_request_duration_seconds_count",
+        view=view,
+        method="GET",
+        status="200",
+    )
+    queries_before = _value("macquette_request_db_queries_sum", view=view)
+    client.force_login(UserFactory.create())
+
+    response = client.get("/v2/api/assessments/")
+
+    assert response.status_code == 200
+    assert (
+        _value(
+            "macquette_request_duration_seconds_count",
+            view=view,
+            method="GET",
+            status="200",
+        )
+        == before + 1
+    )
+    assert _value("macquette_request_db_queries_sum", view=view) > queries_before
+
+
+def test_requests_are_recorded_under_asgi(async_client):
+    view = "v2:list-create-assessments"
+    queries_before = _value("macquette_request_db_queries_sum", view=view)
+    async_client.force_login(UserFactory.create())
+
+    # The view is sync, so its queries are made from another thread than the
+    # middleware's.
+    response = async_to_sync(async_client.get)("/v2/api/assessments/")
+
+    assert response.status_code == 200
+    assert _value("macquette_request_db_queries_sum", view=view) > queries_before
+
+
+def test_observe_external_api():
+    @observe_external_api("test")
+    def call(ok):
+        return Success(1) if ok else Failure("no")
+
+    @observe_external_api("test")
+    def broken():
+        raise ValueError
+
+    def count(outcome):
+        return _value(
+            "macquette_external_api_duration_seconds_count",
+            service="test",
+            outcome=outcome,
+        )
+
+    successes, errors = count("success"), count("error")
+
+    call(ok=True)
+    call(ok=False)
+    with pytest.raises(ValueError):
+        broken()
+
+    assert count("success") == successes + 1
+    assert count("error") == errors + 2
+
+
+def test_observe_external_api_async():
+    @observe_external_api("test_async")
+    async def call(ok):
+        return Success(1) if ok else Failure("no")
+
+    def count(outcome):
+        return _value(
+            "macquette_external_api_duration_seconds_count",
+            service="test_async",
+            outcome=outcome,
+        )
+
+    successes, errors = count("success"), count("error")
+
+    assert async_to_sync(call)(ok=True) == Success(1)
+    async_to_sync(call)(ok=False)
+
+    assert count("success") == successes + 1
+    assert count("error") == errors + 1
@@ -0,0 +1,180 @@
+import gzip
+import json
+
+import brotli
+import pytest
+from django.core.cache import caches
+from django.http import HttpResponse, JsonResponse
+from django.urls import get_resolver
+
+from .middleware import APICompressionMiddleware, parse_accept_encoding
+
+BODY = {"items": [{"name": f"item {n}", "uvalue": 1.9} for n in range(1000)]}
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    caches[APICompressionMiddleware.cache_alias].clear()
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, deflate;q=0.5, BR;q=0.9, *;q=0") == {
+        "gzip": 1.0,
+        "deflate": 0.5,
+        "br": 0.9,
+        "*": 0.0,
+    }
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0.1", "gzip"),
+        ("*", "br"),
+        ("identity", None),
+        ("gzip;q=0", None),
+        ("", None),
+    ],
+)
+def test_choose_encoding(header, expected):
+    assert APICompressionMiddleware.choose_encoding(header) == expected
+
+
+def _middleware(response):
+    return APICompressionMiddleware(lambda request: response)
+
+
+@pytest.mark.parametrize(
+    ("encoding", "decompress"),
+    [("br", brotli.decompress), ("gzip", gzip.decompress)],
+)
+def test_compresses_json_responses(request_factory, encoding, decompress):
+    request = request_factory.get("/v2/api/libraries/", HTTP_ACCEPT_ENCODING=encoding)
+
+    response = _middleware(JsonResponse(BODY))(request)
+
+    assert response["Content-Encoding"] == encoding
+    assert response["Vary"] == "Accept-Encoding"
+    assert int(response["Content-Length"]) == len(response.content)
+    assert json.loads(decompress(response.content)) == BODY
+
+
+def test_does_not_compress_without_accept_encoding(request_factory):
+    request = request_factory.get("/v2/api/libraries/")
+
+    response = _middleware(JsonResponse(BODY))(request)
+
+    assert not response.has_header("Content-Encoding")
+    assert response["Vary"] == "Accept-Encoding"
+    assert json.loads(response.content) == BODY
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        JsonResponse({"short": True}),
+        HttpResponse("<p>page</p>" * 100, content_type="text/html"),
+    ],
+)
+def test_does_not_compress_short_or_non_json_responses(request_factory, response):
+    request = request_factory.get("/", HTTP_ACCEPT_ENCODING="br")
+
+    response = _middleware(response)(request)
+
+    assert not response.has_header("Content-Encoding")
+
+
+def test_weakens_strong_etags(request_factory):
+    request = request_factory.get("/v2/api/libraries/", HTTP_ACCEPT_ENCODING="br")
+    response = JsonResponse(BODY)
+    response["ETag"] = '"abc"'
+
+    response = _middleware(response)(request)
+
+    assert response["ETag"] == 'W/"abc"'
+
+
+def test_caches_compressed_get_bodies(request_factory, monkeypatch, caplog):
+    middleware = APICompressionMiddleware(lambda request: JsonResponse(BODY))
+    calls = []
+    compress = middleware._compress
+    monkeypatch.setattr(
+        middleware, "_compress", lambda *args: calls.append(args) or compress(*args)
+    )
+
+    caplog.set_level("DEBUG", logger="macquette.compression")
+    for _ in range(2):
+        response = middleware(
+            request_factory.get("/v2/api/libraries/", HTTP_ACCEPT_ENCODING="br")
+        )
+        assert json.loads(brotli.decompress(response.content)) == BODY
+
+    assert len(calls) == 1
+    assert "(cached)" not in caplog.records[0].getMessage()
+    assert "(cached)" in caplog.records[1].getMessage()
+
+
+def test_does_not_cache_large_compressed_bodies(request_factory, monkeypatch):
+    middleware = APICompressionMiddleware(lambda request: JsonResponse(BODY))
+    middleware.cache_max_length = 10
+    calls = []
+    compress = middleware._compress
+    monkeypatch.setattr(
+        middleware, "_compress", lambda *args: calls.append(args) or compress(*args)
+    )
+
+    for _ in range(2):
+        middleware(request_factory.get("/v2/api/libraries/", HTTP_ACCEPT_ENCODING="br"))
+
+    assert len(calls) == 2
+
+
+@pytest.fixture()
+def _body_limits(settings):
+    settings.REQUEST_BODY_LIMIT = 100
+    settings.REQUEST_BODY_LIMITS = {"v2:sync-libraries": 1000}
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("_body_limits")
+@pytest.mark.parametrize(
+    ("url", "size", "status"),
+    [
+        # Neither is logged in, so a body within the limit gets as far as a 403.
+        ("/v2/api/assessments/", 100, 403),
+        ("/v2/api/assessments/", 101, 413),
+        ("/v2/api/libraries/sync/", 1000, 403),
+        ("/v2/api/libraries/sync/", 1001, 413),
+    ],
+)
+def test_refuses_bodies_over_the_limit_for_the_view(client, url, size, status):
+    response = client.post(url, b"x" * size, content_type="application/json")
+
+    assert response.status_code == status
+    if status == 413:
+        assert response.json() == {
+            "detail": f"Request body is {size} bytes; the limit is {size - 1}."
+        }
+
+
+@pytest.mark.django_db()
+def test_refuses_chunked_bodies(client):
+    response = client.generic(
+        "POST", "/v2/api/assessments/", HTTP_TRANSFER_ENCODING="chunked"
+    )
+
+    assert response.status_code == 411
+    assert response.json() == {"detail": "Request body must have a Content-Length."}
+
+    # Without a body at all, the request gets as far as a 403.
+    assert client.generic("POST", "/v2/api/assessments/").status_code == 403
+
+
+def test_body_limits_are_for_views_that_exist(settings):
+    _, v2 = get_resolver().namespace_dict["v2"]
+    names = {f"v2:{name}" for name in v2.reverse_dict if isinstance(name, str)}
+
+    assert set(settings.REQUEST_BODY_LIMITS) <= names
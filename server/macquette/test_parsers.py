@@ -0,0 +1,42 @@
+import io
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .parsers import ORJSONParser
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"a": 1, "b": [1.5, null, true, "c"], "d": {"e": {}}}',
+        b"[]",
+        '"non-ASCII: £ ü 漢字 🏠"'.encode(),
+        b'"escapes: \\u00a3 \\n \\u2028"',
+        b'"lone surrogate: \\ud800"',
+        b"  123  ",
+    ],
+)
+def test_output_matches_drf_json_parser(body):
+    assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(
+        io.BytesIO(body)
+    )
+
+
+@pytest.mark.parametrize("body", [b"", b"{", b'{"a": NaN}', b"[Infinity]"])
+def test_errors_match_drf_json_parser(body):
+    with pytest.raises(ParseError) as expected:
+        JSONParser().parse(io.BytesIO(body))
+
+    with pytest.raises(ParseError) as actual:
+        ORJSONParser().parse(io.BytesIO(body))
+
+    assert str(actual.value) == str(expected.value)
+
+
+def test_other_encodings_are_decoded():
+    body = '{"a": "£"}'.encode("latin-1")
+    context = {"encoding": "latin-1"}
+
+    assert ORJSONParser().parse(io.BytesIO(body), parser_context=context) == {"a": "£"}
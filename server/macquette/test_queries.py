@@ -0,0 +1,94 @@
+import logging
+
+import pytest
+from django.db import connection
+from django.http import HttpResponse
+
+from macquette.users.models import User
+from macquette.users.tests.factories import UserFactory
+
+from .middleware import QueryAuditMiddleware
+from .queries import QueryAudit, query_shape
+
+pytestmark = pytest.mark.django_db
+
+
+def test_query_shape():
+    assert query_shape('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s)') == (
+        'SELECT * FROM "t" WHERE "id" IN (...)'
+    )
+    assert query_shape('SELECT * FROM "t" WHERE "id" IN (%s) AND "a" = %s') == (
+        'SELECT * FROM "t" WHERE "id" IN (...) AND "a" = %s'
+    )
+
+
+def test_audit_counts_queries_by_shape():
+    users = UserFactory.create_batch(3)
+    audit = QueryAudit(slow_query_duration=60)
+
+    with connection.execute_wrapper(audit):
+        for user in users:
+            User.objects.get(pk=user.pk)
+        list(User.objects.filter(pk__in=[users[0].pk]))
+        list(User.objects.filter(pk__in=[user.pk for user in users]))
+
+    assert audit.count == 5
+    assert audit.slow == []
+    [(sql, shape), (in_sql, in_shape)] = audit.repeated(2)
+    assert shape.count == 3
+    assert shape.origin.startswith("macquette/test_queries.py:")
+    assert shape.origin.endswith(" in test_audit_counts_queries_by_shape")
+    assert in_shape.count == 2
+    assert "IN (...)" in in_sql
+    assert audit.repeated(4) == []
+
+
+def test_audit_notes_slow_queries():
+    audit = QueryAudit(slow_query_duration=0)
+
+    with connection.execute_wrapper(audit):
+        User.objects.count()
+
+    [slow] = audit.slow
+    assert slow.sql.startswith("SELECT COUNT(*)")
+    assert slow.origin.endswith(" in test_audit_notes_slow_queries")
+
+
+def _view(request):
+    for _ in range(3):
+        User.objects.exists()
+    return HttpResponse()
+
+
+@pytest.fixture()
+def _thresholds(settings):
+    settings.QUERY_AUDIT_SAMPLE_RATE = 1
+    settings.QUERY_AUDIT_MAX_QUERIES = 2
+    settings.QUERY_AUDIT_SLOW_QUERY_MS = 60_000
+    settings.QUERY_AUDIT_REPEATED_QUERIES = 3
+
+
+@pytest.mark.usefixtures("_thresholds")
+def test_middleware_logs_requests_over_thresholds(request_factory, caplog):
+    with caplog.at_level(logging.WARNING, logger="macquette.queries"):
+        QueryAuditMiddleware(_view)(request_factory.get("/things/"))
+
+    too_many, repeated = caplog.records
+    assert too_many.getMessage().startswith("GET /things/ (unmatched): 3 queries in ")
+    assert too_many.query_count == 3
+    assert "possible N+1, 3 queries from macquette/test_queries.py:" in (
+        repeated.getMessage()
+    )
+    assert repeated.view == "unmatched"
+    assert repeated.origin.endswith(" in _view")
+    assert repeated.sql.startswith("SELECT %s AS")
+
+
+@pytest.mark.usefixtures("_thresholds")
+def test_middleware_only_watches_a_sample(request_factory, caplog, settings):
+    settings.QUERY_AUDIT_SAMPLE_RATE = 0
+
+    with caplog.at_level(logging.WARNING, logger="macquette.queries"):
+        QueryAuditMiddleware(_view)(request_factory.get("/things/"))
+
+    assert caplog.records == []
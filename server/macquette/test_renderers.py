@@ -0,0 +1,94 @@
+import datetime
+import decimal
+import json
+import uuid
+import zoneinfo
+
+import pytest
+from django.utils.functional import lazystr
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import Serializer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from .renderers import ORJSONRenderer, RawJSON
+
+london = zoneinfo.ZoneInfo("Europe/London")
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"a": 1, "b": [1.5, None, True, "c"], "d": {"e": {}}},
+        [1e15, 0.0001, -2.5e-300, 5e-324],
+        [],
+        "plain string",
+        "non-ASCII: £ ü 漢字 🏠",
+        "line separators: \u2028 and \u2029",
+        decimal.Decimal("1.10"),
+        decimal.Decimal("3.14159265358979323846"),
+        datetime.datetime(2019, 6, 1, 16, 35, 34, tzinfo=datetime.UTC),
+        datetime.datetime(2019, 6, 1, 16, 35, 34, 123456, tzinfo=datetime.UTC),
+        datetime.datetime(2019, 6, 1, 16, 35, 34, tzinfo=london),
+        datetime.datetime(2019, 12, 1, 16, 35, 34, tzinfo=london),
+        datetime.datetime(2019, 6, 1, 16, 35, 34),  # noqa: DTZ001
+        datetime.date(2019, 6, 1),
+        datetime.time(16, 35, 34, 5),
+        datetime.timedelta(days=1, seconds=5),
+        uuid.UUID("c7aa2a2a-34ba-4d4b-9ee3-2e3e84e0ab38"),
+        ReturnDict({"id": "1"}, serializer=Serializer()),
+        ReturnList([{"id": "1"}], serializer=Serializer()),
+        lazystr("lazy"),
+        b"bytes",
+        {1: "int key"},
+        {3, 1, 2},
+        2**70,
+    ],
+)
+def test_output_matches_drf_json_renderer(data):
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (1e20, b"1e20"),
+        (1e-7, b"1e-7"),
+        (-1.5e300, b"-1.5e300"),
+        (1.2345678901234568e20, b"1.2345678901234568e20"),
+    ],
+)
+def test_float_exponents_differ_from_drf_json_renderer(value, expected):
+    data = {"a": value}
+
+    assert ORJSONRenderer().render(data) == b'{"a":' + expected + b"}"
+    assert ORJSONRenderer().render(data) != JSONRenderer().render(data)
+    assert json.loads(ORJSONRenderer().render(data)) == data
+
+
+def test_none_renders_as_empty_body():
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_indented_output_matches_drf_json_renderer():
+    data = {"a": [1, 2]}
+    media_type = "application/json; indent=4"
+
+    assert ORJSONRenderer().render(data, media_type) == JSONRenderer().render(
+        data, media_type
+    )
+
+
+@pytest.mark.parametrize("contents", ['{"a": [1, 2.5]}', b'{"a": [1, 2.5]}'])
+def test_raw_json_is_copied_verbatim(contents):
+    data = {"id": "1", "data": RawJSON(contents)}
+
+    assert ORJSONRenderer().render(data) == b'{"id":"1","data":{"a": [1, 2.5]}}'
+
+
+def test_raw_json_is_decoded_for_indented_output():
+    data = {"data": RawJSON('{"a": 1}')}
+    media_type = "application/json; indent=4"
+
+    assert ORJSONRenderer().render(data, media_type) == JSONRenderer().render(
+        {"data": {"a": 1}}, media_type
+    )
@@ -1,10 +1,13 @@
-from auth0.authentication import GetToken
-from auth0.management import Auth0
 from django.conf import settings
 from django.core.mail import send_mail
 
 
 def get_client():
+    # The management client imports aiohttp if it can, which is slow, and it is
+    # only needed when creating users.
+    from auth0.authentication import GetToken
+    from auth0.management import Auth0
+
     domain = settings.AUTH0_ENDPOINT
     get_token = GetToken(
         domain,
@@ -5,12 +5,15 @@ from jose import jwt
 from social_core.backends import auth0
 from social_django.middleware import SocialAuthExceptionMiddleware
 
+from macquette.middleware import SyncAndAsyncMiddleware
+
 logger = logging.getLogger(__name__)
 
 
-class ExceptionMiddleware(SocialAuthExceptionMiddleware):
+class ExceptionMiddleware(SyncAndAsyncMiddleware, SocialAuthExceptionMiddleware):
     """
     Override the social_auth middleware to behave in the way we want things to behave.
+    Unlike it, this can also be part of an async middleware chain.
 
     c.f. https://github.com/python-social-auth/social-app-django/blob/master/social_django/middleware.py
     """
@@ -2,7 +2,9 @@ from django.contrib import admin
 from django.db import models
 from django.forms import CheckboxSelectMultiple
 
+from .dashboard_statistics import buckets, record_change
 from .models import Assessment, Image, Library, Organisation, Report, ReportTemplate
+from .search import search_assessments
 
 
 @admin.register(Image)
@@ -21,6 +23,29 @@ class AssessmentAdmin(admin.ModelAdmin):
     list_filter = ["organisation", "status", "owner", "updated_at"]
     search_fields = ["name", "description"]
 
+    def get_search_results(self, request, queryset, search_term):
+        # Use the full-text index rather than search_fields' icontains scans
+        if not search_term:
+            return queryset, False
+        return search_assessments(queryset, search_term), False
+
+    # Keep the dashboard statistics up to date, as the API does
+    def save_model(self, request, obj, form, change):
+        before = (
+            buckets(Assessment.objects.defer("data").get(pk=obj.pk)) if change else []
+        )
+        super().save_model(request, obj, form, change)
+        record_change(before, buckets(obj))
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        record_change(buckets(obj), [])
+
+    def delete_queryset(self, request, queryset):
+        before = [bucket for obj in queryset.defer("data") for bucket in buckets(obj)]
+        super().delete_queryset(request, queryset)
+        record_change(before, [])
+
 
 @admin.register(Report)
 class ReportAdmin(admin.ModelAdmin):
@@ -40,8 +65,16 @@ class LibraryAdmin(admin.ModelAdmin):
     search_fields = ["name", "type"]
     formfield_overrides = {models.ManyToManyField: {"widget": CheckboxSelectMultiple}}
 
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(number_of_items=models.Count("items"))
+        )
+
+    @admin.display(ordering="number_of_items")
     def number_of_items(self, obj):
-        return len(obj.data)
+        return obj.number_of_items
 
 
 @admin.register(Organisation)
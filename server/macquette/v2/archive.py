@@ -0,0 +1,137 @@
+"""
+Cold storage for assessments that haven't been touched in a long time.
+
+Archiving an assessment moves its `data` into a zstd-compressed JSON file in
+the default file storage and leaves a stub in the table: `archived_at` and
+`archive` are set, and `data` keeps only the household section of the master
+scenario so that the address stays searchable.  Restoring does the reverse, and
+happens automatically when an archived assessment is read through the API.
+Assessments that have been restored count as touched when they were restored,
+so reading one doesn't get it archived again on the next run.
+
+Revisions (see macquette.v2.revisions) are left alone, and their keyframes
+hold full, if compressed, copies of the data, so the database as a whole
+shrinks by less than the assessment table does.
+"""
+
+import datetime
+
+import orjson
+import zstandard
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import BigIntegerField, Func, QuerySet, Sum
+from django.db.models.functions import Now
+
+from .models import Assessment
+from .revisions import data_digest
+
+# Archiving is a batch job, so trade speed for a smaller file.
+COMPRESSION_LEVEL = 12
+
+
+def _stub(data: dict) -> dict:
+    household = data.get("master", {}).get("household")
+    return {"master": {"household": household}} if household is not None else {}
+
+
+def archivable(updated_before: datetime.datetime) -> QuerySet[Assessment]:
+    """
+    Return the assessments that aren't archived and haven't been updated or
+    restored since `updated_before`.
+    """
+
+    return Assessment.objects.filter(
+        archived_at__isnull=True, updated_at__lt=updated_before
+    ).exclude(restored_at__gte=updated_before)
+
+
+def archive_assessment(pk: int, updated_before: datetime.datetime) -> int | None:
+    """
+    Archive an assessment if it hasn't been archived already and was last updated
+    or restored before `updated_before`.
+
+    Returns the size of the compressed file, or None if the assessment wasn't
+    archived.
+    """
+
+    with transaction.atomic():
+        try:
+            assessment = archivable(updated_before).select_for_update().get(pk=pk)
+        except Assessment.DoesNotExist:
+            return None
+
+        blob = zstandard.compress(orjson.dumps(assessment.data), COMPRESSION_LEVEL)
+        assessment.archive.save(f"{pk}.json.zst", ContentFile(blob), save=False)
+        try:
+            with assessment.archive.open("rb") as file:
+                stored = orjson.loads(zstandard.decompress(file.read()))
+            if data_digest(stored) != data_digest(assessment.data):
+                raise ValueError(f"archive of assessment {pk} doesn't match its data")
+
+            Assessment.objects.filter(pk=pk).update(
+                data=_stub(assessment.data),
+                archived_at=Now(),
+                archive=assessment.archive.name,
+            )
+        except BaseException:
+            assessment.archive.delete(save=False)
+            raise
+
+    return len(blob)
+
+
+def restore_assessment(assessment: Assessment):
+    """
+    Move an archived assessment's data back into the table, and update
+    `assessment` to match.  Does nothing if the assessment isn't archived.
+    """
+
+    with transaction.atomic():
+        locked = (
+            Assessment.objects.select_for_update()
+            .only("archived_at", "archive")
+            .get(pk=assessment.pk)
+        )
+        if locked.archived_at is not None:
+            with locked.archive.open("rb") as file:
+                data = orjson.loads(zstandard.decompress(file.read()))
+
+            Assessment.objects.filter(pk=assessment.pk).update(
+                data=data, archived_at=None, archive="", restored_at=Now()
+            )
+            archive = locked.archive
+            transaction.on_commit(lambda: archive.delete(save=False))
+        else:
+            data = Assessment.objects.values_list("data", flat=True).get(
+                pk=assessment.pk
+            )
+
+    assessment.data = data
+    assessment.archived_at = None
+    assessment.archive = ""
+
+
+def hot_table_size() -> dict[str, int]:
+    """
+    Return the size in bytes of the assessment table on disk, including its TOAST
+    table and indexes, and of the `data` stored in it.
+
+    Space freed by archiving is only reused after the table is vacuumed, and only
+    returned to the operating system by a VACUUM FULL, so expect `data_bytes` to
+    drop straight away but `total_bytes` to lag behind.
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_total_relation_size(%s::regclass)", [Assessment._meta.db_table]
+        )
+        (total_bytes,) = cursor.fetchone()
+
+    data_bytes = Assessment.objects.aggregate(
+        size=Sum(
+            Func("data", function="pg_column_size", output_field=BigIntegerField())
+        )
+    )["size"]
+
+    return {"total_bytes": total_bytes, "data_bytes": data_bytes or 0}
@@ -0,0 +1,210 @@
+"""
+Precomputed counts for the staff dashboard.
+
+Assessments are counted in `DashboardStatistic` buckets: by month created and
+status, and, once complete, by day last updated, organisation and duration.
+The API and the admin record changes to these as they happen with
+`record_change`, which only ever inserts rows, so concurrent requests don't
+contend.  Deleting an organisation needs nothing recording: its buckets keep
+their counts with no organisation, as its assessments do.  `compact` sums the
+rows for each bucket, and `rebuild` recounts everything from scratch, which
+is how to pick up changes made any other way, e.g. from a shell.  Users are
+counted by day of last login, which is only refreshed by `rebuild_logins`.
+
+The dashboard then reads a number of rows that depends on how many months
+it shows, not on how many assessments or users there are.
+"""
+
+import datetime
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count, DateField, F, Max, Q, Sum
+from django.db.models.functions import ExtractDay, TruncDate, TruncMonth, TruncYear
+from django.utils import timezone
+
+from macquette.users.models import User
+
+from .models import Assessment, DashboardStatistic
+from .models.dashboard_statistic import COMPLETED, CREATED, LAST_LOGIN
+
+BUCKET_FIELDS = ["metric", "date", "status", "organisation_id", "duration"]
+Bucket = tuple[str, datetime.date | None, str, int | None, int | None]
+
+
+def buckets(assessment: Assessment) -> list[Bucket]:
+    """Return the buckets an assessment is counted in, as BUCKET_FIELDS tuples."""
+
+    created = timezone.localdate(assessment.created_at).replace(day=1)
+    result: list[Bucket] = [(CREATED, created, assessment.status, None, None)]
+
+    if assessment.status == "Complete":
+        updated = timezone.localdate(assessment.updated_at)
+        duration = (assessment.updated_at - assessment.created_at).days
+        result.append((COMPLETED, updated, "", assessment.organisation_id, duration))
+
+    return result
+
+
+def record_change(before: list[Bucket], after: list[Bucket]):
+    """
+    Record that an assessment has moved from the `before` buckets to the `after`
+    buckets.  Pass [] as `before` for a new assessment, or as `after` for a
+    deleted one.
+    """
+
+    changes = Counter(after)
+    changes.subtract(before)
+    DashboardStatistic.objects.bulk_create(
+        DashboardStatistic(**dict(zip(BUCKET_FIELDS, bucket, strict=True)), count=n)
+        for bucket, n in changes.items()
+        if n != 0
+    )
+
+
+def compact():
+    """Replace the rows for each bucket with a single row of their total."""
+
+    with transaction.atomic():
+        last_id = DashboardStatistic.objects.aggregate(last_id=Max("id"))["last_id"]
+        if last_id is None:
+            return
+
+        rows = DashboardStatistic.objects.filter(id__lte=last_id)
+        totals = list(
+            rows.values(*BUCKET_FIELDS).annotate(total=Sum("count")).order_by()
+        )
+        rows.delete()
+        DashboardStatistic.objects.bulk_create(
+            DashboardStatistic(
+                **{field: row[field] for field in BUCKET_FIELDS}, count=row["total"]
+            )
+            for row in totals
+            if row["total"] != 0
+        )
+
+
+def rebuild_logins():
+    users = (
+        User.objects.annotate(date=TruncDate("last_login"))
+        .values("date")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+    with transaction.atomic():
+        DashboardStatistic.objects.filter(metric=LAST_LOGIN).delete()
+        DashboardStatistic.objects.bulk_create(
+            DashboardStatistic(metric=LAST_LOGIN, date=row["date"], count=row["count"])
+            for row in users
+        )
+
+
+def rebuild():
+    """Recount everything from the assessment and user tables."""
+
+    created = (
+        Assessment.objects.annotate(
+            date=TruncMonth("created_at", output_field=DateField())
+        )
+        .values("date", "status")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    completed = (
+        Assessment.objects.filter(status="Complete")
+        .annotate(
+            date=TruncDate("updated_at"),
+            duration=ExtractDay(F("updated_at") - F("created_at")),
+        )
+        .values("date", "organisation_id", "duration")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+    with transaction.atomic():
+        # Stop assessments changing while we count them, so that no changes are
+        # lost or counted twice.
+        with connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {Assessment._meta.db_table} IN SHARE MODE")
+        DashboardStatistic.objects.exclude(metric=LAST_LOGIN).delete()
+        DashboardStatistic.objects.bulk_create(
+            [
+                *(DashboardStatistic(metric=CREATED, **row) for row in created),
+                *(DashboardStatistic(metric=COMPLETED, **row) for row in completed),
+            ]
+        )
+        rebuild_logins()
+
+
+def dashboard_context() -> dict:
+    today = timezone.localdate()
+
+    def days_ago(days):
+        return today - datetime.timedelta(days=days)
+
+    def totals(metric, *group_by, **filters):
+        return (
+            DashboardStatistic.objects.filter(metric=metric, **filters)
+            .values(*group_by)
+            .annotate(count=Sum("count"))
+            .filter(count__gt=0)
+            .order_by(*group_by)
+        )
+
+    def total(metric, *args, **filters):
+        return (
+            DashboardStatistic.objects.filter(
+                *args, metric=metric, **filters
+            ).aggregate(count=Sum("count"))["count"]
+            or 0
+        )
+
+    completed_by_month = (
+        DashboardStatistic.objects.filter(metric=COMPLETED)
+        .annotate(month=TruncMonth("date"))
+        .values("month")
+        .annotate(count=Sum("count"))
+        .filter(count__gt=0)
+        .order_by("month")
+    )
+    completed_by_year = (
+        DashboardStatistic.objects.filter(metric=COMPLETED)
+        .annotate(year=TruncYear("date"))
+        .values("year", "organisation_id", "organisation__name")
+        .annotate(count=Sum("count"))
+        .filter(count__gt=0)
+        .order_by("year")
+    )
+    logins_by_month = (
+        DashboardStatistic.objects.filter(metric=LAST_LOGIN)
+        .annotate(month=TruncMonth("date"))
+        .values("month")
+        .annotate(count=Sum("count"))
+        .filter(count__gt=0)
+        .order_by("month")
+    )
+
+    return {
+        "total_assessments": total(CREATED),
+        "completed_assessments_by_updated_month": completed_by_month,
+        "assessments_by_month": (
+            DashboardStatistic.objects.filter(metric=CREATED)
+            .exclude(status="Test")
+            .annotate(month=F("date"))
+            .values("month")
+            .annotate(count=Sum("count"))
+            .filter(count__gt=0)
+            .order_by("month")
+        ),
+        "assessments_by_year": completed_by_year,
+        "duration_last60": totals(COMPLETED, "duration", date__gt=days_ago(60)),
+        "duration_prev60": totals(
+            COMPLETED, "duration", date__gt=days_ago(120), date__lt=days_ago(60)
+        ),
+        "user_total_count": total(LAST_LOGIN),
+        "user_recent_count": total(
+            LAST_LOGIN, Q(date__isnull=True) | Q(date__gte=days_ago(90))
+        ),
+        "user_counts_by_login_month": logins_by_month,
+    }
@@ -0,0 +1,164 @@
+"""
+Duplicating assessments without moving their data or images through the app.
+
+The assessment row is copied with a single INSERT ... SELECT, and image files
+are copied by the storage backend itself: on S3 with CopyObject, in parallel,
+and on the local filesystem with a file copy.  The files are only copied once
+the transaction commits, so that a rollback doesn't leave orphaned copies in
+storage.  If an image's files can't be copied, the image is deleted from the
+duplicate rather than left pointing at files that don't exist.
+"""
+
+import logging
+import pathlib
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.storage import FileSystemStorage, Storage
+from django.db import connection, transaction
+from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name, safe_join
+
+from .models import Assessment, Image
+
+# S3 copies are a network round trip each, so do several at once.
+COPY_THREADS = 8
+
+logger = logging.getLogger(__name__)
+
+Copy = tuple[Storage, str, str]
+
+
+def copy_stored_file(storage: Storage, source: str, target: str):
+    """Copy a file within `storage`, server-side where the backend allows it."""
+
+    if isinstance(storage, FileSystemStorage):
+        target_path = pathlib.Path(storage.path(target))
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(storage.path(source), target_path)
+    elif isinstance(storage, S3Boto3Storage):
+        # `connection` is per-thread.
+        storage.connection.meta.client.copy_object(
+            Bucket=storage.bucket_name,
+            Key=safe_join(storage.location, clean_name(target)),
+            CopySource={
+                "Bucket": storage.bucket_name,
+                "Key": safe_join(storage.location, clean_name(source)),
+            },
+        )
+    else:
+        with storage.open(source) as file:
+            storage.save(target, file)
+
+
+def _copy_image_files(copied: list[tuple[Image, list[Copy]]]):
+    """
+    Copy the files of newly created images, and delete any image whose files
+    couldn't all be copied, along with those that were.
+    """
+
+    def copy_file(image: Image, copy: Copy) -> Image | None:
+        try:
+            copy_stored_file(*copy)
+        except Exception:
+            logger.exception("couldn't copy %s for image %s", copy[1], image.pk)
+            return image
+        return None
+
+    with ThreadPoolExecutor(max_workers=COPY_THREADS) as executor:
+        results = executor.map(
+            lambda file: copy_file(*file),
+            [(image, copy) for image, copies in copied for copy in copies],
+        )
+        failed = {image.pk for image in results if image is not None}
+
+    if not failed:
+        return
+    Image.objects.filter(pk__in=failed).delete()
+    for image, copies in copied:
+        if image.pk in failed:
+            for storage, _, target in copies:
+                try:
+                    storage.delete(target)
+                except Exception:
+                    logger.exception("couldn't delete %s", target)
+
+
+def _copy_image(image: Image, assessment_id: int) -> tuple[Image, list[Copy]]:
+    new = Image(
+        uuid=uuid.uuid4(),
+        assessment_id=assessment_id,
+        height=image.height,
+        width=image.width,
+        thumbnail_height=image.thumbnail_height,
+        thumbnail_width=image.thumbnail_width,
+        note=image.note,
+    )
+    new.image.name = new._image_path(image.image.name)
+    new.thumbnail.name = new._thumbnail_path(image.thumbnail.name)
+
+    copies = [
+        (image.image.storage, image.image.name, new.image.name),
+        (image.thumbnail.storage, image.thumbnail.name, new.thumbnail.name),
+    ]
+    return new, copies
+
+
+def duplicate_assessment(original: Assessment, **overrides) -> int:
+    """
+    Copy an assessment, including its data and images, and return the new
+    assessment's id.  `overrides` are values for columns that should differ
+    from the original, such as `owner_id`; they must be given as literals,
+    not expressions.
+
+    The image files are copied when the current transaction commits (see above).
+
+    The original mustn't be archived: restore it first.
+    """
+
+    assert original.archived_at is None, "can't duplicate an archived assessment"
+
+    fields = [
+        field
+        for field in Assessment._meta.local_fields
+        if not field.primary_key and field.attname != "featured_image_id"
+    ]
+    columns = [connection.ops.quote_name(field.column) for field in fields]
+    values = []
+    params = []
+    for field in fields:
+        if field.attname in overrides:
+            values.append("%s")
+            params.append(
+                field.get_db_prep_save(overrides.pop(field.attname), connection)
+            )
+        elif field.attname in ("created_at", "updated_at"):
+            values.append("now()")
+        elif field.attname == "restored_at":
+            values.append("NULL")
+        else:
+            values.append(connection.ops.quote_name(field.column))
+    assert not overrides, f"unknown fields {list(overrides)}"
+
+    table = connection.ops.quote_name(Assessment._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(columns)})"  # noqa: S608
+            f" SELECT {', '.join(values)} FROM {table} WHERE id = %s RETURNING id",
+            [*params, original.pk],
+        )
+        (new_id,) = cursor.fetchone()
+
+    images = list(original.images.all())
+    copied = [_copy_image(image, new_id) for image in images]
+    new_images = Image.objects.bulk_create([new for new, _ in copied])
+    transaction.on_commit(lambda: _copy_image_files(copied))
+
+    if original.featured_image_id is not None:
+        featured = {old.pk: new.pk for old, new in zip(images, new_images, strict=True)}
+        Assessment.objects.filter(pk=new_id).update(
+            featured_image_id=featured.get(original.featured_image_id)
+        )
+
+    return new_id
@@ -0,0 +1,172 @@
+"""
+A model field for large JSON values, stored zstd-compressed in a `bytea` column.
+
+Postgres compresses large `jsonb` values itself, but with pglz, which is slow
+and does badly on our documents.  This field compresses them with zstd, using
+the latest trained `CompressionDictionary` if there is one, which helps most
+with the many keys repeated across documents.
+
+Values are only decompressed when they're first read from the model instance,
+so loading rows to update other fields, or saving them again unchanged, costs
+nothing extra.  `values()` and `values_list()` return `CompressedJSON`
+objects: call `load()` to get the value.
+
+Because the database can't see inside the value, it can't be queried on, and
+the column should be set to `STORAGE EXTERNAL` so that Postgres doesn't try to
+compress it again.
+"""
+
+import functools
+from typing import Any
+
+import orjson
+import zstandard
+from django import forms
+from django.db import models
+
+COMPRESSION_LEVEL = 3
+
+
+@functools.cache
+def _dictionary(dict_id: int) -> zstandard.ZstdCompressionDict:
+    from .models import CompressionDictionary
+
+    data = CompressionDictionary.objects.values_list("data", flat=True).get(
+        dict_id=dict_id
+    )
+    return zstandard.ZstdCompressionDict(bytes(data))
+
+
+_latest: zstandard.ZstdCompressionDict | None = None
+
+
+def _latest_dictionary() -> zstandard.ZstdCompressionDict | None:
+    global _latest  # noqa: PLW0603
+    from .models import CompressionDictionary
+
+    # Once found, the dictionary is kept for the life of the process, so
+    # processes only start compressing with a newer one once they're restarted.
+    # Until there is one, each value compressed looks again.
+    if _latest is not None:
+        return _latest
+    dict_id = (
+        CompressionDictionary.objects.order_by("-created_at", "-id")
+        .values_list("dict_id", flat=True)
+        .first()
+    )
+    if dict_id is None:
+        return None
+    dictionary = _dictionary(dict_id)
+    # So that each compressor doesn't have to digest the dictionary again.
+    dictionary.precompute_compress(level=COMPRESSION_LEVEL)
+    _latest = dictionary
+    return dictionary
+
+
+def _compressor() -> zstandard.ZstdCompressor:
+    # Compressors aren't thread-safe, so each call gets its own.
+    dictionary = _latest_dictionary()
+    if dictionary is None:
+        return zstandard.ZstdCompressor(level=COMPRESSION_LEVEL)
+    return zstandard.ZstdCompressor(level=COMPRESSION_LEVEL, dict_data=dictionary)
+
+
+def clear_caches():
+    """Forget the cached dictionaries, e.g. after training a new one."""
+    global _latest  # noqa: PLW0603
+
+    _dictionary.cache_clear()
+    _latest = None
+
+
+def compress(value: Any) -> bytes:
+    return _compressor().compress(orjson.dumps(value))
+
+
+def decompress(blob: bytes) -> Any:
+    dict_id = zstandard.get_frame_parameters(blob).dict_id
+    if dict_id:
+        decompressor = zstandard.ZstdDecompressor(dict_data=_dictionary(dict_id))
+    else:
+        decompressor = zstandard.ZstdDecompressor()
+    return orjson.loads(decompressor.decompress(blob))
+
+
+class CompressedJSON:
+    """A compressed value as read from the database, not yet decompressed."""
+
+    __slots__ = ("blob",)
+
+    def __init__(self, blob: bytes):
+        self.blob = blob
+
+    def load(self) -> Any:
+        return decompress(self.blob)
+
+    def __repr__(self):
+        return f"<CompressedJSON: {len(self.blob)} bytes>"
+
+
+class _LazyDescriptor:
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        if self.field.attname not in instance.__dict__:
+            # Deferred: load it, as Django's DeferredAttribute would.
+            instance.refresh_from_db(fields=[self.field.attname])
+        value = instance.__dict__[self.field.attname]
+        if isinstance(value, CompressedJSON):
+            value = instance.__dict__[self.field.attname] = value.load()
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class CompressedJSONField(models.Field):
+    description = "A JSON value, stored compressed"
+    empty_values = [None]
+
+    def get_internal_type(self):
+        return "BinaryField"
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+        setattr(cls, self.attname, _LazyDescriptor(self))
+
+    def pre_save(self, model_instance, add):
+        # Bypass the descriptor, so that saving doesn't decompress the value.
+        return model_instance.__dict__.get(self.attname)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return CompressedJSON(bytes(value))
+
+    def to_python(self, value):
+        if isinstance(value, CompressedJSON):
+            return value.load()
+        return value
+
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        if isinstance(value, CompressedJSON):
+            # Never read, so unchanged: write back the bytes we loaded.
+            return value.blob
+        return compress(value)
+
+    def get_db_prep_value(self, value, connection, prepared=False):  # noqa: FBT002
+        value = super().get_db_prep_value(value, connection, prepared)
+        if value is not None:
+            return connection.Database.Binary(value)
+        return value
+
+    def value_to_string(self, obj):
+        return orjson.dumps(self.value_from_object(obj)).decode()
+
+    def formfield(self, **kwargs):
+        return super().formfield(**{"form_class": forms.JSONField, **kwargs})
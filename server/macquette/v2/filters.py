@@ -0,0 +1,41 @@
+from rest_framework import exceptions
+from rest_framework.filters import BaseFilterBackend
+
+from .models.assessment import STATUS_CHOICES
+
+
+class AssessmentFilter(BaseFilterBackend):
+    """
+    Filter assessment lists by query parameters:
+
+    * `status` - may be given more than once to match any of several statuses
+    * `owner` - the ID of the owning user
+    * `search` - a case-insensitive substring of the assessment name
+    """
+
+    valid_statuses = {value for value, _ in STATUS_CHOICES}
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        statuses = params.getlist("status")
+        if statuses:
+            invalid = set(statuses) - self.valid_statuses
+            if invalid:
+                raise exceptions.ValidationError(
+                    {"status": f"Invalid status: {', '.join(sorted(invalid))}"}
+                )
+            queryset = queryset.filter(status__in=statuses)
+
+        owner = params.get("owner")
+        if owner is not None:
+            try:
+                queryset = queryset.filter(owner_id=int(owner))
+            except ValueError:
+                raise exceptions.ValidationError({"owner": "Must be a user ID."})
+
+        search = params.get("search")
+        if search:
+            queryset = queryset.filter(name__icontains=search)
+
+        return queryset
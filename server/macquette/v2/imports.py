@@ -0,0 +1,188 @@
+"""
+Bulk imports of libraries and assessments, read from the request body as it
+arrives with ijson rather than parsed into memory whole.
+
+Each library or assessment is validated and saved as soon as it has been read,
+and a library's items are saved in batches while the rest of the library is
+still arriving.  Only the IDs of what has been saved are kept, so a worker only
+holds one assessment or one batch of items at a time however large the body
+is.  Imports run in the request's transaction, so if anything is invalid
+nothing is saved.
+"""
+
+from collections.abc import Iterator
+
+import ijson
+from rest_framework import exceptions, serializers
+
+from .dashboard_statistics import buckets, record_change
+from .models import Assessment, Library, LibraryItem
+from .revisions import record_revision
+from .serializers import LibraryItemSerializer, LibraryMetadataSerializer
+from .validators import validate_assessment_data
+
+ITEM_BATCH_SIZE = 500
+
+_STARTS = {"start_map", "start_array"}
+_ENDS = {"end_map", "end_array"}
+
+Events = Iterator[tuple[str, object]]
+
+
+class AssessmentImportSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    description = serializers.CharField(allow_blank=True, required=False)
+    # SAFETY: this field shadows a property of the same name but with a
+    # different type. This is fine at runtime but not in typechecking (yet).
+    data = serializers.JSONField(  # type: ignore[assignment]
+        default=dict, validators=[validate_assessment_data]
+    )
+
+
+def _events(stream) -> Events:
+    if not hasattr(stream, "read"):
+        # StreamingJSONParser gives an empty dict for a request without a body.
+        raise exceptions.ParseError("Expected an array")
+    try:
+        yield from ijson.basic_parse(stream, use_float=True)
+    except ijson.JSONError as e:
+        # yajl's messages go on to point at the error over several lines.
+        message = str(e).partition("\n")[0]
+        raise exceptions.ParseError(f"JSON parse error - {message}") from e
+
+
+def _next(events: Events) -> tuple[str, object]:
+    try:
+        return next(events)
+    except StopIteration:
+        raise exceptions.ParseError("JSON parse error - unexpected end") from None
+
+
+def _expect(events: Events, expected: str):
+    event, _ = _next(events)
+    if event != expected:
+        kind = "an array" if expected == "start_array" else "an object"
+        raise exceptions.ParseError(f"Expected {kind}")
+
+
+def _value(events: Events) -> object:
+    """Read the next value, e.g. one library item, whole."""
+    builder = ijson.ObjectBuilder()
+    depth = 0
+    while True:
+        event, value = _next(events)
+        builder.event(event, value)
+        if event in _STARTS:
+            depth += 1
+        elif event in _ENDS:
+            depth -= 1
+        if depth == 0:
+            return builder.value
+
+
+def _elements(events: Events) -> Iterator[int]:
+    """
+    Read the start of an array and yield the index of each of its elements; the
+    caller must read each element from `events` before asking for the next.
+    """
+    _expect(events, "start_array")
+    index = 0
+    while True:
+        event, _ = _next(events)
+        if event == "end_array":
+            return
+        if event != "start_map":
+            raise exceptions.ValidationError({f"{index}": ["Expected an object."]})
+        yield index
+        index += 1
+
+
+def _keys(events: Events) -> Iterator[str]:
+    """
+    Yield each key of an object whose start has been read; the caller must read
+    each value from `events` before asking for the next key.
+    """
+    while True:
+        event, key = _next(events)
+        if event == "end_map":
+            return
+        assert isinstance(key, str)
+        yield key
+
+
+def import_libraries(stream, request) -> list[int]:
+    """
+    Create a personal library for the user from each object in a JSON array of
+    libraries, in the same format as for creating one library, and return their
+    IDs.
+    """
+    ids = []
+    events = _events(stream)
+    for index in _elements(events):
+        # The name and type may come after the items, so they're filled in once
+        # the whole library has been read.
+        library = Library.objects.create(owner_user=request.user, name="", type="")
+        fields = {}
+        for key in _keys(events):
+            if key == "data":
+                _expect(events, "start_map")
+                _import_items(library, events, index)
+            else:
+                fields[key] = _value(events)
+
+        serializer = LibraryMetadataSerializer(
+            library, data=fields, context={"request": request}
+        )
+        if not serializer.is_valid():
+            raise exceptions.ValidationError({f"{index}": serializer.errors})
+        ids.append(serializer.save().pk)
+    return ids
+
+
+def _import_items(library: Library, events: Events, index: int):
+    tags = set()
+    batch = []
+    for tag in _keys(events):
+        serializer = LibraryItemSerializer(data={"tag": tag, "item": _value(events)})
+        if not serializer.is_valid():
+            raise exceptions.ValidationError(
+                {f"{index}": {"data": {tag: serializer.errors}}}
+            )
+        if tag in tags:
+            raise exceptions.ValidationError(
+                {f"{index}": {"data": {tag: ["This tag is used more than once."]}}}
+            )
+        tags.add(tag)
+
+        batch.append(
+            LibraryItem(
+                library=library, tag=tag, data=serializer.validated_data["item"]
+            )
+        )
+        if len(batch) >= ITEM_BATCH_SIZE:
+            LibraryItem.objects.bulk_create(batch)
+            batch = []
+    LibraryItem.objects.bulk_create(batch)
+
+
+def import_assessments(stream, request) -> list[int]:
+    """
+    Create an assessment owned by the user from each object in a JSON array of
+    assessments, each with a `name` and optionally a `description` and `data`,
+    and return their IDs.
+    """
+    ids = []
+    events = _events(stream)
+    for index in _elements(events):
+        fields = {key: _value(events) for key in _keys(events)}
+        serializer = AssessmentImportSerializer(data=fields)
+        if not serializer.is_valid():
+            raise exceptions.ValidationError({f"{index}": serializer.errors})
+
+        assessment = Assessment.objects.create(
+            **serializer.validated_data, owner=request.user
+        )
+        record_revision(assessment, user=request.user)
+        record_change([], buckets(assessment))
+        ids.append(assessment.pk)
+    return ids
@@ -0,0 +1,85 @@
+"""
+A compact diff and patch format for JSON documents.
+
+A patch is a JSON array in one of three forms:
+
+* `["=", value]` replaces the whole value.
+* `["o", {key: patch}, [key, ...]]` patches an object's members and then deletes
+  the listed keys.  New members are added with a replacing patch.
+* `["a", length, {index: patch}]` truncates or extends an array to `length`
+  and patches the elements at the given indexes (as strings, so the patch can
+  be stored as JSON).  New elements are added with a replacing patch.
+"""
+
+from typing import Any
+
+REPLACE = "="
+OBJECT = "o"
+ARRAY = "a"
+
+
+def diff(old: Any, new: Any) -> list[Any] | None:
+    """Return a patch that turns `old` into `new`, or None if they are equal."""
+
+    # Compare types exactly so that e.g. 1 and True, or 1 and 1.0, differ.
+    if type(old) is not type(new):
+        return [REPLACE, new]
+
+    if isinstance(new, dict):
+        changes = {}
+        for key, value in new.items():
+            if key not in old:
+                changes[key] = [REPLACE, value]
+            elif (patch := diff(old[key], value)) is not None:
+                changes[key] = patch
+        deleted = [key for key in old if key not in new]
+
+        if not changes and not deleted:
+            return None
+        return [OBJECT, changes, deleted]
+
+    if isinstance(new, list):
+        changes = {}
+        for index, value in enumerate(new):
+            if index >= len(old):
+                changes[str(index)] = [REPLACE, value]
+            elif (patch := diff(old[index], value)) is not None:
+                changes[str(index)] = patch
+
+        if not changes and len(new) == len(old):
+            return None
+        return [ARRAY, len(new), changes]
+
+    return None if old == new else [REPLACE, new]
+
+
+def apply(value: Any, patch: list[Any]) -> Any:
+    """
+    Apply `patch` to `value` and return the result.
+
+    Objects and arrays in `value` are changed in place, and values from the
+    patch may end up in the result, so neither should be used again afterwards.
+    """
+
+    kind = patch[0]
+
+    if kind == REPLACE:
+        return patch[1]
+
+    if kind == OBJECT:
+        _, changes, deleted = patch
+        for key, change in changes.items():
+            value[key] = apply(value.get(key), change)
+        for key in deleted:
+            del value[key]
+        return value
+
+    if kind == ARRAY:
+        _, length, changes = patch
+        del value[length:]
+        value.extend([None] * (length - len(value)))
+        for index, change in changes.items():
+            value[int(index)] = apply(value[int(index)], change)
+        return value
+
+    raise ValueError(f"unknown patch type {kind!r}")
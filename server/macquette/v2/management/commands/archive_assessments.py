@@ -0,0 +1,80 @@
+from dateutil.relativedelta import relativedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...archive import archivable, archive_assessment, hot_table_size
+
+
+def _size(num_bytes: int) -> str:
+    return f"{num_bytes / 1024 / 1024:.1f} MiB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the data of assessments that haven't been updated or restored for a"
+        " while into compressed files in storage.  Archived assessments are"
+        " restored automatically when they are next opened."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=12,
+            help="archive assessments not updated or restored for this many months"
+            " (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--status",
+            action="append",
+            dest="statuses",
+            help="only archive assessments with this status (can be repeated)",
+        )
+        parser.add_argument(
+            "--limit", type=int, help="archive at most this many assessments"
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="report what would be archived without archiving anything",
+        )
+
+    def handle(self, *args, months, statuses, limit, dry_run, **options):
+        updated_before = timezone.now() - relativedelta(months=months)
+
+        assessments = archivable(updated_before)
+        if statuses:
+            assessments = assessments.filter(status__in=statuses)
+        ids = list(
+            assessments.order_by("updated_at").values_list("id", flat=True)[:limit]
+        )
+
+        if dry_run:
+            self.stdout.write(f"{len(ids)} assessments would be archived")
+            return
+
+        before = hot_table_size()
+
+        archived = archived_bytes = 0
+        for pk in ids:
+            size = archive_assessment(pk, updated_before)
+            if size is not None:
+                archived += 1
+                archived_bytes += size
+
+        after = hot_table_size()
+
+        self.stdout.write(
+            f"assessment data in table: {_size(before['data_bytes'])}"
+            f" -> {_size(after['data_bytes'])}"
+        )
+        self.stdout.write(
+            f"assessment table on disk: {_size(before['total_bytes'])}"
+            f" -> {_size(after['total_bytes'])}"
+            " (space is reused after the table is vacuumed)"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{archived} assessments archived ({_size(archived_bytes)} written)"
+            )
+        )
@@ -0,0 +1,23 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...views.helpers import build_static_dictionary
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the URLs of the app's static files to STATIC_URLS_MANIFEST, so that"
+        " workers don't have to walk the static directory.  Run this after"
+        " collectstatic."
+    )
+
+    def handle(self, *args, **options):
+        urls = build_static_dictionary()
+        with open(settings.STATIC_URLS_MANIFEST, "w") as f:
+            json.dump(urls, f)
+
+        self.stdout.write(
+            f"Wrote {len(urls)} static file URLs to {settings.STATIC_URLS_MANIFEST}"
+        )
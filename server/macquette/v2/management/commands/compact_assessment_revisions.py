@@ -0,0 +1,103 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...models import AssessmentRevision
+from ...revisions import prune_revisions
+
+
+class Command(BaseCommand):
+    help = (
+        "Thin out old assessment revisions, keeping the last revision of each day,"
+        " and optionally delete very old revisions.  The latest revision of each"
+        " assessment is always kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--thin-after",
+            type=int,
+            default=30,
+            metavar="DAYS",
+            help="keep only the last revision of each day for revisions older than"
+            " this (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--delete-after",
+            type=int,
+            metavar="DAYS",
+            help="delete revisions older than this",
+        )
+        parser.add_argument(
+            "--assessment",
+            type=int,
+            action="append",
+            dest="assessments",
+            metavar="ID",
+            help="only compact this assessment's revisions (can be repeated)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="report what would be deleted without deleting anything",
+        )
+
+    def handle(self, *args, thin_after, delete_after, assessments, dry_run, **options):
+        if delete_after is not None and delete_after < thin_after:
+            raise CommandError("--delete-after must not be less than --thin-after")
+
+        now = timezone.now()
+        thin_before = now - datetime.timedelta(days=thin_after)
+        delete_before = (
+            now - datetime.timedelta(days=delete_after)
+            if delete_after is not None
+            else None
+        )
+
+        revisions = AssessmentRevision.objects.filter(created_at__lt=thin_before)
+        if assessments:
+            revisions = revisions.filter(assessment_id__in=assessments)
+        assessment_ids = revisions.values_list("assessment_id", flat=True).distinct()
+
+        total = 0
+        for assessment_id in assessment_ids.order_by("assessment_id"):
+            keep = self._revisions_to_keep(assessment_id, thin_before, delete_before)
+            if dry_run:
+                deleted = (
+                    AssessmentRevision.objects.filter(assessment_id=assessment_id)
+                    .exclude(number__in=keep)
+                    .count()
+                )
+            else:
+                deleted = prune_revisions(assessment_id, keep)
+
+            if deleted:
+                self.stdout.write(
+                    f"assessment {assessment_id}: {deleted} revisions deleted"
+                )
+            total += deleted
+
+        verb = "would be" if dry_run else "were"
+        self.stdout.write(self.style.SUCCESS(f"{total} revisions {verb} deleted"))
+
+    @staticmethod
+    def _revisions_to_keep(assessment_id, thin_before, delete_before) -> set[int]:
+        revisions = (
+            AssessmentRevision.objects.filter(assessment_id=assessment_id)
+            .order_by("number")
+            .values_list("number", "created_at")
+        )
+
+        keep = set()
+        last_of_day: dict[datetime.date, int] = {}
+        for number, created_at in revisions:
+            if created_at >= thin_before:
+                keep.add(number)
+            elif delete_before is None or created_at >= delete_before:
+                last_of_day[timezone.localdate(created_at)] = number
+            latest = number
+
+        keep.update(last_of_day.values())
+        keep.add(latest)
+        return keep
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from ... import dashboard_statistics
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the staff dashboard's statistics: compact the changes recorded"
+        " since the last refresh and recount users by last login."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="recount everything from scratch, including changes made outside"
+            " the API",
+        )
+
+    def handle(self, *args, rebuild, **options):
+        if rebuild:
+            dashboard_statistics.rebuild()
+        else:
+            dashboard_statistics.compact()
+            dashboard_statistics.rebuild_logins()
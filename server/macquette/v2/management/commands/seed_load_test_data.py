@@ -0,0 +1,140 @@
+import json
+import pathlib
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from macquette.users.models import User
+
+from ... import dashboard_statistics
+from ...models import Assessment, Organisation, ReportTemplate
+
+USERNAME_PREFIX = "loadtest-"
+ORGANISATION_NAME = "Load test organisation"
+
+# A real assessment from the client's tests, so that autosaves are the right size.
+FIXTURE = (
+    pathlib.Path(__file__).resolve().parents[5]
+    / "client"
+    / "test"
+    / "fixtures"
+    / "floating-deductible.json"
+)
+
+REPORT_TEMPLATE = "<h1>{{ org.name }}</h1><p>Edit {{ edit }}</p>"
+
+
+class Command(BaseCommand):
+    help = (
+        "Create assessors, an organisation and assessments for benchmarks.load_test,"
+        " and write a logged-in session for each assessor to a file.  Data from a"
+        " previous run is replaced.  Only for local servers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--assessors",
+            type=int,
+            default=20,
+            help="number of assessors to create (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--assessments",
+            type=int,
+            default=5,
+            help="number of full assessments per assessor (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--background",
+            type=int,
+            default=2000,
+            help="number of extra small assessments spread between the assessors,"
+            " so that lists are a realistic length (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--output",
+            default="load-test-sessions.json",
+            help="file to write the sessions to (default: %(default)s)",
+        )
+
+    def handle(self, *args, assessors, assessments, background, output, **options):
+        if not settings.DEBUG:
+            raise CommandError("This creates users with live sessions; DEBUG is off")
+
+        # factory_boy is only installed for development.
+        from ...tests.factories import AssessmentFactory, OrganisationFactory
+        from ...tests.seed import seed_assessments
+
+        with FIXTURE.open() as f:
+            data = json.load(f)["data"]
+
+        with transaction.atomic():
+            self.clear()
+
+            organisation = OrganisationFactory.create(
+                name=ORGANISATION_NAME,
+                report=ReportTemplate.objects.create(
+                    name=ORGANISATION_NAME, template=REPORT_TEMPLATE
+                ),
+            )
+            users = [
+                User.objects.create_user(username=f"{USERNAME_PREFIX}{n}")
+                for n in range(assessors)
+            ]
+            organisation.members.add(*users)
+
+            sessions = [
+                {
+                    "session": self.log_in(user),
+                    "assessments": [
+                        assessment.pk
+                        for assessment in AssessmentFactory.create_batch(
+                            assessments,
+                            owner=user,
+                            organisation=organisation,
+                            data=data,
+                        )
+                    ],
+                }
+                for user in users
+            ]
+
+            if background:
+                seed_assessments(
+                    background,
+                    owner_ids=[user.pk for user in users],
+                    organisation_ids=[organisation.pk],
+                )
+
+            # Neither of the above goes through the views that keep these up to date.
+            dashboard_statistics.rebuild()
+
+        with open(output, "w") as f:
+            json.dump(sessions, f, indent=2)
+
+        self.stdout.write(
+            f"Created {assessors} assessors with {assessors * assessments} assessments"
+            f" and {background} more; sessions written to {output}"
+        )
+
+    @staticmethod
+    def clear():
+        users = User.objects.filter(username__startswith=USERNAME_PREFIX)
+        Assessment.objects.filter(owner__in=users).delete()
+        Organisation.objects.filter(name=ORGANISATION_NAME).delete()
+        ReportTemplate.objects.filter(name=ORGANISATION_NAME).delete()
+        users.delete()
+
+    @staticmethod
+    def log_in(user: User) -> str:
+        """Return the key of a new session logged in as the user."""
+        session = SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        assert session.session_key is not None
+        return session.session_key
@@ -0,0 +1,56 @@
+import orjson
+import zstandard
+from django.core.management.base import BaseCommand, CommandError
+
+from ...fields import clear_caches
+from ...models import Assessment, CompressionDictionary
+
+
+class Command(BaseCommand):
+    help = (
+        "Train a zstd dictionary on a sample of assessment data and save it, so"
+        " that compressed JSON fields use it for new values.  Running processes"
+        " pick it up when they're restarted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=1000,
+            help="number of assessments to sample (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=112,
+            metavar="KIB",
+            help="dictionary size in KiB (default: %(default)s)",
+        )
+
+    def handle(self, *args, samples, size, **options):
+        data = (
+            Assessment.objects.filter(archived_at__isnull=True)
+            .order_by("?")
+            .values_list("data", flat=True)[:samples]
+        )
+        documents = [orjson.dumps(value) for value in data]
+
+        try:
+            dictionary = zstandard.train_dictionary(size * 1024, documents)
+        except zstandard.ZstdError as e:
+            raise CommandError(
+                f"couldn't train a dictionary on {len(documents)} samples: {e}"
+            ) from e
+
+        record = CompressionDictionary.objects.create(
+            dict_id=dictionary.dict_id(), data=dictionary.as_bytes()
+        )
+        clear_caches()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"saved dictionary {record.dict_id} ({len(record.data)} bytes),"
+                f" trained on {len(documents)} assessments"
+            )
+        )
@@ -0,0 +1,41 @@
+# Generated by Django 4.1.12 on 2026-10-19 12:28
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without taking a write lock on the tables
+    atomic = False
+
+    dependencies = [
+        ("v2", "0013_report"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="assessment",
+            index=models.Index(
+                fields=["organisation", "owner", "updated_at"],
+                name="v2_assessment_org_owner",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assessment",
+            index=models.Index(
+                condition=models.Q(("status", "Complete")),
+                fields=["updated_at"],
+                name="v2_assessment_complete",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="library",
+            index=models.Index(
+                condition=models.Q(
+                    ("owner_organisation__isnull", True), ("owner_user__isnull", True)
+                ),
+                fields=["id"],
+                name="v2_library_global",
+            ),
+        ),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 4.1.12 on 2026-10-19 12:33
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+# The address is taken from the household section of the master scenario, which
+# is where the client keeps it.  The function is plpgsql rather than sql so that
+# its plan is cached for the session; an inlined sql function is replanned on
+# every call from the trigger, which made bulk inserts several times slower.
+SEARCH_VECTOR_FUNCTION = """
+CREATE FUNCTION v2_assessment_search_vector(
+    name text, description text, household jsonb, owner_id integer
+) RETURNS tsvector AS $$
+BEGIN
+    RETURN
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', concat_ws(
+            ' ',
+            household ->> 'address_1',
+            household ->> 'address_2',
+            household ->> 'address_3',
+            household ->> 'address_town',
+            household ->> 'address_postcode'
+        )), 'A')
+        || setweight(to_tsvector('simple', coalesce(
+            (SELECT u.name FROM users_user u WHERE u.id = owner_id), ''
+        )), 'B')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'C');
+END
+$$ LANGUAGE plpgsql STABLE;
+
+CREATE FUNCTION v2_assessment_search_document_update() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO v2_assessmentsearchdocument (assessment_id, vector)
+    VALUES (
+        NEW.id,
+        v2_assessment_search_vector(
+            NEW.name,
+            NEW.description,
+            NEW.data #> '{master,household}',
+            NEW.owner_id
+        )
+    )
+    ON CONFLICT (assessment_id) DO UPDATE SET vector = EXCLUDED.vector;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER v2_assessment_search_document_insert
+    AFTER INSERT ON v2_assessment
+    FOR EACH ROW EXECUTE PROCEDURE v2_assessment_search_document_update();
+
+-- Most updates are autosaves of `data` that don't touch the address, so only
+-- recompute the vector when one of its inputs has actually changed.
+CREATE TRIGGER v2_assessment_search_document_update
+    AFTER UPDATE ON v2_assessment
+    FOR EACH ROW
+    WHEN (
+        OLD.name IS DISTINCT FROM NEW.name
+        OR OLD.description IS DISTINCT FROM NEW.description
+        OR OLD.owner_id IS DISTINCT FROM NEW.owner_id
+        OR OLD.data #> '{master,household}' IS DISTINCT FROM NEW.data #> '{master,household}'
+    )
+    EXECUTE PROCEDURE v2_assessment_search_document_update();
+
+INSERT INTO v2_assessmentsearchdocument (assessment_id, vector)
+SELECT id, v2_assessment_search_vector(
+    name, description, data #> '{master,household}', owner_id
+)
+FROM v2_assessment;
+"""
+
+DROP_SEARCH_VECTOR_FUNCTION = """
+DROP TRIGGER v2_assessment_search_document_update ON v2_assessment;
+DROP TRIGGER v2_assessment_search_document_insert ON v2_assessment;
+DROP FUNCTION v2_assessment_search_document_update();
+DROP FUNCTION v2_assessment_search_vector(text, text, jsonb, integer);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("v2", "0014_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssessmentSearchDocument",
+            fields=[
+                (
+                    "assessment",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="v2.assessment",
+                    ),
+                ),
+                ("vector", django.contrib.postgres.search.SearchVectorField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="assessmentsearchdocument",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["vector"], name="v2_search_vector_gin"
+            ),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_FUNCTION, DROP_SEARCH_VECTOR_FUNCTION),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.1.12 on 2026-10-19 12:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Some old libraries have their data stored as a JSON-encoded string rather than
+# an object, so unwrap those before splitting them into items.
+COPY_ITEMS = """
+INSERT INTO v2_libraryitem (library_id, tag, data)
+SELECT library.id, item.key, item.value
+FROM v2_library library
+CROSS JOIN LATERAL jsonb_each(
+    CASE jsonb_typeof(library.data)
+        WHEN 'string' THEN (library.data #>> '{}')::jsonb
+        ELSE library.data
+    END
+) AS item;
+"""
+
+COPY_ITEMS_BACK = """
+UPDATE v2_library library
+SET data = coalesce(
+    (
+        SELECT jsonb_object_agg(item.tag, item.data)
+        FROM v2_libraryitem item
+        WHERE item.library_id = library.id
+    ),
+    '{}'::jsonb
+);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("v2", "0015_assessment_search_document"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LibraryItem",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("tag", models.TextField()),
+                ("data", models.JSONField()),
+                (
+                    "library",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="items",
+                        to="v2.library",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="libraryitem",
+            constraint=models.UniqueConstraint(
+                fields=("library", "tag"),
+                name="v2_libraryitem_unique_tag_per_library",
+            ),
+        ),
+        migrations.RunSQL(COPY_ITEMS, COPY_ITEMS_BACK),
+    ]
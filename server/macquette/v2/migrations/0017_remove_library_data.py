@@ -0,0 +1,16 @@
+# Generated by Django 4.1.12 on 2026-10-19 12:42
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("v2", "0016_library_items"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="library",
+            name="data",
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 4.1.12 on 2026-10-19 12:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("v2", "0017_remove_library_data"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssessmentRevision",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.PositiveIntegerField()),
+                ("depth", models.PositiveSmallIntegerField()),
+                ("data", models.JSONField()),
+                (
+                    "digest",
+                    models.CharField(
+                        help_text="Digest of the full document at this revision",
+                        max_length=32,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "assessment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="revisions",
+                        to="v2.assessment",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="assessmentrevision",
+            constraint=models.UniqueConstraint(
+                fields=("assessment", "number"),
+                name="v2_assessmentrevision_unique_number_per_assessment",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="assessmentrevision",
+            constraint=models.CheckConstraint(
+                check=models.Q(("number__gte", 1)),
+                name="v2_assessmentrevision_number_starts_at_one",
+            ),
+        ),
+    ]
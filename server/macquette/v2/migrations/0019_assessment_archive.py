@@ -0,0 +1,41 @@
+# Generated by Django 4.1.12 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("v2", "0018_assessment_revisions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assessment",
+            name="archive",
+            field=models.FileField(
+                blank=True,
+                editable=False,
+                max_length=200,
+                upload_to="archive/assessments/",
+            ),
+        ),
+        migrations.AddField(
+            model_name="assessment",
+            name="archived_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="assessment",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    models.Q(("archive", ""), ("archived_at__isnull", True)),
+                    models.Q(
+                        ("archived_at__isnull", False),
+                        models.Q(("archive", ""), _negated=True),
+                    ),
+                    _connector="OR",
+                ),
+                name="v2_assessment_archived_has_file",
+            ),
+        ),
+    ]
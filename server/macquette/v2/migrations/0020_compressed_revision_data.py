@@ -0,0 +1,96 @@
+from django.db import migrations, models
+
+import macquette.v2.fields
+
+BATCH_SIZE = 500
+
+
+def compress_data(apps, schema_editor):
+    AssessmentRevision = apps.get_model("v2", "AssessmentRevision")
+
+    batch = []
+    for revision in AssessmentRevision.objects.only("id", "data").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        revision.compressed_data = revision.data
+        batch.append(revision)
+        if len(batch) == BATCH_SIZE:
+            AssessmentRevision.objects.bulk_update(batch, ["compressed_data"])
+            batch = []
+    AssessmentRevision.objects.bulk_update(batch, ["compressed_data"])
+
+
+def decompress_data(apps, schema_editor):
+    AssessmentRevision = apps.get_model("v2", "AssessmentRevision")
+
+    batch = []
+    for revision in AssessmentRevision.objects.only("id", "compressed_data").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        revision.data = revision.compressed_data
+        batch.append(revision)
+        if len(batch) == BATCH_SIZE:
+            AssessmentRevision.objects.bulk_update(batch, ["data"])
+            batch = []
+    AssessmentRevision.objects.bulk_update(batch, ["data"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("v2", "0019_assessment_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompressionDictionary",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("dict_id", models.BigIntegerField(editable=False, unique=True)),
+                ("data", models.BinaryField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name_plural": "compression dictionaries",
+            },
+        ),
+        # Copy `data` into a new compressed column, then swap it in.  The old
+        # column is made nullable first so that this can be reversed.
+        migrations.AddField(
+            model_name="assessmentrevision",
+            name="compressed_data",
+            field=macquette.v2.fields.CompressedJSONField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="assessmentrevision",
+            name="data",
+            field=models.JSONField(null=True),
+        ),
+        migrations.RunPython(compress_data, decompress_data, elidable=True),
+        migrations.RemoveField(
+            model_name="assessmentrevision",
+            name="data",
+        ),
+        migrations.RenameField(
+            model_name="assessmentrevision",
+            old_name="compressed_data",
+            new_name="data",
+        ),
+        migrations.AlterField(
+            model_name="assessmentrevision",
+            name="data",
+            field=macquette.v2.fields.CompressedJSONField(),
+        ),
+        # The data is already compressed, so don't let Postgres try again.
+        migrations.RunSQL(
+            "ALTER TABLE v2_assessmentrevision ALTER COLUMN data SET STORAGE EXTERNAL",
+            "ALTER TABLE v2_assessmentrevision ALTER COLUMN data SET STORAGE EXTENDED",
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.1.12 on 2026-10-19 13:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("v2", "0020_compressed_revision_data"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DashboardStatistic",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("created", "Assessments by month created and status"),
+                            (
+                                "completed",
+                                "Completed assessments by day, organisation and duration",
+                            ),
+                            ("last_login", "Users by day last logged in"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("date", models.DateField(null=True)),
+                ("status", models.CharField(blank=True, max_length=20)),
+                ("duration", models.IntegerField(null=True)),
+                ("count", models.IntegerField()),
+                (
+                    "organisation",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="v2.organisation",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="dashboardstatistic",
+            index=models.Index(
+                fields=["metric", "date"], name="v2_dashboardstatistic_metric"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.1.12 on 2026-10-19 14:03
+
+from django.db import migrations, models
+
+import macquette.v2.validators
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("v2", "0021_dashboard_statistic"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="assessment",
+            name="data",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                validators=[macquette.v2.validators.validate_assessment_data],
+            ),
+        ),
+    ]
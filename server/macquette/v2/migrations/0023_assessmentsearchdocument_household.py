@@ -0,0 +1,102 @@
+from django.db import migrations, models
+
+# The update trigger used to compare OLD.data #> '{master,household}' with
+# NEW.data's, which meant detoasting and decompressing the whole of the old
+# document on every autosave.  The search document now keeps the household it
+# was made from, so the trigger compares NEW.data's with that small row instead,
+# and only recomputes the vector when one of its inputs has changed.  The
+# trigger can't check that in its WHEN clause, which can't read other tables, so
+# the function does.
+#
+# The update trigger runs before the row is written, while NEW.data is still
+# the value an autosave has just sent; after, it has been moved out to TOAST
+# and reading it costs as much as reading OLD.data did.  The function returns
+# NEW so that the update goes ahead (an AFTER trigger's return value is
+# ignored).
+SEARCH_DOCUMENT_HOUSEHOLD = """
+CREATE OR REPLACE FUNCTION v2_assessment_search_document_update() RETURNS trigger AS $$
+DECLARE
+    new_household jsonb := NEW.data #> '{master,household}';
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND OLD.name IS NOT DISTINCT FROM NEW.name
+        AND OLD.description IS NOT DISTINCT FROM NEW.description
+        AND OLD.owner_id IS NOT DISTINCT FROM NEW.owner_id
+        AND EXISTS (
+            SELECT FROM v2_assessmentsearchdocument
+            WHERE assessment_id = NEW.id AND household IS NOT DISTINCT FROM new_household
+        )
+    THEN
+        RETURN NEW;
+    END IF;
+
+    INSERT INTO v2_assessmentsearchdocument (assessment_id, household, vector)
+    VALUES (
+        NEW.id,
+        new_household,
+        v2_assessment_search_vector(
+            NEW.name, NEW.description, new_household, NEW.owner_id
+        )
+    )
+    ON CONFLICT (assessment_id) DO UPDATE
+        SET household = EXCLUDED.household, vector = EXCLUDED.vector;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER v2_assessment_search_document_update ON v2_assessment;
+CREATE TRIGGER v2_assessment_search_document_update
+    BEFORE UPDATE ON v2_assessment
+    FOR EACH ROW EXECUTE PROCEDURE v2_assessment_search_document_update();
+
+UPDATE v2_assessmentsearchdocument d
+SET household = a.data #> '{master,household}'
+FROM v2_assessment a
+WHERE a.id = d.assessment_id;
+"""
+
+DROP_SEARCH_DOCUMENT_HOUSEHOLD = """
+CREATE OR REPLACE FUNCTION v2_assessment_search_document_update() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO v2_assessmentsearchdocument (assessment_id, vector)
+    VALUES (
+        NEW.id,
+        v2_assessment_search_vector(
+            NEW.name,
+            NEW.description,
+            NEW.data #> '{master,household}',
+            NEW.owner_id
+        )
+    )
+    ON CONFLICT (assessment_id) DO UPDATE SET vector = EXCLUDED.vector;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER v2_assessment_search_document_update ON v2_assessment;
+CREATE TRIGGER v2_assessment_search_document_update
+    AFTER UPDATE ON v2_assessment
+    FOR EACH ROW
+    WHEN (
+        OLD.name IS DISTINCT FROM NEW.name
+        OR OLD.description IS DISTINCT FROM NEW.description
+        OR OLD.owner_id IS DISTINCT FROM NEW.owner_id
+        OR OLD.data #> '{master,household}' IS DISTINCT FROM NEW.data #> '{master,household}'
+    )
+    EXECUTE PROCEDURE v2_assessment_search_document_update();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("v2", "0022_assessment_data_schema"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assessmentsearchdocument",
+            name="household",
+            field=models.JSONField(null=True),
+        ),
+        migrations.RunSQL(SEARCH_DOCUMENT_HOUSEHOLD, DROP_SEARCH_DOCUMENT_HOUSEHOLD),
+    ]
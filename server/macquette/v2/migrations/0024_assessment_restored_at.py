@@ -0,0 +1,17 @@
+# Generated by Django 4.1.12 on 2026-10-19 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("v2", "0023_assessmentsearchdocument_household"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assessment",
+            name="restored_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.1.12 on 2026-10-19 15:16
+
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Drop the index without taking a write lock on the table
+    atomic = False
+
+    dependencies = [
+        ("v2", "0024_assessment_restored_at"),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name="assessment",
+            name="v2_assessment_complete",
+        ),
+    ]
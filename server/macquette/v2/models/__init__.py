@@ -1,6 +1,11 @@
 from .assessment import Assessment  # noqa
+from .assessment_revision import AssessmentRevision  # noqa
+from .assessment_search_document import AssessmentSearchDocument  # noqa
+from .compression_dictionary import CompressionDictionary  # noqa
+from .dashboard_statistic import DashboardStatistic  # noqa
 from .image import Image  # noqa
 from .library import Library  # noqa
+from .library_item import LibraryItem  # noqa
 from .organisation import Organisation  # noqa
 from .report_template import ReportTemplate  # noqa
 from .report import Report  # noqa
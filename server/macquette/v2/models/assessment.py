@@ -1,8 +1,9 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Q
 
-from ..validators import validate_dict
+from ..validators import validate_assessment_data
 
 User = get_user_model()
 
@@ -49,10 +50,41 @@ class Assessment(models.Model):
         related_name="featured_on",
     )
 
-    data = models.JSONField(default=dict, validators=[validate_dict], blank=True)
+    data = models.JSONField(
+        default=dict, validators=[validate_assessment_data], blank=True
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now_add=True)
 
+    # When an assessment is archived (see `macquette.v2.archive`), `data` is moved
+    # to a compressed file in storage and only a stub is left in the table.
+    archived_at = models.DateTimeField(null=True, blank=True, editable=False)
+    archive = models.FileField(
+        upload_to="archive/assessments/", max_length=200, blank=True, editable=False
+    )
+    # Set when an archived assessment is restored, so that one that is only read
+    # isn't archived again by the next run.
+    restored_at = models.DateTimeField(null=True, blank=True, editable=False)
+
     def __str__(self):
         return f"#{self.id}: {self.name}"
+
+    class Meta:
+        indexes = [
+            # Organisation assessment lists filter on organisation, and for
+            # non-admins also on owner.
+            models.Index(
+                fields=["organisation", "owner", "updated_at"],
+                name="%(app_label)s_%(class)s_org_owner",
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=(
+                    Q(archived_at__isnull=True, archive="")
+                    | (Q(archived_at__isnull=False) & ~Q(archive=""))
+                ),
+                name="%(app_label)s_%(class)s_archived_has_file",
+            ),
+        ]
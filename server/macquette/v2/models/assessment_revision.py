@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+
+from ..fields import CompressedJSONField
+from .assessment import Assessment
+
+
+class AssessmentRevision(models.Model):
+    """
+    A saved version of an assessment's data.
+
+    Revisions are numbered from 1 within each assessment.  Most revisions store
+    only a patch (see `jsondiff`) against the revision before them; every so
+    often a keyframe stores the whole document instead.  `depth` is the number
+    of patches since the last keyframe, so a keyframe has a depth of 0.
+
+    See `macquette.v2.revisions` for recording and reading revisions.
+    """
+
+    assessment = models.ForeignKey(
+        Assessment,
+        on_delete=models.CASCADE,
+        related_name="revisions",
+    )
+    number = models.PositiveIntegerField()
+    depth = models.PositiveSmallIntegerField()
+    data = CompressedJSONField()
+    digest = models.CharField(
+        max_length=32, help_text="Digest of the full document at this revision"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+
+    def __str__(self):
+        return f"#{self.number} of assessment {self.assessment_id}"
+
+    @property
+    def is_keyframe(self) -> bool:
+        return self.depth == 0
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["assessment", "number"],
+                name="%(app_label)s_%(class)s_unique_number_per_assessment",
+            ),
+            models.CheckConstraint(
+                check=Q(number__gte=1),
+                name="%(app_label)s_%(class)s_number_starts_at_one",
+            ),
+        ]
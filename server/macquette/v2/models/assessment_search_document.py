@@ -0,0 +1,39 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+from .assessment import Assessment
+
+
+class AssessmentSearchDocument(models.Model):
+    """
+    The full-text search vector for an assessment.
+
+    This is kept in its own table so that the hot assessment table stays narrow.
+    It is maintained entirely by database triggers on the assessment table (see
+    the migration that creates this model), which weight the name and address most
+    highly, then the owner's name, then the description.  Because it is maintained
+    by triggers it stays up to date with bulk updates and raw SQL too.
+
+    The owner's name is captured when the assessment is written, so renaming a user
+    is only reflected the next time each of their assessments is saved.
+
+    `household` is the part of the assessment's data the address is taken from,
+    kept so that the update trigger can tell whether it has changed without
+    reading the old data.
+    """
+
+    assessment = models.OneToOneField(
+        Assessment,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="search_document",
+    )
+    vector = SearchVectorField()
+    household = models.JSONField(null=True)
+
+    class Meta:
+        indexes = [GinIndex(fields=["vector"], name="%(app_label)s_search_vector_gin")]
+
+    def __str__(self):
+        return f"Search document for assessment #{self.assessment_id}"
@@ -0,0 +1,24 @@
+from django.db import models
+
+
+class CompressionDictionary(models.Model):
+    """
+    A zstd dictionary, trained on samples of assessment data, that
+    `CompressedJSONField` uses to compress small values much better than zstd
+    can on its own.
+
+    Compressed values record the `dict_id` of the dictionary they were
+    compressed with, so dictionaries must never be deleted while values
+    compressed with them remain.  New values are compressed with the most
+    recently created dictionary.
+    """
+
+    dict_id = models.BigIntegerField(unique=True, editable=False)
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"zstd dictionary {self.dict_id} ({len(self.data)} bytes)"
+
+    class Meta:
+        verbose_name_plural = "compression dictionaries"
@@ -0,0 +1,48 @@
+from django.db import models
+
+CREATED = "created"
+COMPLETED = "completed"
+LAST_LOGIN = "last_login"
+
+METRIC_CHOICES = [
+    (CREATED, "Assessments by month created and status"),
+    (COMPLETED, "Completed assessments by day, organisation and duration"),
+    (LAST_LOGIN, "Users by day last logged in"),
+]
+
+
+class DashboardStatistic(models.Model):
+    """
+    A count of assessments or users in one bucket, which the staff dashboard
+    sums rather than aggregating over whole tables.
+
+    Counts are kept up to date by adding rows of +1 or -1 as assessments change,
+    so there may be several rows for the same bucket until they are compacted.
+    See `macquette.v2.dashboard_statistics`.
+    """
+
+    metric = models.CharField(max_length=20, choices=METRIC_CHOICES)
+    # The first of the month for CREATED; null for users who have never logged in.
+    date = models.DateField(null=True)
+    status = models.CharField(max_length=20, blank=True)
+    organisation = models.ForeignKey(
+        "Organisation",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    # Whole days from creation to last update, for COMPLETED.
+    duration = models.IntegerField(null=True)
+    count = models.IntegerField()
+
+    def __str__(self):
+        return f"{self.metric} {self.date}: {self.count}"
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["metric", "date"],
+                name="%(app_label)s_%(class)s_metric",
+            ),
+        ]
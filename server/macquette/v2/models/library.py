@@ -1,11 +1,35 @@
 from django.conf import settings
 from django.db import models
-from django.db.models import Q
+from django.db.models import Aggregate, JSONField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
-from ..validators import validate_dict
+from .library_item import LibraryItem
 from .organisation import Organisation
 
 
+class JSONBObjectAgg(Aggregate):
+    function = "JSONB_OBJECT_AGG"
+    output_field = JSONField()
+
+
+class LibraryQuerySet(models.QuerySet):
+    def with_data(self):
+        """
+        Annotate each library with its items as a `{tag: item}` dict, built by
+        the database in the same query.
+        """
+        items = (
+            LibraryItem.objects.filter(library=OuterRef("pk"))
+            .values("library")
+            .annotate(data=JSONBObjectAgg("tag", "data"))
+            .values("data")
+        )
+        return self.annotate(
+            items_data=Coalesce(Subquery(items), Value({}, output_field=JSONField()))
+        )
+
+
 class Library(models.Model):
     owner_user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -35,17 +59,51 @@ class Library(models.Model):
 
     name = models.TextField()
     type = models.TextField()
-    data = models.JSONField(default=dict, validators=[validate_dict])
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = LibraryQuerySet.as_manager()
+
     def __str__(self):
         return f"#{self.name} - {self.type}"
 
+    @property
+    def data(self) -> dict:
+        """
+        The library's items as a `{tag: item}` dict.
+
+        Libraries fetched with `Library.objects.with_data()` already have this;
+        otherwise the items are loaded when it is accessed.
+        """
+        if hasattr(self, "items_data"):
+            return self.items_data
+        return dict(self.items.values_list("tag", "data"))
+
+    def replace_items(self, data: dict):
+        """Replace all of the library's items with those in `data`."""
+        self.items.all().delete()
+        LibraryItem.objects.bulk_create(
+            LibraryItem(library=self, tag=tag, data=item) for tag, item in data.items()
+        )
+
+    def touch(self):
+        """Bump `updated_at` without rewriting the rest of the row."""
+        self.updated_at = timezone.now()
+        Library.objects.filter(pk=self.pk).update(updated_at=self.updated_at)
+
     class Meta:
         verbose_name_plural = "libraries"
 
+        indexes = [
+            # Global libraries are included in every user's library list.
+            models.Index(
+                fields=["id"],
+                condition=Q(owner_user__isnull=True, owner_organisation__isnull=True),
+                name="%(app_label)s_%(class)s_global",
+            ),
+        ]
+
         constraints = [
             models.CheckConstraint(
                 check=(Q(owner_user__isnull=False) & Q(owner_organisation__isnull=True))
@@ -0,0 +1,31 @@
+from django.db import models
+
+
+class LibraryItem(models.Model):
+    """
+    One item in a library, identified within it by its tag.
+
+    Items are stored as rows rather than as one JSON blob on the library so that
+    adding, changing or removing an item only writes that item.  `data` stays
+    `jsonb`, rather than a `CompressedJSONField`, because
+    `Library.objects.with_data()` has the database aggregate it.
+    """
+
+    library = models.ForeignKey(
+        "Library",
+        on_delete=models.CASCADE,
+        related_name="items",
+    )
+    tag = models.TextField()
+    data = models.JSONField()
+
+    def __str__(self):
+        return f"{self.tag} (library #{self.library_id})"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["library", "tag"],
+                name="%(app_label)s_%(class)s_unique_tag_per_library",
+            )
+        ]
@@ -0,0 +1,110 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework import exceptions
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class AssessmentKeysetPagination(BasePagination):
+    """
+    Keyset pagination over assessments, most recently updated first.
+
+    Pages are ordered by `(updated_at, id)` descending and the cursor encodes the
+    last row seen, so fetching page N costs the same as fetching page 1.
+
+    Pagination only happens when the client asks for it by sending `cursor` or
+    `page_size`.  Without either, the view returns a plain list of every result as
+    it always has.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    default_page_size = 50
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if (
+            self.cursor_query_param not in params
+            and self.page_size_query_param not in params
+        ):
+            return None
+
+        self.request = request
+        self.page_size = self._get_page_size(params)
+        self.count = queryset.count()
+
+        queryset = queryset.order_by("-updated_at", "-id")
+
+        cursor = params.get(self.cursor_query_param)
+        if cursor:
+            updated_at, id = self._decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(updated_at__lt=updated_at) | Q(updated_at=updated_at, id__lt=id)
+            )
+
+        page = list(queryset[: self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        page = page[: self.page_size]
+        self.last = page[-1] if page else None
+
+        return page
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.count,
+                "next": self.get_next_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self):
+        if not self.has_next or self.last is None:
+            return None
+
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self._encode_cursor(self.last)
+        )
+
+    def _get_page_size(self, params) -> int:
+        raw = params.get(self.page_size_query_param)
+        if raw is None:
+            return self.default_page_size
+
+        try:
+            page_size = int(raw)
+        except ValueError:
+            raise exceptions.ValidationError({"page_size": "Must be an integer."})
+
+        if page_size < 1:
+            raise exceptions.ValidationError({"page_size": "Must be at least 1."})
+
+        return min(page_size, self.max_page_size)
+
+    @staticmethod
+    def _encode_cursor(assessment) -> str:
+        position = f"{assessment.updated_at.isoformat()}|{assessment.id}"
+        return base64.urlsafe_b64encode(position.encode("ascii")).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+        try:
+            position = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii")
+            updated_at, id = position.split("|")
+            return datetime.fromisoformat(updated_at), int(id)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise exceptions.NotFound("Invalid cursor")
+
+
+class AssessmentSearchPagination(PageNumberPagination):
+    """Page-numbered pagination for ranked search results."""
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
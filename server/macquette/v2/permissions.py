@@ -67,9 +67,12 @@ class IsMemberOfAssessmentOrganisation(permissions.BasePermission):
 
     def has_permission(self, request, view):
         try:
-            organisation = Assessment.objects.get(
-                pk=view.kwargs["assessmentid"]
-            ).organisation
+            organisation = (
+                Assessment.objects.select_related("organisation")
+                .defer("data")
+                .get(pk=view.kwargs["assessmentid"])
+                .organisation
+            )
         except Assessment.DoesNotExist:
             raise exceptions.NotFound("Assessment not found")
         return organisation is not None and request.user in organisation.members.all()
@@ -4,9 +4,8 @@ import re
 from jinja2 import DictLoader, Environment, pass_eval_context, select_autoescape
 from markupsafe import Markup, escape
 from rest_framework.exceptions import APIException
-from weasyprint import HTML
 
-from macquette import graphs
+from macquette import metrics
 
 
 @pass_eval_context
@@ -54,6 +53,10 @@ def parse_template(template):
 
 
 def render_template(template, context, graph_data):
+    # matplotlib is slow to import and most workers never draw a graph, so only
+    # import it when we need it.
+    from macquette import graphs
+
     rendered_graphs = {}
     for name, data in graph_data.items():
         try:
@@ -61,19 +64,25 @@ def render_template(template, context, graph_data):
         except Exception as exc:
             raise APIException(detail=f"Error parsing graph {name}: {exc}")
 
-        try:
-            fig, key = graphs.render(parsed)
-        except Exception as exc:
-            raise APIException(detail=f"Error rendering graph {name}: {exc}")
+        with metrics.GRAPH_RENDER_DURATION.time():
+            try:
+                fig, key = graphs.render(parsed)
+            except Exception as exc:
+                raise APIException(detail=f"Error rendering graph {name}: {exc}")
 
-        rendered_graphs[name] = {
-            "url": graphs.to_url(fig),
-            "key": key,
-        }
+            rendered_graphs[name] = {
+                "url": graphs.to_url(fig),
+                "key": key,
+            }
 
-    template = parse_template(template)
-    return template.render({"graphs": rendered_graphs, **context})
+    with metrics.REPORT_RENDER_DURATION.labels("html").time():
+        template = parse_template(template)
+        return template.render({"graphs": rendered_graphs, **context})
 
 
 def render_to_pdf(html: str):
-    return HTML(string=html, encoding="utf-8").write_pdf()
+    # Likewise WeasyPrint.
+    from weasyprint import HTML
+
+    with metrics.REPORT_RENDER_DURATION.labels("pdf").time():
+        return HTML(string=html, encoding="utf-8").write_pdf()
@@ -0,0 +1,157 @@
+import copy
+import hashlib
+from collections.abc import Iterable
+from typing import Any
+
+import orjson
+from django.conf import settings
+from django.db import transaction
+
+from . import jsondiff
+from .models import Assessment, AssessmentRevision
+
+
+def data_digest(data: Any) -> str:
+    return hashlib.blake2b(
+        orjson.dumps(data, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+
+
+def record_revision(
+    assessment: Assessment, previous_data: Any = None, user=None
+) -> AssessmentRevision:
+    """
+    Record the assessment's current data as a new revision.
+
+    Pass the data as it was before the change as `previous_data` so that the
+    revision can be stored as a patch.  If it isn't given, or it doesn't match the
+    latest revision (e.g. because the data was changed outside the API), or a
+    keyframe is due, the whole document is stored instead.  If the assessment has
+    no revisions yet, e.g. because it was duplicated, `previous_data` is recorded
+    first so that the history starts from it.
+
+    If the data hasn't changed since the latest revision, no revision is recorded
+    and the latest one is returned.
+    """
+
+    latest = (
+        assessment.revisions.order_by("-number")
+        .only("number", "depth", "digest")
+        .first()
+    )
+    digest = data_digest(assessment.data)
+    if latest is not None and latest.digest == digest:
+        return latest
+
+    if latest is None and previous_data is not None:
+        previous_digest = data_digest(previous_data)
+        if previous_digest != digest:
+            latest = AssessmentRevision.objects.create(
+                assessment=assessment,
+                number=1,
+                depth=0,
+                data=previous_data,
+                digest=previous_digest,
+            )
+
+    revision = AssessmentRevision(
+        assessment=assessment,
+        number=latest.number + 1 if latest else 1,
+        digest=digest,
+        created_by=user,
+    )
+
+    if (
+        latest is not None
+        and previous_data is not None
+        and latest.depth + 1 < settings.ASSESSMENT_REVISION_KEYFRAME_INTERVAL
+        and data_digest(previous_data) == latest.digest
+    ):
+        revision.depth = latest.depth + 1
+        revision.data = jsondiff.diff(previous_data, assessment.data)
+    else:
+        revision.depth = 0
+        revision.data = assessment.data
+
+    revision.save()
+    return revision
+
+
+def materialise(revision: AssessmentRevision) -> Any:
+    """
+    Return the assessment's data as it was at `revision`.
+
+    This reads the revision's keyframe and applies the patches after it, which is
+    never more than ASSESSMENT_REVISION_KEYFRAME_INTERVAL - 1 of them.
+    """
+
+    chain = list(
+        AssessmentRevision.objects.filter(
+            assessment_id=revision.assessment_id, number__lte=revision.number
+        )
+        .order_by("-number")
+        .values_list("data", flat=True)[: revision.depth + 1]
+    )
+
+    data = chain.pop().load()
+    for patch in reversed(chain):
+        data = jsondiff.apply(data, patch.load())
+    return data
+
+
+def prune_revisions(assessment_id: int, keep: Iterable[int]) -> int:
+    """
+    Delete all of an assessment's revisions except those numbered in `keep`.
+
+    The revisions that are kept are re-encoded, so that each is a keyframe or a
+    patch against the kept revision before it, and their data is unchanged.
+    Returns the number of revisions deleted.
+    """
+
+    keep = set(keep)
+    interval = settings.ASSESSMENT_REVISION_KEYFRAME_INTERVAL
+
+    with transaction.atomic():
+        # Lock the assessment so that no revisions are recorded meanwhile.
+        Assessment.objects.select_for_update().filter(pk=assessment_id).exists()
+
+        revisions = list(
+            AssessmentRevision.objects.filter(assessment_id=assessment_id).order_by(
+                "number"
+            )
+        )
+
+        kept: list[AssessmentRevision] = []
+        data = previous_kept = None
+        for revision in revisions:
+            if revision.depth == 0:
+                data = revision.data
+            else:
+                data = jsondiff.apply(data, revision.data)
+
+            if revision.number not in keep:
+                continue
+
+            current = copy.deepcopy(data)
+            if kept and kept[-1].depth + 1 < interval:
+                revision.depth = kept[-1].depth + 1
+                # Two kept revisions can be identical if the ones between them
+                # undid each other, but a patch can't be empty.
+                revision.data = jsondiff.diff(previous_kept, current) or [
+                    jsondiff.REPLACE,
+                    current,
+                ]
+            else:
+                revision.depth = 0
+                revision.data = current
+            kept.append(revision)
+            previous_kept = current
+
+        deleted, _ = (
+            AssessmentRevision.objects.filter(assessment_id=assessment_id)
+            .exclude(number__in=keep)
+            .delete()
+        )
+        AssessmentRevision.objects.bulk_update(kept, ["depth", "data"], batch_size=100)
+
+    return deleted
@@ -0,0 +1,40 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def search_query(text: str) -> SearchQuery | None:
+    """
+    Build a prefix-matching full-text query from free text typed by a user.
+
+    Every word must match, and the last part of each word may be missing, so
+    "heath terr m1" finds "33 Heathcliffe Terrace, M1 6DD".  Returns None if the
+    text contains no searchable words.
+    """
+
+    words = _WORD.findall(text.lower())
+    if not words:
+        return None
+
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words),
+        config="simple",
+        search_type="raw",
+    )
+
+
+def search_assessments(queryset, text: str):
+    """Filter an assessment queryset by full-text search, best matches first."""
+
+    query = search_query(text)
+    if query is None:
+        return queryset.none()
+
+    return (
+        queryset.filter(search_document__vector=query)
+        .annotate(rank=SearchRank(F("search_document__vector"), query))
+        .order_by("-rank", "-updated_at", "-id")
+    )
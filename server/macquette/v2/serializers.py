@@ -3,10 +3,19 @@ from itertools import zip_longest
 from django.utils import timezone
 from rest_framework import serializers
 
+from macquette.renderers import RawJSON
 from macquette.users.models import User
 
-from .models import Assessment, Image, Library, Organisation, Report
+from .models import (
+    Assessment,
+    AssessmentRevision,
+    Image,
+    Library,
+    Organisation,
+    Report,
+)
 from .models.assessment import STATUS_CHOICES
+from .validators import validate_dict
 
 
 class UserSerializer(serializers.Serializer):
@@ -204,6 +213,31 @@ class AssessmentFullSerializer(ImagesMixin, serializers.ModelSerializer):
         ]
 
 
+class RawJSONField(serializers.Field):
+    """
+    A read-only field for JSON that is already serialised, such as a `jsonb`
+    column cast to text, which is copied into the response without decoding it.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return RawJSON(value)
+
+
+class AssessmentFullRawDataSerializer(AssessmentFullSerializer):
+    """
+    AssessmentFullSerializer for reads from a queryset annotated with `raw_data`,
+    the `data` column as text.  Read-only.
+    """
+
+    # SAFETY: this field shadows a property of the same name but with a
+    # different type. This is fine at runtime but not in typechecking (yet).
+    data = RawJSONField(source="raw_data")  # type: ignore[assignment]
+
+
 class AssessmentFullWithoutDataSerializer(AssessmentFullSerializer):
     class Meta:
         model = Assessment
@@ -222,8 +256,40 @@ class AssessmentFullWithoutDataSerializer(AssessmentFullSerializer):
         ]
 
 
+class AssessmentRevisionSerializer(serializers.ModelSerializer):
+    created_by = serializers.SerializerMethodField()
+
+    def get_created_by(self, revision):
+        if revision.created_by is None:
+            return None
+        return {"id": f"{revision.created_by.id}", "name": revision.created_by.name}
+
+    class Meta:
+        model = AssessmentRevision
+        fields = ["number", "created_at", "created_by", "is_keyframe"]
+
+
+class AssessmentRevisionDetailSerializer(AssessmentRevisionSerializer):
+    """
+    AssessmentRevisionSerializer plus the assessment's data at that revision,
+    which is read from `full_data` and should be set with `revisions.materialise`.
+    """
+
+    # SAFETY: this field shadows a property of the same name but with a
+    # different type. This is fine at runtime but not in typechecking (yet).
+    data = serializers.JSONField(source="full_data", read_only=True)  # type: ignore[assignment]
+
+    class Meta(AssessmentRevisionSerializer.Meta):
+        fields = [*AssessmentRevisionSerializer.Meta.fields, "data"]
+
+
 class LibrarySerializer(serializers.ModelSerializer):
     id = serializers.CharField(read_only=True)
+    # SAFETY: this field shadows a property of the same name but with a
+    # different type. This is fine at runtime but not in typechecking (yet).
+    data = serializers.JSONField(  # type: ignore[assignment]
+        required=False, validators=[validate_dict]
+    )
     permissions = serializers.SerializerMethodField()
     owner = serializers.SerializerMethodField()
 
@@ -279,7 +345,25 @@ class LibrarySerializer(serializers.ModelSerializer):
             validated_data["owner_organisation"] = organisation
         else:
             validated_data["owner_user"] = self.context["request"].user
-        return super().create(validated_data)
+
+        data = validated_data.pop("data", {})
+        library = super().create(validated_data)
+        library.replace_items(data)
+        return library
+
+    def update(self, library, validated_data):
+        data = validated_data.pop("data", None)
+        library = super().update(library, validated_data)
+        if data is not None:
+            library.replace_items(data)
+        return library
+
+
+class LibraryMetadataSerializer(LibrarySerializer):
+    data = None  # type: ignore[assignment]
+
+    class Meta(LibrarySerializer.Meta):
+        fields = [field for field in LibrarySerializer.Meta.fields if field != "data"]
 
 
 class LibraryItemSerializer(serializers.Serializer):
@@ -107,10 +107,17 @@ class ReportTemplateFactory(DjangoModelFactory):
 class LibraryFactory(DjangoModelFactory):
     name = "Standard Library - exampleuser"
     type = "generation_measures"
-    data: dict[str, dict] = {}
     owner_user = factory.SubFactory(UserFactory)
     owner_organisation = None
 
+    @factory.post_generation
+    def data(self, create, extracted, **kwargs):
+        if not create:
+            return
+
+        if extracted:
+            self.replace_items(extracted)
+
     class Meta:
         model = Library
 
@@ -0,0 +1,85 @@
+from django.db import connection
+
+from ..models import Assessment, Library
+
+
+def seed_assessments(count: int, owner_ids: list[int], organisation_ids: list[int]):
+    """
+    Bulk-insert `count` assessments directly in the database, then ANALYZE.
+
+    Factories are far too slow to create the volumes of data we need to get the
+    query planner to behave as it does in production, so this uses
+    `generate_series` instead.  Owners and organisations are assigned round-robin
+    from the given IDs, and every other assessment is left without an organisation.
+    Each assessment gets a few KB of `data` so that row width is realistic.
+    """
+
+    table = Assessment._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table}
+                (owner_id, organisation_id, name, description, status, data,
+                 archive, created_at, updated_at)
+            SELECT
+                (%(owners)s::int[])[1 + n %% cardinality(%(owners)s::int[])],
+                CASE WHEN n %% 2 = 0
+                    THEN (%(orgs)s::int[])[1 + n %% cardinality(%(orgs)s::int[])]
+                END,
+                'Seeded assessment ' || n,
+                '',
+                (ARRAY['Complete', 'In progress', 'For review', 'Test'])[1 + n %% 4],
+                jsonb_build_object('master', jsonb_build_object(
+                    'padding', repeat(md5(n::text), 100)
+                )),
+                '',
+                now() - make_interval(days => n %% 1500),
+                now() - make_interval(days => n %% 1000)
+            FROM generate_series(1, %(count)s) AS n
+            """,
+            {"owners": owner_ids, "orgs": organisation_ids, "count": count},
+        )
+        cursor.execute(f"ANALYZE {table}")
+        cursor.execute(f"ANALYZE {Assessment.shared_with.through._meta.db_table}")
+
+
+def seed_libraries(
+    count: int,
+    owner_ids: list[int],
+    organisation_ids: list[int],
+    global_count: int = 10,
+):
+    """
+    Bulk-insert `count` owned libraries plus `global_count` global ones, then
+    ANALYZE.  Owned libraries alternate between personal and organisation
+    libraries, assigned round-robin from the given IDs.
+    """
+
+    table = Library._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table}
+                (owner_user_id, owner_organisation_id, name, type, created_at,
+                 updated_at)
+            SELECT
+                CASE WHEN n > %(global_count)s AND n %% 2 = 0
+                    THEN (%(owners)s::int[])[1 + n %% cardinality(%(owners)s::int[])]
+                END,
+                CASE WHEN n > %(global_count)s AND n %% 2 = 1
+                    THEN (%(orgs)s::int[])[1 + n %% cardinality(%(orgs)s::int[])]
+                END,
+                'Seeded library ' || n,
+                'elements',
+                now(),
+                now()
+            FROM generate_series(1, %(count)s + %(global_count)s) AS n
+            """,
+            {
+                "owners": owner_ids,
+                "orgs": organisation_ids,
+                "count": count,
+                "global_count": global_count,
+            },
+        )
+        cursor.execute(f"ANALYZE {table}")
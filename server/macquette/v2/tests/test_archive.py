@@ -0,0 +1,137 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.db.utils import IntegrityError
+from django.utils import timezone
+from freezegun import freeze_time
+
+from ..archive import archive_assessment, hot_table_size, restore_assessment
+from ..models import Assessment
+from ..search import search_assessments
+from .factories import AssessmentFactory
+
+pytestmark = pytest.mark.django_db
+
+DATA = {
+    "master": {
+        "household": {"address_1": "33 Heathcliffe Terrace"},
+        "fabric": {"elements": [{"id": n, "uvalue": 0.3} for n in range(100)]},
+    }
+}
+
+
+@pytest.fixture(autouse=True)
+def _file_storage(settings):
+    settings.DEFAULT_FILE_STORAGE = "django.core.files.storage.FileSystemStorage"
+
+
+@pytest.fixture()
+def old_assessment():
+    with freeze_time("2020-01-01T12:00:00Z"):
+        return AssessmentFactory.create(data=DATA)
+
+
+def test_archive_and_restore(old_assessment):
+    size = archive_assessment(old_assessment.pk, timezone.now())
+
+    assessment = Assessment.objects.get(pk=old_assessment.pk)
+    assert size is not None
+    assert assessment.archived_at is not None
+    assert assessment.archive.size == size
+    assert assessment.data == {"master": {"household": DATA["master"]["household"]}}
+    # The address is still searchable
+    assert list(search_assessments(Assessment.objects.all(), "heathcliffe")) == [
+        assessment
+    ]
+
+    restore_assessment(assessment)
+
+    assert assessment.data == DATA
+    assert assessment.archived_at is None
+    assert not assessment.archive
+    assert Assessment.objects.get(pk=old_assessment.pk).data == DATA
+
+
+def test_archive_skips_recently_updated(old_assessment):
+    assert (
+        archive_assessment(
+            old_assessment.pk,
+            datetime.datetime(2019, 1, 1, tzinfo=datetime.UTC),
+        )
+        is None
+    )
+    assert Assessment.objects.get(pk=old_assessment.pk).archived_at is None
+
+
+def test_archive_skips_recently_restored(old_assessment):
+    archive_assessment(old_assessment.pk, timezone.now())
+    restore_assessment(Assessment.objects.get(pk=old_assessment.pk))
+    restored_at = Assessment.objects.get(pk=old_assessment.pk).restored_at
+
+    # Its updated_at is still old, but being restored counts.
+    day = datetime.timedelta(days=1)
+    assert archive_assessment(old_assessment.pk, restored_at - day) is None
+    assert archive_assessment(old_assessment.pk, restored_at + day) is not None
+
+
+def test_archive_skips_archived(old_assessment):
+    archive_assessment(old_assessment.pk, timezone.now())
+
+    assert archive_assessment(old_assessment.pk, timezone.now()) is None
+
+
+def test_restore_unarchived_assessment_does_nothing(old_assessment):
+    restore_assessment(old_assessment)
+
+    assert old_assessment.data == DATA
+
+
+def test_archived_assessment_must_have_a_file(old_assessment):
+    with pytest.raises(IntegrityError):
+        Assessment.objects.filter(pk=old_assessment.pk).update(
+            archived_at=timezone.now()
+        )
+
+
+def test_hot_table_size(old_assessment):
+    before = hot_table_size()
+    archive_assessment(old_assessment.pk, timezone.now())
+    after = hot_table_size()
+
+    assert after["data_bytes"] < before["data_bytes"]
+    assert after["total_bytes"] > 0
+
+
+@freeze_time("2021-06-01T12:00:00Z")
+def test_archive_command(old_assessment, capsys):
+    with freeze_time("2021-05-01T12:00:00Z"):
+        recent = AssessmentFactory.create(data=DATA)
+    complete = AssessmentFactory.create(data=DATA, status="Complete")
+    Assessment.objects.filter(pk=complete.pk).update(
+        updated_at=datetime.datetime(2019, 1, 1, tzinfo=datetime.UTC)
+    )
+
+    call_command("archive_assessments", "--months", "12", "--status", "Complete")
+
+    assert {a.pk for a in Assessment.objects.filter(archived_at__isnull=False)} == {
+        complete.pk
+    }
+    output = capsys.readouterr().out
+    assert "assessment data in table" in output
+    assert "1 assessments archived" in output
+
+    call_command("archive_assessments", "--months", "12")
+
+    assert {a.pk for a in Assessment.objects.filter(archived_at__isnull=False)} == {
+        complete.pk,
+        old_assessment.pk,
+    }
+    assert Assessment.objects.get(pk=recent.pk).archived_at is None
+
+
+def test_archive_command_dry_run(old_assessment, capsys):
+    call_command("archive_assessments", "--dry-run")
+
+    assert "1 assessments would be archived" in capsys.readouterr().out
+    assert Assessment.objects.get(pk=old_assessment.pk).archived_at is None
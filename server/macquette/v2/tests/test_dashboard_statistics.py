@@ -0,0 +1,223 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from freezegun import freeze_time
+
+from macquette.users.tests.factories import UserFactory
+
+from .. import VERSION
+from ..dashboard_statistics import (
+    buckets,
+    compact,
+    dashboard_context,
+    rebuild,
+    rebuild_logins,
+    record_change,
+)
+from ..models import Assessment, DashboardStatistic
+from .factories import AssessmentFactory, OrganisationFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _assessment(created, updated=None, **kwargs):
+    kwargs.setdefault("owner__last_login", None)
+    with freeze_time(created):
+        assessment = AssessmentFactory.create(**kwargs)
+    if updated is not None:
+        Assessment.objects.filter(pk=assessment.pk).update(updated_at=updated)
+        assessment.refresh_from_db()
+    return assessment
+
+
+def _context():
+    return {
+        key: value if isinstance(value, int) else list(value)
+        for key, value in dashboard_context().items()
+    }
+
+
+@pytest.fixture()
+def history():
+    organisation = OrganisationFactory.create(name="Carbon Co-op")
+    return [
+        _assessment("2022-01-10T12:00:00Z", status="Test"),
+        _assessment("2022-01-20T12:00:00Z"),
+        _assessment(
+            "2022-02-01T12:00:00Z",
+            datetime.datetime(2022, 3, 3, 13, tzinfo=datetime.UTC),
+            status="Complete",
+            organisation=organisation,
+        ),
+        _assessment(
+            "2022-11-01T12:00:00Z",
+            datetime.datetime(2023, 1, 2, 11, tzinfo=datetime.UTC),
+            status="Complete",
+        ),
+    ]
+
+
+@freeze_time("2023-02-01T12:00:00Z")
+def test_rebuild(history):
+    UserFactory.create(last_login=datetime.datetime(2023, 1, 15, tzinfo=datetime.UTC))
+    UserFactory.create(last_login=datetime.datetime(2021, 6, 1, tzinfo=datetime.UTC))
+
+    rebuild()
+    context = _context()
+
+    assert context["total_assessments"] == 4
+    assert context["assessments_by_month"] == [
+        {"month": datetime.date(2022, 1, 1), "count": 1},
+        {"month": datetime.date(2022, 2, 1), "count": 1},
+        {"month": datetime.date(2022, 11, 1), "count": 1},
+    ]
+    assert context["completed_assessments_by_updated_month"] == [
+        {"month": datetime.date(2022, 3, 1), "count": 1},
+        {"month": datetime.date(2023, 1, 1), "count": 1},
+    ]
+    assert [
+        (row["year"], row["organisation__name"], row["count"])
+        for row in context["assessments_by_year"]
+    ] == [
+        (datetime.date(2022, 1, 1), "Carbon Co-op", 1),
+        (datetime.date(2023, 1, 1), None, 1),
+    ]
+    assert context["duration_last60"] == [{"duration": 61, "count": 1}]
+    assert context["duration_prev60"] == []
+    # The history's assessments' owners have never logged in.
+    assert context["user_total_count"] == 6
+    assert context["user_recent_count"] == 5
+    assert [row["count"] for row in context["user_counts_by_login_month"]] == [
+        1,
+        1,
+        4,
+    ]
+
+
+def test_recorded_changes_match_rebuild(history):
+    rebuild_logins()
+    for assessment in history:
+        record_change([], buckets(assessment))
+
+    complete, in_progress = history[2], history[1]
+    before = buckets(complete)
+    complete.status = "In progress"
+    record_change(before, buckets(complete))
+
+    before = buckets(in_progress)
+    in_progress.status = "Complete"
+    in_progress.updated_at += datetime.timedelta(days=3)
+    record_change(before, buckets(in_progress))
+
+    record_change(buckets(history[0]), [])
+
+    recorded = _context()
+    compact()
+    assert _context() == recorded
+
+    Assessment.objects.filter(pk=complete.pk).update(status="In progress")
+    Assessment.objects.filter(pk=in_progress.pk).update(
+        status="Complete", updated_at=in_progress.updated_at
+    )
+    history[0].delete()
+    rebuild()
+    assert _context() == recorded
+
+
+def test_compact(history):
+    assessment = history[1]
+    record_change([], buckets(assessment))
+    for status in ["Complete", "In progress", "Complete"]:
+        before = buckets(assessment)
+        assessment.status = status
+        record_change(before, buckets(assessment))
+    assert DashboardStatistic.objects.count() == 10
+
+    call_command("refresh_dashboard_statistics")
+
+    assert sorted(
+        DashboardStatistic.objects.exclude(metric="last_login").values_list(
+            "metric", "status", "count"
+        )
+    ) == [("completed", "", 1), ("created", "Complete", 1)]
+
+
+def test_api_records_changes(client):
+    user = UserFactory.create()
+    client.force_login(user)
+
+    response = client.post(
+        reverse(f"{VERSION}:list-create-assessments"),
+        {"name": "test"},
+        content_type="application/json",
+    )
+    detail = reverse(
+        f"{VERSION}:retrieve-update-destroy-assessment",
+        kwargs={"pk": response.json()["id"]},
+    )
+    client.patch(detail, {"status": "Complete"}, content_type="application/json")
+
+    context = _context()
+    assert context["total_assessments"] == 1
+    assert context["duration_last60"] == [{"duration": 0, "count": 1}]
+
+    client.delete(detail)
+
+    context = _context()
+    assert context["total_assessments"] == 0
+    assert context["duration_last60"] == []
+
+
+def test_admin_records_changes(admin_client):
+    assessment = _assessment("2022-01-10T12:00:00Z")
+    record_change([], buckets(assessment))
+    change = reverse("admin:v2_assessment_change", args=[assessment.pk])
+
+    admin_client.post(
+        change,
+        {
+            "owner": assessment.owner_id,
+            "name": assessment.name,
+            "status": "Complete",
+            "data": "{}",
+        },
+    )
+
+    context = _context()
+    assert context["total_assessments"] == 1
+    assert len(context["completed_assessments_by_updated_month"]) == 1
+
+    admin_client.post(
+        reverse("admin:v2_assessment_changelist"),
+        {
+            "action": "delete_selected",
+            "_selected_action": [assessment.pk],
+            "post": "yes",
+        },
+    )
+
+    context = _context()
+    assert context["total_assessments"] == 0
+    assert context["completed_assessments_by_updated_month"] == []
+
+
+def test_dashboard_queries_do_not_depend_on_history(client):
+    client.force_login(UserFactory.create(is_staff=True))
+
+    def count_queries():
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse(f"{VERSION}:dashboard"))
+        assert response.status_code == 200
+        assert not any('"v2_assessment"' in query["sql"] for query in queries)
+        return len(queries)
+
+    empty = count_queries()
+    for month in range(1, 13):
+        _assessment(f"2022-{month:02}-01T12:00:00Z", status="Complete")
+    rebuild()
+
+    assert count_queries() == empty
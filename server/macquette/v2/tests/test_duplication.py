@@ -0,0 +1,29 @@
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from ..duplication import copy_stored_file
+
+
+def test_copy_on_filesystem(tmp_path):
+    storage = FileSystemStorage(location=tmp_path)
+    storage.save("images/a.jpg", ContentFile(b"image"))
+
+    copy_stored_file(storage, "images/a.jpg", "images/copies/b.jpg")
+
+    assert storage.open("images/copies/b.jpg").read() == b"image"
+
+
+def test_copy_on_s3_is_server_side():
+    storage = mock.Mock(spec=S3Boto3Storage, bucket_name="bucket", location="media")
+
+    copy_stored_file(storage, "images/a.jpg", "images/b.jpg")
+
+    storage.connection.meta.client.copy_object.assert_called_once_with(
+        Bucket="bucket",
+        Key="media/images/b.jpg",
+        CopySource={"Bucket": "bucket", "Key": "media/images/a.jpg"},
+    )
+    storage.open.assert_not_called()
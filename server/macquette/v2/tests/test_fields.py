@@ -0,0 +1,130 @@
+import orjson
+import pytest
+import zstandard
+from django.core.management import call_command
+from django.db import connection
+
+from ..fields import CompressedJSON, clear_caches, compress, decompress
+from ..models import Assessment, AssessmentRevision, CompressionDictionary
+from .factories import AssessmentFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    clear_caches()
+    yield
+    clear_caches()
+
+
+def _document(n):
+    return {
+        "master": {
+            "household": {"address_1": f"{n} Heathcliffe Terrace"},
+            "fabric": {
+                "elements": [
+                    {"id": i, "type": "wall", "uvalue": n / 100, "area": i * n}
+                    for i in range(20)
+                ]
+            },
+        }
+    }
+
+
+@pytest.fixture()
+def revision():
+    assessment = AssessmentFactory.create()
+    return AssessmentRevision.objects.create(
+        assessment=assessment, number=1, depth=0, data=_document(1), digest=""
+    )
+
+
+def test_roundtrip(revision):
+    revision = AssessmentRevision.objects.get(pk=revision.pk)
+
+    assert revision.data == _document(1)
+
+
+def test_stored_compressed(revision):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT data FROM v2_assessmentrevision WHERE id = %s", [revision.pk]
+        )
+        (blob,) = cursor.fetchone()
+
+    assert bytes(blob).startswith(zstandard.FRAME_HEADER)
+    assert decompress(bytes(blob)) == _document(1)
+
+
+def test_decompressed_lazily(revision, monkeypatch):
+    revision = AssessmentRevision.objects.get(pk=revision.pk)
+    assert isinstance(revision.__dict__["data"], CompressedJSON)
+
+    # Saving without reading the data writes back the same bytes
+    blob = revision.__dict__["data"].blob
+    monkeypatch.setattr("macquette.v2.fields.compress", None)
+    revision.digest = "changed"
+    revision.save()
+
+    assert (
+        AssessmentRevision.objects.values_list("data", flat=True)
+        .get(pk=revision.pk)
+        .blob
+        == blob
+    )
+
+
+def test_deferred_value_is_loaded_when_read(revision):
+    revision = AssessmentRevision.objects.defer("data").get(pk=revision.pk)
+
+    assert revision.get_deferred_fields() == {"data"}
+    assert revision.data == _document(1)
+    assert revision.get_deferred_fields() == set()
+
+
+def test_values_list_returns_compressed_values(revision):
+    value = AssessmentRevision.objects.values_list("data", flat=True).get()
+
+    assert isinstance(value, CompressedJSON)
+    assert value.load() == _document(1)
+
+
+def test_train_dictionary(revision):
+    owner = UserFactory.create()
+    Assessment.objects.bulk_create(
+        Assessment(owner=owner, name=f"{n}", data=_document(n)) for n in range(500)
+    )
+    without_dictionary = compress(_document(1))
+
+    call_command("train_compression_dictionary", "--size", "4")
+
+    dictionary = CompressionDictionary.objects.get()
+    with_dictionary = compress(_document(1))
+    assert zstandard.get_frame_parameters(with_dictionary).dict_id == (
+        dictionary.dict_id
+    )
+    assert len(with_dictionary) < len(without_dictionary)
+
+    # Values compressed before the dictionary existed can still be read,
+    # as can those compressed with it, by a process that hasn't seen it yet.
+    clear_caches()
+    assert decompress(without_dictionary) == _document(1)
+    assert decompress(with_dictionary) == _document(1)
+    assert AssessmentRevision.objects.get(pk=revision.pk).data == _document(1)
+
+
+def test_dictionary_trained_elsewhere_is_used_once_it_exists():
+    assert zstandard.get_frame_parameters(compress(_document(1))).dict_id == 0
+
+    # As if trained by another process, without clearing this one's caches.
+    dictionary = zstandard.train_dictionary(
+        4 * 1024, [orjson.dumps(_document(n)) for n in range(500)]
+    )
+    CompressionDictionary.objects.create(
+        dict_id=dictionary.dict_id(), data=dictionary.as_bytes()
+    )
+
+    compressed = compress(_document(1))
+    assert zstandard.get_frame_parameters(compressed).dict_id == dictionary.dict_id()
+    assert decompress(compressed) == _document(1)
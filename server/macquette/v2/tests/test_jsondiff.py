@@ -0,0 +1,52 @@
+import copy
+
+import orjson
+import pytest
+
+from .. import jsondiff
+
+CASES = [
+    ({}, {}),
+    ({"a": 1}, {"a": 2}),
+    ({"a": 1}, {"b": 1}),
+    ({"a": 1, "b": {"c": [1, 2]}}, {"a": 1, "b": {"c": [1, 2, 3]}}),
+    ({"a": [1, 2, 3]}, {"a": [1]}),
+    ({"a": [{"x": 1}, {"x": 2}]}, {"a": [{"x": 1}, {"x": 3, "y": None}]}),
+    ({"a": 1}, {"a": 1.0}),
+    ({"a": 1}, {"a": True}),
+    ({"a": {"b": 1}}, {"a": [1]}),
+    ([1, 2], {"1": 2}),
+    ("text", None),
+]
+
+
+@pytest.mark.parametrize(("old", "new"), CASES)
+def test_roundtrip(old, new):
+    patch = jsondiff.diff(old, new)
+
+    result = old if patch is None else jsondiff.apply(copy.deepcopy(old), patch)
+    # Compare the encoded values so that e.g. 1 and 1.0 aren't equal
+    assert orjson.dumps(result) == orjson.dumps(new)
+
+
+def test_no_patch_for_equal_values():
+    assert jsondiff.diff({"a": [1, {"b": None}]}, {"a": [1, {"b": None}]}) is None
+
+
+def test_only_changes_are_stored():
+    old = {"keep": "x" * 1000, "change": 1, "list": ["y" * 1000, 2]}
+    new = {"keep": "x" * 1000, "change": 2, "list": ["y" * 1000, 3]}
+
+    assert jsondiff.diff(old, new) == [
+        jsondiff.OBJECT,
+        {
+            "change": [jsondiff.REPLACE, 2],
+            "list": [jsondiff.ARRAY, 2, {"1": [jsondiff.REPLACE, 3]}],
+        },
+        [],
+    ]
+
+
+def test_unknown_patch_type():
+    with pytest.raises(ValueError):
+        jsondiff.apply({}, ["?"])
@@ -99,3 +99,34 @@ class TestOrganisationOwner:
                 owner_user=UserFactory.create(),
                 owner_organisation=OrganisationFactory.create(),
             )
+
+
+class TestLibraryItems:
+    def test_with_data_builds_data_in_the_same_query(self, django_assert_num_queries):
+        library = LibraryFactory.create(data={"a": {"name": "A"}, "b": {"name": "B"}})
+        empty = LibraryFactory.create()
+
+        with django_assert_num_queries(1):
+            libraries = {
+                lib.id: lib.data
+                for lib in Library.objects.with_data().filter(
+                    id__in=[library.id, empty.id]
+                )
+            }
+
+        assert libraries == {
+            library.id: {"a": {"name": "A"}, "b": {"name": "B"}},
+            empty.id: {},
+        }
+
+    def test_data_is_loaded_from_items_without_annotation(self):
+        library = LibraryFactory.create(data={"a": {"name": "A"}})
+
+        assert Library.objects.get(id=library.id).data == {"a": {"name": "A"}}
+
+    def test_tags_are_unique_within_a_library(self):
+        library = LibraryFactory.create(data={"a": {"name": "A"}})
+        LibraryFactory.create(data={"a": {"name": "A"}})
+
+        with pytest.raises(IntegrityError):
+            library.items.create(tag="a", data={"name": "again"})
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+from django.db import connection
+
+from macquette.users.tests.factories import UserFactory
+
+from ..models import Assessment, Library
+from ..views.helpers import get_assessments_for_user
+from .factories import AssessmentFactory, OrganisationFactory
+from .seed import seed_assessments, seed_libraries
+
+pytestmark = pytest.mark.django_db
+
+
+def _explain(queryset) -> dict:
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (VERBOSE, FORMAT JSON) {sql}", params)
+        (result,) = cursor.fetchone()
+
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]["Plan"]
+
+
+def _walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+def _index_names(plan: dict) -> set[str]:
+    return {node["Index Name"] for node in _walk(plan) if "Index Name" in node}
+
+
+@pytest.fixture()
+def seeded_user():
+    user = UserFactory.create()
+    others = UserFactory.create_batch(20)
+    organisation = OrganisationFactory.create(admins=[user])
+    other_organisations = OrganisationFactory.create_batch(9)
+
+    seed_assessments(
+        100_000,
+        owner_ids=[u.id for u in [user, *others]],
+        organisation_ids=[o.id for o in [organisation, *other_organisations]],
+    )
+    AssessmentFactory.create(shared_with=[user])
+
+    return user
+
+
+def test_assessment_access_query_does_not_deduplicate_full_rows(seeded_user):
+    plan = _explain(get_assessments_for_user(seeded_user))
+
+    for node in _walk(plan):
+        if node["Node Type"] in {"Unique", "Aggregate", "Sort", "SetOp"}:
+            outputs = node.get("Output", [])
+            assert not any(
+                column.endswith(".data") for column in outputs
+            ), f"{node['Node Type']} node carries the data column: {outputs}"
+
+
+def test_assessment_access_query_is_correct_on_seeded_data(seeded_user):
+    expected = Assessment.objects.filter(
+        id__in=[
+            *Assessment.objects.filter(owner=seeded_user).values_list("id", flat=True),
+            *Assessment.objects.filter(organisation__admins=seeded_user).values_list(
+                "id", flat=True
+            ),
+            *Assessment.objects.filter(shared_with=seeded_user).values_list(
+                "id", flat=True
+            ),
+        ]
+    ).count()
+
+    assert get_assessments_for_user(seeded_user).count() == expected
+
+
+def test_organisation_assessment_list_uses_composite_index(seeded_user):
+    organisation = seeded_user.v2_organisations_where_admin.get()
+    plan = _explain(
+        Assessment.objects.filter(organisation=organisation, owner=seeded_user)
+    )
+
+    assert "v2_assessment_org_owner" in _index_names(plan), plan
+
+
+def test_global_libraries_use_partial_index(user, organisation):
+    seed_libraries(50_000, owner_ids=[user.id], organisation_ids=[organisation.id])
+    plan = _explain(Library.objects.filter(owner_user=None, owner_organisation=None))
+
+    assert "v2_library_global" in _index_names(plan), plan
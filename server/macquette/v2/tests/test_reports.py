@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 import pytest
 
 from .. import reports
@@ -7,6 +10,24 @@ from .factories import (
 )
 
 
+def test_rendering_libraries_are_not_imported_at_startup():
+    # benchmarks/startup.py checks the whole worker; this checks that reports
+    # themselves don't pull the libraries in.
+    program = (
+        "import sys, django; django.setup();"
+        " import macquette.v2.reports, macquette.v2.models;"
+        " print(*sorted({'matplotlib', 'weasyprint', 'adjustText'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", program],  # noqa: S603
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == ""
+
+
 def test_basic_html_generation():
     result = reports.render_template(
         template="{{ text }}",
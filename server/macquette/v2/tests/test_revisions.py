@@ -0,0 +1,214 @@
+import copy
+
+import pytest
+from django.core.management import call_command
+from freezegun import freeze_time
+
+from ..revisions import data_digest, materialise, prune_revisions, record_revision
+from .factories import AssessmentFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _edit(assessment, n):
+    previous_data = copy.deepcopy(assessment.data)
+    assessment.data["master"]["counter"] = n
+    assessment.data["master"].setdefault("history", []).append(n)
+    assessment.save()
+    return record_revision(assessment, previous_data)
+
+
+@pytest.fixture()
+def interval(settings):
+    settings.ASSESSMENT_REVISION_KEYFRAME_INTERVAL = 4
+    return 4
+
+
+@pytest.fixture()
+def assessment():
+    assessment = AssessmentFactory.create(data={"master": {"name": "Master"}})
+    record_revision(assessment)
+    return assessment
+
+
+def test_first_revision_is_a_keyframe(assessment):
+    revision = assessment.revisions.get()
+
+    assert revision.number == 1
+    assert revision.is_keyframe
+    assert revision.data == assessment.data
+    assert revision.digest == data_digest(assessment.data)
+
+
+def test_unchanged_data_does_not_record_a_revision(assessment):
+    revision = record_revision(assessment, assessment.data)
+
+    assert revision.number == 1
+    assert assessment.revisions.count() == 1
+
+
+def test_keyframe_every_interval(interval, assessment):
+    for n in range(2, 11):
+        _edit(assessment, n)
+
+    depths = list(
+        assessment.revisions.order_by("number").values_list("depth", flat=True)
+    )
+    assert depths == [0, 1, 2, 3, 0, 1, 2, 3, 0, 1]
+    assert max(depths) <= interval - 1
+
+
+def test_every_revision_can_be_materialised(interval, assessment):
+    expected = {1: copy.deepcopy(assessment.data)}
+    for n in range(2, 11):
+        _edit(assessment, n)
+        expected[n] = copy.deepcopy(assessment.data)
+
+    for revision in assessment.revisions.all():
+        assert materialise(revision) == expected[revision.number]
+
+
+def test_materialise_reads_at_most_interval_rows(
+    interval, assessment, django_assert_num_queries
+):
+    for n in range(2, 11):
+        _edit(assessment, n)
+    revision = assessment.revisions.get(number=8)
+
+    with django_assert_num_queries(1) as captured:
+        materialise(revision)
+
+    assert f"LIMIT {revision.depth + 1}" in captured.captured_queries[0]["sql"]
+
+
+def test_records_keyframe_if_previous_data_does_not_match(assessment):
+    _edit(assessment, 2)
+
+    # Changed outside the API, so the previous data we have doesn't match
+    assessment.data["master"]["name"] = "Changed"
+    revision = record_revision(assessment, {"master": {}})
+
+    assert revision.is_keyframe
+    assert materialise(revision) == assessment.data
+
+
+def test_records_previous_data_if_there_are_no_revisions():
+    assessment = AssessmentFactory.create(data={"master": {"a": 1}})
+    previous_data = copy.deepcopy(assessment.data)
+    assessment.data["master"]["a"] = 2
+
+    revision = record_revision(assessment, previous_data)
+
+    assert revision.number == 2
+    assert revision.depth == 1
+    assert materialise(assessment.revisions.get(number=1)) == previous_data
+    assert materialise(revision) == assessment.data
+
+
+def test_prune_revisions_preserves_data(interval, assessment):
+    expected = {1: copy.deepcopy(assessment.data)}
+    for n in range(2, 13):
+        _edit(assessment, n)
+        expected[n] = copy.deepcopy(assessment.data)
+
+    keep = {2, 3, 7, 11, 12}
+    deleted = prune_revisions(assessment.id, keep)
+
+    assert deleted == 12 - len(keep)
+    revisions = list(assessment.revisions.order_by("number"))
+    assert [r.number for r in revisions] == sorted(keep)
+    assert [r.depth for r in revisions] == [0, 1, 2, 3, 0]
+    for revision in revisions:
+        assert materialise(revision) == expected[revision.number]
+
+    # New revisions carry on from the pruned chain
+    revision = _edit(assessment, 13)
+    assert revision.number == 13
+    assert revision.depth == 1
+
+
+def test_prune_revisions_with_identical_revisions(assessment):
+    original = copy.deepcopy(assessment.data)
+    _edit(assessment, 2)
+    previous_data = copy.deepcopy(assessment.data)
+    assessment.data = copy.deepcopy(original)
+    record_revision(assessment, previous_data)
+
+    prune_revisions(assessment.id, {1, 3})
+
+    assert materialise(assessment.revisions.get(number=3)) == original
+
+
+@freeze_time("2020-03-01T12:00:00Z")
+class TestCompactCommand:
+    @staticmethod
+    def _assessment_with_history():
+        with freeze_time("2020-01-01T08:00:00Z"):
+            assessment = AssessmentFactory.create(data={"master": {}})
+            record_revision(assessment)
+
+        # Three revisions a day for three days, then one this morning
+        for day in ["2020-01-01", "2020-01-02", "2020-01-03"]:
+            for hour in [9, 12, 15]:
+                with freeze_time(f"{day}T{hour}:00:00Z"):
+                    _edit(assessment, hour)
+        with freeze_time("2020-03-01T09:00:00Z"):
+            _edit(assessment, 0)
+
+        return assessment
+
+    @staticmethod
+    def _numbers(assessment):
+        return list(
+            assessment.revisions.order_by("number").values_list("number", flat=True)
+        )
+
+    def test_thins_to_the_last_revision_of_each_day(self):
+        assessment = self._assessment_with_history()
+
+        call_command("compact_assessment_revisions", "--thin-after", "30")
+
+        assert self._numbers(assessment) == [4, 7, 10, 11]
+
+    def test_deletes_old_revisions(self):
+        assessment = self._assessment_with_history()
+
+        call_command(
+            "compact_assessment_revisions",
+            "--thin-after",
+            "30",
+            "--delete-after",
+            "59",
+        )
+
+        # Revisions from before 2020-01-02T12:00 are deleted
+        assert self._numbers(assessment) == [7, 10, 11]
+        latest = assessment.revisions.get(number=11)
+        assert materialise(latest) == assessment.data
+
+    def test_keeps_latest_revision(self):
+        with freeze_time("2020-01-01T08:00:00Z"):
+            assessment = AssessmentFactory.create(data={"master": {}})
+            record_revision(assessment)
+            _edit(assessment, 2)
+
+        call_command("compact_assessment_revisions", "--delete-after", "30")
+
+        assert self._numbers(assessment) == [2]
+        assert materialise(assessment.revisions.get()) == assessment.data
+
+    def test_dry_run(self):
+        assessment = self._assessment_with_history()
+
+        call_command("compact_assessment_revisions", "--dry-run")
+
+        assert len(self._numbers(assessment)) == 11
+
+    def test_only_named_assessments(self):
+        assessment = self._assessment_with_history()
+        other = self._assessment_with_history()
+
+        call_command("compact_assessment_revisions", "--assessment", str(other.id))
+
+        assert len(self._numbers(assessment)) == 11
+        assert self._numbers(other) == [4, 7, 10, 11]
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+from django.conf import settings
+from django.core.management import CommandError, call_command
+
+from macquette.users.models import User
+
+from ..models import Assessment
+
+pytestmark = pytest.mark.django_db
+
+
+def _seed(tmp_path, **options):
+    output = tmp_path / "sessions.json"
+    call_command(
+        "seed_load_test_data",
+        assessors=2,
+        assessments=3,
+        background=10,
+        output=str(output),
+        **options,
+    )
+    return json.loads(output.read_text())
+
+
+def test_sessions_are_logged_in(client, tmp_path, settings):
+    settings.DEBUG = True
+
+    sessions = _seed(tmp_path)
+
+    assert len(sessions) == 2
+    assert Assessment.objects.count() == 2 * 3 + 10
+    for session in sessions:
+        client.cookies[settings.SESSION_COOKIE_NAME] = session["session"]
+        response = client.get("/v2/api/assessments/")
+        assert response.status_code == 200
+        assert {row["id"] for row in response.json()} >= {
+            f"{pk}" for pk in session["assessments"]
+        }
+
+        pk = session["assessments"][0]
+        response = client.post(
+            f"/v2/api/assessments/{pk}/reports/preview",
+            {"context": {"edit": 1}, "graphs": {}},
+            content_type="application/json",
+        )
+        assert response.status_code == 200
+        assert b"Edit 1" in response.content
+
+
+def test_data_from_a_previous_run_is_replaced(tmp_path, settings):
+    settings.DEBUG = True
+
+    _seed(tmp_path)
+    _seed(tmp_path)
+
+    assert User.objects.filter(username__startswith="loadtest-").count() == 2
+    assert Assessment.objects.count() == 2 * 3 + 10
+
+
+def test_refuses_to_run_without_debug(tmp_path):
+    assert not settings.DEBUG
+
+    with pytest.raises(CommandError, match="DEBUG is off"):
+        _seed(tmp_path)
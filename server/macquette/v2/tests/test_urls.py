@@ -26,6 +26,28 @@ def test_list_create_assessments(assessment: Assessment):
     )
 
 
+def test_search_assessments():
+    assert (
+        reverse(f"{VERSION}:search-assessments")
+        == f"/{VERSION}/api/assessments/search/"
+    )
+    assert (
+        resolve(f"/{VERSION}/api/assessments/search/").view_name
+        == f"{VERSION}:search-assessments"
+    )
+
+
+def test_import_assessments():
+    assert (
+        reverse(f"{VERSION}:import-assessments")
+        == f"/{VERSION}/api/assessments/import/"
+    )
+    assert (
+        resolve(f"/{VERSION}/api/assessments/import/").view_name
+        == f"{VERSION}:import-assessments"
+    )
+
+
 def test_assessment_detail_update_destroy(assessment: Assessment):
     assert (
         reverse(
@@ -40,6 +62,31 @@ def test_assessment_detail_update_destroy(assessment: Assessment):
     )
 
 
+def test_list_assessment_revisions(assessment: Assessment):
+    assert (
+        reverse(f"{VERSION}:list-assessment-revisions", kwargs={"pk": assessment.id})
+        == f"/{VERSION}/api/assessments/{assessment.id}/revisions/"
+    )
+    assert (
+        resolve(f"/{VERSION}/api/assessments/{assessment.id}/revisions/").view_name
+        == f"{VERSION}:list-assessment-revisions"
+    )
+
+
+def test_retrieve_assessment_revision(assessment: Assessment):
+    assert (
+        reverse(
+            f"{VERSION}:retrieve-assessment-revision",
+            kwargs={"pk": assessment.id, "number": 3},
+        )
+        == f"/{VERSION}/api/assessments/{assessment.id}/revisions/3/"
+    )
+    assert (
+        resolve(f"/{VERSION}/api/assessments/{assessment.id}/revisions/3/").view_name
+        == f"{VERSION}:retrieve-assessment-revision"
+    )
+
+
 def test_list_create_libraries():
     assert reverse(f"{VERSION}:list-create-libraries") == f"/{VERSION}/api/libraries/"
     assert (
@@ -48,6 +95,22 @@ def test_list_create_libraries():
     )
 
 
+def test_sync_libraries():
+    assert reverse(f"{VERSION}:sync-libraries") == f"/{VERSION}/api/libraries/sync/"
+    assert (
+        resolve(f"/{VERSION}/api/libraries/sync/").view_name
+        == f"{VERSION}:sync-libraries"
+    )
+
+
+def test_import_libraries():
+    assert reverse(f"{VERSION}:import-libraries") == f"/{VERSION}/api/libraries/import/"
+    assert (
+        resolve(f"/{VERSION}/api/libraries/import/").view_name
+        == f"{VERSION}:import-libraries"
+    )
+
+
 def test_update_destroy_library(library: Library):
     assert (
         reverse(f"{VERSION}:update-destroy-library", kwargs={"pk": library.id})
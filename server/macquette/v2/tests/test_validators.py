@@ -0,0 +1,69 @@
+import json
+import pathlib
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from ..validators import validate_assessment_data
+
+FIXTURES = pathlib.Path(__file__).resolve().parents[4] / "client" / "test" / "fixtures"
+
+
+@pytest.mark.parametrize("name", ["empty", "init", "floating-deductible"])
+def test_accepts_the_clients_fixtures(name):
+    with (FIXTURES / f"{name}.json").open() as f:
+        validate_assessment_data(json.load(f)["data"])
+
+
+def test_accepts_legacy_values():
+    validate_assessment_data(
+        {
+            "master": {
+                "scenario_name": 1,
+                "use_SHW": "1",
+                "custom_occupancy": "",
+                "TFA": "81.5",
+                "FEE": None,
+                "region_full": {"type": "user provided", "value": 3},
+                "unknown_field": {"anything": ["goes"]},
+            },
+            "scenario1": {},
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        ("not a dict", "This field is not a dict."),
+        ({"master": "not a scenario"}, "data.master must be object"),
+        ({"master": {"region": "3"}}, "data.master.region must be number"),
+        (
+            {"master": {"region_full": {"value": 3}}},
+            "data.master.region_full must contain ['type'] properties",
+        ),
+        (
+            {"master": {"floors": [{}] * 1001}},
+            "data.master.floors must contain less than or equal to 1000 items",
+        ),
+        (
+            {"master": {"household": {"commentary_brief": "x" * 100_001}}},
+            "data.master.household.commentary_brief must be shorter than or equal to"
+            " 100000 characters",
+        ),
+        (
+            {"master": {"model": {"outputs": [[0] * 1001]}}},
+            "data.master.model.outputs[0] must contain less than or equal to 1000"
+            " items",
+        ),
+        (
+            {f"scenario{n}": {} for n in range(51)},
+            "data must contain less than or equal to 50 properties",
+        ),
+    ],
+)
+def test_rejects(data, message):
+    with pytest.raises(ValidationError) as exc_info:
+        validate_assessment_data(data)
+
+    assert exc_info.value.messages == [message]
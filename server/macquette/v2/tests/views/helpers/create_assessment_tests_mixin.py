@@ -20,7 +20,7 @@ class CreateAssessmentTestsMixin:
         new_assessment = {
             "name": "test assessment 1",
             "description": "test description 1",
-            "data": {"foo": "baz"},  # data is specifically *not* returned
+            "data": {"master": {"foo": "baz"}},  # data is specifically *not* returned
         }
 
         with freeze_time("2019-06-01T16:35:34Z"):
@@ -85,7 +85,10 @@ class CreateAssessmentTestsMixin:
     def test_accepts_no_description(self):
         self.client.force_authenticate(self.user)
 
-        new_assessment = {"name": "test assessment 1", "data": {"foo": "baz"}}
+        new_assessment = {
+            "name": "test assessment 1",
+            "data": {"master": {"foo": "baz"}},
+        }
 
         response = self.post_to_create_endpoint(new_assessment)
 
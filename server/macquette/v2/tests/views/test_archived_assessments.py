@@ -0,0 +1,69 @@
+from django.test import override_settings
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from macquette.users.tests.factories import UserFactory
+
+from ... import VERSION
+from ...archive import archive_assessment
+from ...models import Assessment
+from ..factories import AssessmentFactory
+
+DATA = {"master": {"household": {"address_1": "1 Road"}, "fabric": {"x": 1}}}
+
+
+@override_settings(DEFAULT_FILE_STORAGE="django.core.files.storage.FileSystemStorage")
+class TestArchivedAssessments(APITestCase):
+    def setUp(self):
+        self.me = UserFactory.create()
+        self.client.force_authenticate(self.me)
+
+        with freeze_time("2020-01-01T12:00:00Z"):
+            self.assessment = AssessmentFactory.create(owner=self.me, data=DATA)
+        archive_assessment(self.assessment.pk, timezone.now())
+
+    def _archived_at(self):
+        return Assessment.objects.get(pk=self.assessment.pk).archived_at
+
+    def test_get_restores_data(self):
+        response = self.client.get(f"/{VERSION}/api/assessments/{self.assessment.pk}/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"] == DATA
+        assert response.json()["updated_at"] == "2020-01-01T12:00:00Z"
+        assert self._archived_at() is None
+
+    def test_patch_restores_data(self):
+        response = self.client.patch(
+            f"/{VERSION}/api/assessments/{self.assessment.pk}/",
+            {"name": "renamed"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assessment = Assessment.objects.get(pk=self.assessment.pk)
+        assert assessment.archived_at is None
+        assert assessment.data == DATA
+
+    def test_duplicate_copies_restored_data(self):
+        response = self.client.post(
+            f"/{VERSION}/api/assessments/{self.assessment.pk}/duplicate/"
+        )
+
+        copy = Assessment.objects.get(pk=response.json()["id"])
+        assert copy.data == DATA
+        assert copy.archived_at is None
+        assert not copy.archive
+
+    def test_delete_does_not_restore(self):
+        archive = Assessment.objects.get(pk=self.assessment.pk).archive
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                f"/{VERSION}/api/assessments/{self.assessment.pk}/"
+            )
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not archive.storage.exists(archive.name)
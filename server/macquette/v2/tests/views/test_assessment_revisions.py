@@ -0,0 +1,131 @@
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from macquette.users.tests.factories import UserFactory
+
+from ... import VERSION
+from .. import factories
+
+
+class TestAssessmentRevisions(APITestCase):
+    def setUp(self):
+        self.me = UserFactory.create()
+        self.client.force_authenticate(self.me)
+
+        with freeze_time("2020-01-01T09:00:00Z"):
+            response = self.client.post(
+                f"/{VERSION}/api/assessments/",
+                {"name": "test", "data": {"master": {"a": 1}}},
+                format="json",
+            )
+        self.assessment_id = response.json()["id"]
+
+    def _patch(self, data):
+        response = self.client.patch(
+            f"/{VERSION}/api/assessments/{self.assessment_id}/",
+            {"data": data},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_saving_data_records_revisions(self):
+        with freeze_time("2020-01-01T10:00:00Z"):
+            self._patch({"master": {"a": 2}})
+        # Saving the same data again doesn't record a revision
+        self._patch({"master": {"a": 2}})
+
+        response = self.client.get(
+            f"/{VERSION}/api/assessments/{self.assessment_id}/revisions/"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        owner = {"id": f"{self.me.id}", "name": self.me.name}
+        assert response.json() == [
+            {
+                "number": 2,
+                "created_at": "2020-01-01T10:00:00Z",
+                "created_by": owner,
+                "is_keyframe": False,
+            },
+            {
+                "number": 1,
+                "created_at": "2020-01-01T09:00:00Z",
+                "created_by": owner,
+                "is_keyframe": True,
+            },
+        ]
+
+    def test_other_fields_do_not_record_revisions(self):
+        self.client.patch(
+            f"/{VERSION}/api/assessments/{self.assessment_id}/",
+            {"name": "renamed"},
+            format="json",
+        )
+
+        response = self.client.get(
+            f"/{VERSION}/api/assessments/{self.assessment_id}/revisions/"
+        )
+
+        assert len(response.json()) == 1
+
+    def test_retrieve_revision(self):
+        self._patch({"master": {"a": 2, "b": [1, 2]}})
+        self._patch({"master": {"b": [1]}})
+
+        for number, expected in [
+            (1, {"master": {"a": 1}}),
+            (2, {"master": {"a": 2, "b": [1, 2]}}),
+            (3, {"master": {"b": [1]}}),
+        ]:
+            response = self.client.get(
+                f"/{VERSION}/api/assessments/{self.assessment_id}/revisions/{number}/"
+            )
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["number"] == number
+            assert response.json()["data"] == expected
+
+    def test_retrieve_missing_revision(self):
+        response = self.client.get(
+            f"/{VERSION}/api/assessments/{self.assessment_id}/revisions/2/"
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_duplicate_history_starts_from_copied_data(self):
+        self._patch({"master": {"a": 2}})
+        response = self.client.post(
+            f"/{VERSION}/api/assessments/{self.assessment_id}/duplicate/"
+        )
+        copy_id = response.json()["id"]
+
+        response = self.client.patch(
+            f"/{VERSION}/api/assessments/{copy_id}/",
+            {"data": {"master": {"a": 3}}},
+            format="json",
+        )
+
+        response = self.client.get(f"/{VERSION}/api/assessments/{copy_id}/revisions/")
+        assert [r["number"] for r in response.json()] == [2, 1]
+        response = self.client.get(f"/{VERSION}/api/assessments/{copy_id}/revisions/1/")
+        assert response.json()["data"] == {"master": {"a": 2}}
+
+    def test_cannot_see_revisions_of_other_peoples_assessments(self):
+        other = factories.AssessmentFactory.create()
+
+        for url in [
+            f"/{VERSION}/api/assessments/{other.pk}/revisions/",
+            f"/{VERSION}/api/assessments/{other.pk}/revisions/1/",
+        ]:
+            response = self.client.get(url)
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_must_be_logged_in(self):
+        self.client.logout()
+
+        response = self.client.get(
+            f"/{VERSION}/api/assessments/{self.assessment_id}/revisions/"
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
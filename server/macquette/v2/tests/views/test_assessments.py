@@ -1,5 +1,9 @@
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
 from django.db import connection
+from django.test import override_settings
 from django.test.utils import CaptureQueriesContext
 from freezegun import freeze_time
 from rest_framework import exceptions, status
@@ -8,7 +12,8 @@ from rest_framework.test import APITestCase
 from macquette.users.tests.factories import UserFactory
 
 from ... import VERSION
-from ...models import Assessment
+from ...duplication import copy_stored_file as real_copy_stored_file
+from ...models import Assessment, AssessmentSearchDocument
 from ..factories import AssessmentFactory, ImageFactory, OrganisationFactory
 from .helpers import CreateAssessmentTestsMixin
 
@@ -178,6 +183,208 @@ class TestListAssessments(APITestCase):
         assert len(captured_queries) < 6
 
 
+class TestListAssessmentsPaginationAndFiltering(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.me = UserFactory.create()
+        cls.assessments = []
+        for day in range(1, 6):
+            with freeze_time(f"2019-06-0{day}T12:00:00Z"):
+                cls.assessments.append(
+                    AssessmentFactory.create(owner=cls.me, name=f"House {day}")
+                )
+
+    def setUp(self):
+        self.client.force_authenticate(self.me)
+
+    def test_returns_plain_list_without_page_parameters(self):
+        response = self.client.get(f"/{VERSION}/api/assessments/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.data, list)
+        assert len(response.data) == 5
+
+    def test_pages_follow_updated_at_order_with_count(self):
+        response = self.client.get(f"/{VERSION}/api/assessments/?page_size=2")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 5
+        assert [a["name"] for a in response.data["results"]] == ["House 5", "House 4"]
+
+        seen = [a["name"] for a in response.data["results"]]
+        next_url = response.data["next"]
+        while next_url is not None:
+            response = self.client.get(next_url)
+            assert response.status_code == status.HTTP_200_OK
+            seen += [a["name"] for a in response.data["results"]]
+            next_url = response.data["next"]
+
+        assert seen == ["House 5", "House 4", "House 3", "House 2", "House 1"]
+
+    def test_ties_on_updated_at_are_broken_by_id(self):
+        with freeze_time("2019-07-01T12:00:00Z"):
+            tied = [AssessmentFactory.create(owner=self.me) for _ in range(3)]
+
+        response = self.client.get(f"/{VERSION}/api/assessments/?page_size=2")
+        first = [a["id"] for a in response.data["results"]]
+        response = self.client.get(response.data["next"])
+        second = [a["id"] for a in response.data["results"]]
+
+        assert first == [f"{tied[2].id}", f"{tied[1].id}"]
+        assert second[0] == f"{tied[0].id}"
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(f"/{VERSION}/api/assessments/?cursor=nonsense")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_invalid_page_size_returns_400(self):
+        response = self.client.get(f"/{VERSION}/api/assessments/?page_size=none")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_filters_by_status(self):
+        self.assessments[0].status = "Complete"
+        self.assessments[0].save()
+
+        response = self.client.get(f"/{VERSION}/api/assessments/?status=Complete")
+
+        assert [a["id"] for a in response.data] == [f"{self.assessments[0].id}"]
+
+    def test_rejects_unknown_status(self):
+        response = self.client.get(f"/{VERSION}/api/assessments/?status=Bogus")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_filters_by_owner(self):
+        someone_else = UserFactory.create()
+        shared = AssessmentFactory.create(owner=someone_else, shared_with=[self.me])
+
+        response = self.client.get(
+            f"/{VERSION}/api/assessments/?owner={someone_else.id}"
+        )
+
+        assert [a["id"] for a in response.data] == [f"{shared.id}"]
+
+    def test_filters_by_name_search(self):
+        response = self.client.get(f"/{VERSION}/api/assessments/?search=house 3")
+
+        assert [a["name"] for a in response.data] == ["House 3"]
+
+    def test_filters_apply_to_count(self):
+        response = self.client.get(
+            f"/{VERSION}/api/assessments/?search=house 3&page_size=10"
+        )
+
+        assert response.data["count"] == 1
+
+
+class TestSearchAssessments(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.me = UserFactory.create(name="Ada Lovelace")
+        cls.heathcliffe = AssessmentFactory.create(
+            owner=cls.me,
+            name="Retrofit plan",
+            description="",
+            data={
+                "master": {
+                    "household": {
+                        "address_1": "33 Heathcliffe Terrace",
+                        "address_town": "Higglesby",
+                        "address_postcode": "M1 6DD",
+                    }
+                }
+            },
+        )
+        cls.other = AssessmentFactory.create(
+            owner=cls.me, name="Heathcliffe survey", description=""
+        )
+        cls.not_mine = AssessmentFactory.create(name="Heathcliffe Terrace")
+
+    def setUp(self):
+        self.client.force_authenticate(self.me)
+
+    def search(self, q, **params):
+        return self.client.get(
+            f"/{VERSION}/api/assessments/search/", {"q": q, **params}
+        )
+
+    def test_matches_address_from_data(self):
+        response = self.search("higglesby")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [a["id"] for a in response.data["results"]] == [f"{self.heathcliffe.id}"]
+
+    def test_matches_word_prefixes(self):
+        response = self.search("heathcl terr m1")
+
+        assert [a["id"] for a in response.data["results"]] == [f"{self.heathcliffe.id}"]
+
+    def test_matches_owner_name(self):
+        response = self.search("lovelace")
+
+        assert response.data["count"] == 2
+
+    def test_only_returns_accessible_assessments(self):
+        response = self.search("heathcliffe")
+
+        assert {a["id"] for a in response.data["results"]} == {
+            f"{self.heathcliffe.id}",
+            f"{self.other.id}",
+        }
+
+    def test_is_paginated(self):
+        response = self.search("heathcliffe", page_size=1)
+
+        assert response.data["count"] == 2
+        assert len(response.data["results"]) == 1
+        assert response.data["next"] is not None
+
+    def test_follows_updates_to_the_address(self):
+        self.client.patch(
+            f"/{VERSION}/api/assessments/{self.other.id}/",
+            {"data": {"master": {"household": {"address_town": "Scarfolk"}}}},
+            format="json",
+        )
+
+        response = self.search("scarfolk")
+
+        assert [a["id"] for a in response.data["results"]] == [f"{self.other.id}"]
+
+    def test_other_data_changes_leave_the_search_document_alone(self):
+        def row_version():
+            # Changes whenever the row is rewritten.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT ctid FROM v2_assessmentsearchdocument"
+                    " WHERE assessment_id = %s",
+                    [self.heathcliffe.id],
+                )
+                return cursor.fetchone()
+
+        before = row_version()
+        data = {**self.heathcliffe.data, "scenario_a": {"fabric": {}}}
+        Assessment.objects.filter(pk=self.heathcliffe.id).update(data=data)
+
+        assert row_version() == before
+        assert (
+            AssessmentSearchDocument.objects.get(pk=self.heathcliffe.id).household
+            == self.heathcliffe.data["master"]["household"]
+        )
+
+    def test_requires_query(self):
+        response = self.client.get(f"/{VERSION}/api/assessments/search/")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_query_without_words_returns_nothing(self):
+        response = self.search("&&& !!")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 0
+
+
 class TestGetAssessment(APITestCase):
     @classmethod
     def setUpTestData(cls):
@@ -234,7 +441,7 @@ class TestGetAssessment(APITestCase):
             ],
             "data": {"foo": "bar"},
         }
-        assert expected == response.data
+        assert expected == response.json()
 
     def test_access_field_includes_owner(self):
         other1 = UserFactory.create()
@@ -390,7 +597,22 @@ class TestGetAssessment(APITestCase):
             "images": [],
             "data": {},
         }
-        assert expected == response.data
+        assert expected == response.json()
+
+    def test_data_is_passed_through_without_decoding(self):
+        a = AssessmentFactory.create(owner=self.me, data={"foo": ["bar", 1.5]})
+
+        self.client.force_authenticate(self.me)
+        with CaptureQueriesContext(connection) as captured_queries:
+            response = self.client.get(f"/{VERSION}/api/assessments/{a.pk}/")
+
+        assert response.status_code == status.HTTP_200_OK
+        # The JSON text as Postgres formats it, not as the renderer would
+        assert b'"data":{"foo": ["bar", 1.5]}' in response.content
+
+        for query in captured_queries:
+            sql = query["sql"].replace('("v2_assessment"."data")::text', "")
+            assert '"v2_assessment"."data"' not in sql
 
     def test_returns_404_for_bad_id(self):
         response = self.client.get(f"/{VERSION}/api/assessments/bad-id/")
@@ -473,7 +695,7 @@ class TestUpdateAssessment(APITestCase):
             response = self.client.patch(
                 f"/{VERSION}/api/assessments/{self.assessment.pk}/",
                 {
-                    "data": {"new": "data"},
+                    "data": {"master": {"new": "data"}},
                     "status": "Complete",
                 },
                 format="json",
@@ -483,7 +705,7 @@ class TestUpdateAssessment(APITestCase):
 
         updated_assessment = Assessment.objects.get(pk=self.assessment.pk)
 
-        assert updated_assessment.data == {"new": "data"}
+        assert updated_assessment.data == {"master": {"new": "data"}}
         assert updated_assessment.status == "Complete"
         assert updated_assessment.updated_at.isoformat() == "2019-07-13T12:10:12+00:00"
 
@@ -521,12 +743,31 @@ class TestUpdateAssessment(APITestCase):
             ]
         }
 
+    def test_fails_if_data_does_not_match_the_schema(self):
+        self.client.force_authenticate(self.me)
+        response = self.client.patch(
+            f"/{VERSION}/api/assessments/{self.assessment.pk}/",
+            {"data": {"master": {"floors": [{}] * 1001}}},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {
+            "data": [
+                exceptions.ErrorDetail(
+                    string="data.master.floors must contain less than or equal to"
+                    " 1000 items",
+                    code="invalid",
+                )
+            ]
+        }
+
     def test_update_assessment_data_fails_if_assessment_is_complete(self):
         self.assessment.status = "Complete"
         self.assessment.save()
 
         with freeze_time("2019-07-13T12:10:12Z"):
-            updateFields = {"data": {"new": "data"}}
+            updateFields = {"data": {"master": {"new": "data"}}}
 
             self.client.force_authenticate(self.me)
             response = self.client.patch(
@@ -763,6 +1004,109 @@ class TestDuplicateAssessment(APITestCase):
         assert response.status_code == status.HTTP_200_OK
         assert response.data["owner"]["id"] == str(self.other.id)
 
+    @override_settings(
+        DEFAULT_FILE_STORAGE="django.core.files.storage.FileSystemStorage"
+    )
+    def test_copies_data_and_images(self):
+        images = [
+            ImageFactory.create(
+                assessment=self.assessment,
+                image=ContentFile(f"image {n}".encode(), name=f"{n}.jpg"),
+                thumbnail=ContentFile(f"thumb {n}".encode(), name=f"{n}_thumb.jpg"),
+                note=f"image {n}",
+            )
+            for n in range(3)
+        ]
+        Assessment.objects.filter(pk=self.assessment.pk).update(
+            featured_image=images[1], data={"master": {"a": 1}}
+        )
+
+        self.client.force_authenticate(self.me)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/{VERSION}/api/assessments/{self.assessment.pk}/duplicate/"
+            )
+
+        copy = Assessment.objects.get(pk=response.data["id"])
+        assert copy.name == f"Copy of {self.assessment.name}"
+        assert copy.data == {"master": {"a": 1}}
+        assert copy.shared_with.count() == 0
+        copied_images = list(copy.images.order_by("note"))
+        assert [i.note for i in copied_images] == ["image 0", "image 1", "image 2"]
+        assert copy.featured_image == copied_images[1]
+        for n, image in enumerate(copied_images):
+            assert image.pk != images[n].pk
+            assert image.image.name != images[n].image.name
+            assert image.image.read() == f"image {n}".encode()
+            assert image.thumbnail.read() == f"thumb {n}".encode()
+
+        # The original is untouched
+        assert self.assessment.images.count() == 3
+        assert Assessment.objects.get(pk=self.assessment.pk).featured_image == images[1]
+
+    @override_settings(
+        DEFAULT_FILE_STORAGE="django.core.files.storage.FileSystemStorage"
+    )
+    def test_copies_images_only_on_commit(self):
+        ImageFactory.create(
+            assessment=self.assessment,
+            image=ContentFile(b"image", name="a.jpg"),
+            thumbnail=ContentFile(b"thumb", name="a_thumb.jpg"),
+        )
+
+        self.client.force_authenticate(self.me)
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(
+                f"/{VERSION}/api/assessments/{self.assessment.pk}/duplicate/"
+            )
+
+        image = Assessment.objects.get(pk=response.data["id"]).images.get()
+        assert not image.image.storage.exists(image.image.name)
+        assert not image.thumbnail.storage.exists(image.thumbnail.name)
+
+        for callback in callbacks:
+            callback()
+
+        assert image.image.read() == b"image"
+        assert image.thumbnail.read() == b"thumb"
+
+    @override_settings(
+        DEFAULT_FILE_STORAGE="django.core.files.storage.FileSystemStorage"
+    )
+    def test_drops_images_whose_files_cant_be_copied(self):
+        images = [
+            ImageFactory.create(
+                assessment=self.assessment,
+                image=ContentFile(f"image {n}".encode(), name=f"{n}.jpg"),
+                thumbnail=ContentFile(f"thumb {n}".encode(), name=f"{n}_thumb.jpg"),
+                note=f"image {n}",
+            )
+            for n in range(2)
+        ]
+        Assessment.objects.filter(pk=self.assessment.pk).update(
+            featured_image=images[1]
+        )
+
+        def copy_stored_file(storage, source, target):
+            if source == images[1].thumbnail.name:
+                raise OSError("copy failed")
+            real_copy_stored_file(storage, source, target)
+
+        self.client.force_authenticate(self.me)
+        with mock.patch(
+            "macquette.v2.duplication.copy_stored_file", copy_stored_file
+        ), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/{VERSION}/api/assessments/{self.assessment.pk}/duplicate/"
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        copy = Assessment.objects.get(pk=response.data["id"])
+        [image] = copy.images.all()
+        assert image.note == "image 0"
+        assert image.image.read() == b"image 0"
+        assert copy.featured_image is None
+
     def test_returns_404_if_user_is_not_owner(self):
         other_user = UserFactory.create()
         assessment_count = Assessment.objects.count()
@@ -81,7 +81,7 @@ class TestGetAssessmentPermissions(AssessmentPermissionTestsMixin, APITestCase):
 
 class TestUpdateAssessmentPermissions(AssessmentPermissionTestsMixin, APITestCase):
     def _call_endpoint(self, assessment):
-        update_fields = {"data": {"new": "data"}}
+        update_fields = {"data": {"master": {"new": "data"}}}
 
         return self.client.patch(
             f"/{VERSION}/api/assessments/{assessment.id}/", update_fields, format="json"
@@ -0,0 +1,116 @@
+import io
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from macquette.users.tests.factories import UserFactory
+
+from ... import VERSION
+from ...models import Assessment
+from ..factories import AssessmentFactory, ImageFactory, OrganisationFactory
+
+
+class TestDataIsNotSelected(APITestCase):
+    """
+    Views that don't use an assessment's data shouldn't read it from the
+    database, because it can be very large.
+    """
+
+    def setUp(self):
+        self.me = UserFactory.create()
+        self.organisation = OrganisationFactory.create()
+        self.organisation.members.add(self.me)
+        self.assessment = AssessmentFactory.create(
+            owner=self.me,
+            organisation=self.organisation,
+            data={"master": {"big": "x" * 1000}},
+        )
+        self.client.force_authenticate(self.me)
+
+    def assert_data_not_selected(self, method, url, status_code, **kwargs):
+        with CaptureQueriesContext(connection) as captured:
+            response = getattr(self.client, method)(url, **kwargs)
+
+        assert response.status_code == status_code, response.content
+        for query in captured.captured_queries:
+            if query["sql"].startswith("SELECT"):
+                assert '"v2_assessment"."data"' not in query["sql"], query["sql"]
+
+    def test_duplicate(self):
+        self.assert_data_not_selected(
+            "post",
+            f"/{VERSION}/api/assessments/{self.assessment.pk}/duplicate/",
+            status.HTTP_200_OK,
+        )
+        copy = Assessment.objects.exclude(pk=self.assessment.pk).get()
+        assert copy.data == self.assessment.data
+
+    def test_set_featured_image(self):
+        image = ImageFactory.create(assessment=self.assessment)
+
+        self.assert_data_not_selected(
+            "post",
+            f"/{VERSION}/api/assessments/{self.assessment.pk}/images/featured/",
+            status.HTTP_204_NO_CONTENT,
+            data={"id": image.pk},
+            format="json",
+        )
+
+    @override_settings(
+        DEFAULT_FILE_STORAGE="django.core.files.storage.FileSystemStorage"
+    )
+    def test_upload_image(self):
+        file = io.BytesIO()
+        Image.new("RGB", (10, 10)).save(file, "PNG")
+        file.name = "photo.png"
+        file.seek(0)
+
+        self.assert_data_not_selected(
+            "post",
+            f"/{VERSION}/api/assessments/{self.assessment.pk}/images/",
+            status.HTTP_200_OK,
+            data={"file": file},
+            format="multipart",
+        )
+
+    def test_share_and_unshare(self):
+        other = UserFactory.create()
+        self.organisation.members.add(other)
+        url = f"/{VERSION}/api/assessments/{self.assessment.pk}/shares/{other.pk}/"
+
+        self.assert_data_not_selected("put", url, status.HTTP_200_OK)
+        self.assert_data_not_selected("delete", url, status.HTTP_200_OK)
+
+    def test_edit_and_delete_image(self):
+        image = ImageFactory.create(assessment=self.assessment)
+        url = f"/{VERSION}/api/images/{image.pk}/"
+
+        self.assert_data_not_selected(
+            "patch", url, status.HTTP_200_OK, data={"note": "front"}, format="json"
+        )
+        self.assert_data_not_selected("delete", url, status.HTTP_204_NO_CONTENT)
+
+    def test_list_reports(self):
+        self.assert_data_not_selected(
+            "get",
+            f"/{VERSION}/api/assessments/{self.assessment.pk}/reports/",
+            status.HTTP_200_OK,
+        )
+
+    def test_delete_assessment(self):
+        self.assert_data_not_selected(
+            "delete",
+            f"/{VERSION}/api/assessments/{self.assessment.pk}/",
+            status.HTTP_204_NO_CONTENT,
+        )
+
+    def test_html_view(self):
+        self.client.force_login(self.me)
+
+        self.assert_data_not_selected(
+            "get", f"/{VERSION}/assessments/{self.assessment.pk}/", status.HTTP_200_OK
+        )
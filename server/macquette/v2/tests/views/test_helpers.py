@@ -1,7 +1,33 @@
-from ...views.helpers import build_static_dictionary
+import json
+
+import pytest
+from django.core.management import call_command
+
+from ...views.helpers import build_static_dictionary, static_urls_json
+
+
+@pytest.fixture()
+def manifest(settings, tmp_path):
+    settings.STATIC_URLS_MANIFEST = str(tmp_path / "static-urls.json")
+    static_urls_json.cache_clear()
+    yield tmp_path / "static-urls.json"
+    static_urls_json.cache_clear()
 
 
 def test_build_static_dictionary_returns_some_files():
     d = build_static_dictionary()
 
     assert len(d.keys()) > 10
+
+
+def test_static_urls_json_reads_the_manifest(manifest):
+    call_command("build_static_manifest")
+
+    assert json.loads(manifest.read_text()) == build_static_dictionary()
+    manifest.write_text('{"js/foo.js": "/static/js/foo.js"}')
+
+    assert static_urls_json() == '{"js/foo.js": "/static/js/foo.js"}'
+
+
+def test_static_urls_json_without_a_manifest(manifest):
+    assert json.loads(static_urls_json()) == build_static_dictionary()
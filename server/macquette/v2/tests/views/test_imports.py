@@ -0,0 +1,201 @@
+import gc
+import json
+import weakref
+from unittest import mock
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from macquette.users.tests.factories import UserFactory
+
+from ... import VERSION, imports
+from ...models import Assessment, AssessmentRevision, Library
+
+
+class TestImportLibraries(APITestCase):
+    url = f"/{VERSION}/api/libraries/import/"
+
+    def setUp(self):
+        self.me = UserFactory.create()
+        self.client.force_authenticate(self.me)
+
+    def post(self, body):
+        return self.client.generic(
+            "POST", self.url, body, content_type="application/json"
+        )
+
+    def test_creates_personal_libraries(self):
+        response = self.post(
+            json.dumps(
+                [
+                    {
+                        "name": "Walls",
+                        "type": "elements",
+                        "data": {"SWU_01": {"name": "Brick", "uvalue": 1.9}},
+                    },
+                    # The name and type can come after the items.
+                    {
+                        "data": {"DP_01": {"name": "Draught-proofing", "q50": 12}},
+                        "type": "draught_proofing_measures",
+                        "name": "Draughts",
+                    },
+                ]
+            )
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED, response.data
+        walls, draughts = (Library.objects.get(pk=id) for id in response.json()["ids"])
+        assert (walls.name, walls.type, walls.owner_user) == (
+            "Walls",
+            "elements",
+            self.me,
+        )
+        assert walls.data == {"SWU_01": {"name": "Brick", "uvalue": 1.9}}
+        assert (draughts.name, draughts.type) == (
+            "Draughts",
+            "draught_proofing_measures",
+        )
+        assert draughts.data == {"DP_01": {"name": "Draught-proofing", "q50": 12}}
+
+    def test_saves_items_in_batches(self):
+        imports.ITEM_BATCH_SIZE, batch_size = 2, imports.ITEM_BATCH_SIZE
+        try:
+            response = self.post(
+                json.dumps(
+                    [
+                        {
+                            "name": "Walls",
+                            "type": "elements",
+                            "data": {f"SWU_{n}": {"n": n} for n in range(5)},
+                        }
+                    ]
+                )
+            )
+        finally:
+            imports.ITEM_BATCH_SIZE = batch_size
+
+        assert response.status_code == status.HTTP_201_CREATED
+        [id] = response.json()["ids"]
+        assert Library.objects.get(pk=id).data == {
+            f"SWU_{n}": {"n": n} for n in range(5)
+        }
+
+    def test_saves_nothing_if_an_item_is_invalid(self):
+        response = self.post(
+            json.dumps(
+                [
+                    {"name": "Walls", "type": "elements", "data": {"SWU_01": {"a": 1}}},
+                    {"name": "Floors", "type": "elements", "data": {"FLR_01": {}}},
+                ]
+            )
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {
+            "1": {"data": {"FLR_01": {"item": ["This dictionary may not be empty."]}}}
+        }
+        assert not Library.objects.exists()
+
+    def test_rejects_libraries_without_a_name(self):
+        response = self.post(json.dumps([{"type": "elements", "data": {}}]))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"0": {"name": ["This field is required."]}}
+        assert not Library.objects.exists()
+
+    def test_rejects_bodies_that_are_not_arrays_of_objects(self):
+        for body, detail in [
+            ("", "Expected an array"),
+            ("{}", "Expected an array"),
+            ("[1]", {"0": ["Expected an object."]}),
+            (
+                '[{"name": "Walls", "type": "elements", "data": []}]',
+                "Expected an object",
+            ),
+        ]:
+            response = self.post(body)
+
+            assert response.status_code == status.HTTP_400_BAD_REQUEST, body
+            if isinstance(detail, str):
+                assert response.json() == {"detail": detail}, body
+            else:
+                assert response.json() == detail, body
+
+    def test_rejects_malformed_json(self):
+        for body in ['[{"name": NaN}]', '[{"name": "Walls"']:
+            response = self.post(body)
+
+            assert response.status_code == status.HTTP_400_BAD_REQUEST, body
+            assert response.json()["detail"].startswith("JSON parse error - "), body
+
+    def test_requires_login(self):
+        self.client.logout()
+
+        response = self.post("[]")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestImportAssessments(APITestCase):
+    url = f"/{VERSION}/api/assessments/import/"
+
+    def setUp(self):
+        self.me = UserFactory.create()
+        self.client.force_authenticate(self.me)
+
+    def post(self, body):
+        return self.client.generic(
+            "POST", self.url, body, content_type="application/json"
+        )
+
+    def test_creates_assessments_with_a_revision_each(self):
+        response = self.post(
+            json.dumps(
+                [
+                    {"name": "First", "data": {"master": {"scenario_name": "Base"}}},
+                    {"name": "Second", "description": "Empty"},
+                ]
+            )
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED, response.data
+        first, second = (Assessment.objects.get(pk=id) for id in response.json()["ids"])
+        assert (first.name, first.owner) == ("First", self.me)
+        assert first.data == {"master": {"scenario_name": "Base"}}
+        assert (second.name, second.description, second.data) == (
+            "Second",
+            "Empty",
+            {},
+        )
+        assert AssessmentRevision.objects.filter(assessment=first).count() == 1
+
+    def test_saves_nothing_if_an_assessment_is_invalid(self):
+        response = self.post(
+            json.dumps(
+                [
+                    {"name": "First"},
+                    {"name": "Second", "data": {"master": {"region": "3"}}},
+                ]
+            )
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"1": {"data": ["data.master.region must be number"]}}
+        assert not Assessment.objects.exists()
+
+    def test_lets_each_assessment_go_once_it_is_saved(self):
+        saved = []
+        alive = []
+
+        def record_revision(assessment, user):
+            saved.append(weakref.ref(assessment))
+            # An instance's FieldFiles refer back to it, so it's only freed by
+            # the cycle collector.
+            gc.collect()
+            alive.append(sum(ref() is not None for ref in saved))
+
+        with mock.patch.object(imports, "record_revision", record_revision):
+            response = self.post(json.dumps([{"name": f"{n}"} for n in range(3)]))
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert alive == [1, 1, 1]
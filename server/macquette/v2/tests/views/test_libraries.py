@@ -228,6 +228,115 @@ class TestListLibraries(APITestCase):
         response = self.client.get(f"/{VERSION}/api/libraries/")
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+    def test_can_list_without_data(self):
+        with freeze_time("2019-06-01T16:35:34Z"):
+            lib = LibraryFactory.create(owner_user=self.me, data={"a": {"b": "c"}})
+
+        self.client.force_authenticate(self.me)
+        response = self.client.get(f"/{VERSION}/api/libraries/?include_data=false")
+        assert response.status_code == status.HTTP_200_OK
+
+        assert response.data == [
+            {
+                "id": f"{lib.pk}",
+                "created_at": "2019-06-01T16:35:34Z",
+                "updated_at": "2019-06-01T16:35:34Z",
+                "name": lib.name,
+                "type": lib.type,
+                "permissions": {"can_write": True, "can_share": False},
+                "owner": {
+                    "id": f"{self.me.id}",
+                    "name": f"{self.me.name}",
+                    "type": "personal",
+                },
+            }
+        ]
+
+
+class TestSyncLibraries(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.me = UserFactory.create()
+
+    def _sync(self, known):
+        self.client.force_authenticate(self.me)
+        return self.client.post(
+            f"/{VERSION}/api/libraries/sync/", {"libraries": known}, format="json"
+        )
+
+    def test_returns_only_new_and_changed_libraries(self):
+        with freeze_time("2019-06-01T16:35:34Z"):
+            unchanged = LibraryFactory.create(owner_user=self.me)
+            changed = LibraryFactory.create(owner_user=self.me)
+            new = LibraryFactory.create(owner_user=None, owner_organisation=None)
+
+        with freeze_time("2019-07-13T12:10:12Z"):
+            changed.items.create(tag="new", data={"name": "item"})
+            changed.touch()
+
+        response = self._sync(
+            [
+                {"id": f"{unchanged.id}", "updated_at": "2019-06-01T16:35:34Z"},
+                {"id": f"{changed.id}", "updated_at": "2019-06-01T16:35:34Z"},
+            ]
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [lib["id"] for lib in response.data["changed"]] == [
+            f"{changed.id}",
+            f"{new.id}",
+        ]
+        assert response.data["changed"][0]["data"] == {"new": {"name": "item"}}
+        assert response.data["changed"][0]["updated_at"] == "2019-07-13T12:10:12Z"
+        assert response.data["deleted"] == []
+
+    def test_reports_deleted_and_inaccessible_libraries(self):
+        with freeze_time("2019-06-01T16:35:34Z"):
+            deleted = LibraryFactory.create(owner_user=self.me)
+            someone_elses = LibraryFactory.create()
+        deleted_id = deleted.id
+        deleted.delete()
+
+        response = self._sync(
+            [
+                {"id": f"{deleted_id}", "updated_at": "2019-06-01T16:35:34Z"},
+                {"id": f"{someone_elses.id}", "updated_at": "2019-06-01T16:35:34Z"},
+            ]
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "changed": [],
+            "deleted": [f"{deleted_id}", f"{someone_elses.id}"],
+        }
+
+    def test_reports_libraries_shared_and_unshared_with_my_organisation(self):
+        my_org = OrganisationFactory.create()
+        my_org.members.add(self.me)
+        with freeze_time("2019-06-01T16:35:34Z"):
+            shared = LibraryFactory.create()
+            unshared = LibraryFactory.create()
+        unshared.shared_with.add(my_org)
+        response = self._sync([])
+        known = [
+            {"id": lib["id"], "updated_at": lib["updated_at"]}
+            for lib in response.data["changed"]
+        ]
+        assert [lib["id"] for lib in known] == [f"{unshared.id}"]
+
+        shared.shared_with.add(my_org)
+        unshared.shared_with.remove(my_org)
+        response = self._sync(known)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [lib["id"] for lib in response.data["changed"]] == [f"{shared.id}"]
+        assert response.data["deleted"] == [f"{unshared.id}"]
+
+    def test_rejects_malformed_input(self):
+        response = self._sync([{"id": "one", "updated_at": "yesterday"}])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
 
 class TestCreateLibraries(APITestCase):
     @classmethod
@@ -384,14 +493,19 @@ class TestCreateLibraryItem(APITestCase):
         item_data = {"tag": "tag2", "item": {"name": "bar"}}
 
         self.client.force_authenticate(self.library.owner_user)
-        response = self.client.post(
-            f"/{VERSION}/api/libraries/{self.library.id}/items/",
-            item_data,
-            format="json",
-        )
+        with freeze_time("2019-06-01T16:35:34Z"):
+            response = self.client.post(
+                f"/{VERSION}/api/libraries/{self.library.id}/items/",
+                item_data,
+                format="json",
+            )
 
         assert response.status_code == status.HTTP_204_NO_CONTENT
 
+        retrieved = Library.objects.get(id=self.library.id)
+        assert retrieved.data == {"tag1": {"name": "foo"}, "tag2": {"name": "bar"}}
+        assert retrieved.updated_at.isoformat() == "2019-06-01T16:35:34+00:00"
+
     def test_create_library_item_fails_if_tag_already_exists(self):
         item_data = {"tag": "tag1", "item": {"name": "bar"}}
 
@@ -440,6 +554,7 @@ class TestUpdateDestroyLibraryItem(APITestCase):
         assert response.status_code == status.HTTP_204_NO_CONTENT
         retrieved = Library.objects.get(id=library.id)
         assert retrieved.data == {"tag1": replacement_data}
+        assert retrieved.updated_at.isoformat() == "2019-06-01T16:35:34+00:00"
 
     def test_update_library_item_fails_if_tag_doesnt_exist(self):
         library = LibraryFactory.create()
@@ -86,6 +86,26 @@ class TestListAssessmentsForOrganisation(APITestCase):
 
         assert expected_result == response.data.pop()
 
+    def test_paginates_and_filters_when_requested(self):
+        self.organisation.admins.add(self.org_member)
+        for day in range(1, 4):
+            with freeze_time(f"2019-06-0{day}T12:00:00Z"):
+                AssessmentFactory.create(
+                    organisation=self.organisation, status="Complete"
+                )
+        AssessmentFactory.create(organisation=self.organisation, status="Test")
+
+        self.client.force_authenticate(self.org_member)
+        response = self.client.get(
+            f"/{VERSION}/api/organisations/{self.organisation.pk}/assessments/",
+            {"status": "Complete", "page_size": 2},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 3
+        assert len(response.data["results"]) == 2
+        assert response.data["next"] is not None
+
     def test_returns_404_for_bad_organisation_id(self):
         self.client.force_authenticate(self.org_member)
         response = self.client.get(f"/{VERSION}/api/organisations/2/assessments/")
@@ -1,3 +1,4 @@
+from freezegun import freeze_time
 from rest_framework import status
 from rest_framework.test import APITestCase
 
@@ -36,6 +37,24 @@ class TestShareOrganisationLibrary(SetUpMixin, APITestCase):
         assert response.status_code == status.HTTP_204_NO_CONTENT
         assert self.library in self.other_org.libraries_shared_with.all()
 
+    def test_sharing_and_unsharing_change_updated_at(self):
+        self.client.force_authenticate(self.org_admin)
+        url = (
+            f"/{VERSION}/api/organisations/{self.my_org.id}/libraries/{self.library.id}"
+            f"/shares/{self.other_org.id}/"
+        )
+
+        for method, now in [
+            ("post", "2019-07-13T12:10:12Z"),
+            ("delete", "2019-08-01T09:00:00Z"),
+        ]:
+            with freeze_time(now):
+                response = getattr(self.client, method)(url)
+
+            assert response.status_code == status.HTTP_204_NO_CONTENT
+            self.library.refresh_from_db()
+            assert self.library.updated_at.isoformat() == now.replace("Z", "+00:00")
+
     def test_returns_204_if_sharing_library_thats_already_shared_with_organisation(
         self,
     ):
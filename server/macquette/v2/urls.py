@@ -5,10 +5,14 @@ from . import VERSION
 from .views import dashboards
 from .views.assessments import (
     DuplicateAssessment,
+    ImportAssessments,
+    ListAssessmentRevisions,
     ListCreateAssessmentReports,
     ListCreateAssessments,
     PreviewAssessmentReport,
+    RetrieveAssessmentRevision,
     RetrieveUpdateDestroyAssessment,
+    SearchAssessments,
     SetFeaturedImage,
     ShareUnshareAssessment,
     UploadAssessmentImage,
@@ -17,7 +21,9 @@ from .views.html import AssessmentHTMLView, ListAssessmentsHTMLView
 from .views.images import UpdateDestroyImage
 from .views.libraries import (
     CreateUpdateDeleteLibraryItem,
+    ImportLibraries,
     ListCreateLibraries,
+    SyncLibraries,
     UpdateDestroyLibrary,
 )
 from .views.organisations import (
@@ -47,6 +53,16 @@ urlpatterns = [
         view=ListCreateAssessments.as_view(),
         name="list-create-assessments",
     ),
+    path(
+        "api/assessments/search/",
+        view=SearchAssessments.as_view(),
+        name="search-assessments",
+    ),
+    path(
+        "api/assessments/import/",
+        view=ImportAssessments.as_view(),
+        name="import-assessments",
+    ),
     path(
         "api/assessments/<int:pk>/",
         view=RetrieveUpdateDestroyAssessment.as_view(),
@@ -57,6 +73,16 @@ urlpatterns = [
         view=DuplicateAssessment.as_view(),
         name="duplicate-assessment",
     ),
+    path(
+        "api/assessments/<int:pk>/revisions/",
+        view=ListAssessmentRevisions.as_view(),
+        name="list-assessment-revisions",
+    ),
+    path(
+        "api/assessments/<int:pk>/revisions/<int:number>/",
+        view=RetrieveAssessmentRevision.as_view(),
+        name="retrieve-assessment-revision",
+    ),
     path(
         "api/assessments/<int:pk>/shares/<int:userid>/",
         view=ShareUnshareAssessment.as_view(),
@@ -88,6 +114,16 @@ urlpatterns = [
         view=ListCreateLibraries.as_view(),
         name="list-create-libraries",
     ),
+    path(
+        "api/libraries/sync/",
+        view=SyncLibraries.as_view(),
+        name="sync-libraries",
+    ),
+    path(
+        "api/libraries/import/",
+        view=ImportLibraries.as_view(),
+        name="import-libraries",
+    ),
     path(
         "api/libraries/<int:pk>/",
         view=UpdateDestroyLibrary.as_view(),
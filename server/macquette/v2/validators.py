@@ -1,6 +1,43 @@
+import functools
+import json
+import pathlib
+from collections.abc import Callable
+
+import fastjsonschema
 from django.core.exceptions import ValidationError
 
+SCHEMAS_DIR = pathlib.Path(__file__).parent / "schemas"
+
+# The version of schemas/assessment-data-N.json that saves are checked against.
+ASSESSMENT_DATA_SCHEMA_VERSION = 1
+
 
 def validate_dict(value):
     if not isinstance(value, dict):
         raise ValidationError("This field is not a dict.")
+
+
+@functools.cache
+def assessment_data_validator(version: int) -> Callable[[dict], dict]:
+    """
+    Return a function that checks assessment data against a version of the
+    JSON Schema.
+
+    fastjsonschema generates and compiles Python code for the schema, which is
+    much faster to run than interpreting it, but takes a while, so it is only
+    done once per version per process.
+    """
+    with (SCHEMAS_DIR / f"assessment-data-{version}.json").open() as f:
+        return fastjsonschema.compile(json.load(f))
+
+
+def validate_assessment_data(value):
+    """
+    Check that assessment data is a dict of scenarios that the client will be
+    able to load, and that no part of it has grown unreasonably large.
+    """
+    validate_dict(value)
+    try:
+        assessment_data_validator(ASSESSMENT_DATA_SCHEMA_VERSION)(value)
+    except fastjsonschema.JsonSchemaValueException as e:
+        raise ValidationError(e.message) from e
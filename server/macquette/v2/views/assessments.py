@@ -1,8 +1,13 @@
 import io
 import os
 
-import PIL
+import orjson
+import PIL.Image
+import PIL.ImageOps
 from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import TextField
+from django.db.models.functions import Cast
 from django.http import HttpResponse
 from django.utils import timezone
 from rest_framework import exceptions, generics, parsers, serializers, status
@@ -10,7 +15,16 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from ..models import Assessment, Image, Report
+from macquette import metrics
+from macquette.parsers import StreamingJSONParser
+
+from ..archive import restore_assessment
+from ..dashboard_statistics import buckets, record_change
+from ..duplication import duplicate_assessment
+from ..filters import AssessmentFilter
+from ..imports import import_assessments
+from ..models import Assessment, AssessmentRevision, Image, Report
+from ..pagination import AssessmentKeysetPagination, AssessmentSearchPagination
 from ..permissions import (
     IsAdminOfConnectedOrganisation,
     IsAssessmentOwner,
@@ -18,23 +32,31 @@ from ..permissions import (
     IsMemberOfAssessmentOrganisation,
 )
 from ..reports import render_template, render_to_pdf
+from ..revisions import materialise, record_revision
+from ..search import search_assessments
 from ..serializers import (
+    AssessmentFullRawDataSerializer,
     AssessmentFullSerializer,
     AssessmentFullWithoutDataSerializer,
     AssessmentMetadataSerializer,
     AssessmentReportInputSerializer,
     AssessmentReportSerializer,
+    AssessmentRevisionDetailSerializer,
+    AssessmentRevisionSerializer,
     FeaturedImageSerializer,
     ImageSerializer,
     get_access,
 )
+from ..validators import validate_assessment_data
 from .helpers import get_assessments_for_user
-from .mixins import AssessmentQuerySetMixin
+from .mixins import AssessmentQuerySetMixin, AssessmentWithoutDataQuerySetMixin
 
 
 class ListCreateAssessments(AssessmentQuerySetMixin, generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = AssessmentMetadataSerializer
+    filter_backends = [AssessmentFilter]
+    pagination_class = AssessmentKeysetPagination
 
     def get_queryset(self, *args, **kwargs):
         queryset = super().get_queryset(*args, **kwargs)
@@ -45,7 +67,9 @@ class ListCreateAssessments(AssessmentQuerySetMixin, generics.ListAPIView):
         description = serializers.CharField(allow_blank=True, required=False)
         # SAFETY: this field shadows a property of the same name but with a
         # different type. This is fine at runtime but not in typechecking (yet).
-        data = serializers.JSONField(allow_null=True, default=dict)  # type: ignore[assignment]
+        data = serializers.JSONField(  # type: ignore[assignment]
+            allow_null=True, default=dict, validators=[validate_assessment_data]
+        )
 
     def post(self, request, *args, **kwargs):
         serializer = self.InputSerializer(data=request.data)
@@ -55,17 +79,86 @@ class ListCreateAssessments(AssessmentQuerySetMixin, generics.ListAPIView):
             **serializer.data,
             owner=request.user,
         )
+        record_revision(assessment, user=request.user)
+        record_change([], buckets(assessment))
 
         result = AssessmentMetadataSerializer(assessment)
         return Response(result.data, status=status.HTTP_201_CREATED)
 
 
+class ImportAssessments(APIView):
+    """
+    Create assessments from a JSON array of them, reading the body as it arrives
+    (see macquette.v2.imports).
+    """
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = [StreamingJSONParser]
+
+    def post(self, request):
+        ids = import_assessments(request.data, request)
+        return Response(
+            {"ids": [f"{id}" for id in ids]}, status=status.HTTP_201_CREATED
+        )
+
+
+class SearchAssessments(AssessmentQuerySetMixin, generics.ListAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = AssessmentMetadataSerializer
+    pagination_class = AssessmentSearchPagination
+
+    class InputSerializer(serializers.Serializer):
+        q = serializers.CharField()
+
+    def get_queryset(self, *args, **kwargs):
+        serializer = self.InputSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        queryset = super().get_queryset(*args, **kwargs)
+        return search_assessments(
+            queryset.prefetch_related("owner", "organisation").defer("data"),
+            serializer.validated_data["q"],
+        )
+
+
 class RetrieveUpdateDestroyAssessment(
     AssessmentQuerySetMixin, generics.RetrieveUpdateDestroyAPIView
 ):
     serializer_class = AssessmentFullSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self, *args, **kwargs):
+        queryset = super().get_queryset(*args, **kwargs)
+        if self.request.method == "GET":
+            # Pass `data` through as the JSON text Postgres gives us rather than
+            # decoding it only for the renderer to encode it again.
+            queryset = queryset.defer("data").annotate(
+                raw_data=Cast("data", output_field=TextField())
+            )
+        elif self.request.method == "DELETE":
+            queryset = queryset.defer("data")
+        return queryset
+
+    def get_serializer_class(self):
+        if self.request.method == "GET":
+            return AssessmentFullRawDataSerializer
+        return AssessmentFullSerializer
+
+    def get_object(self):
+        assessment = super().get_object()
+        if assessment.archived_at is not None and self.request.method != "DELETE":
+            restore_assessment(assessment)
+            if self.request.method == "GET":
+                assessment.raw_data = orjson.dumps(assessment.data).decode()
+        return assessment
+
+    def perform_destroy(self, instance):
+        archive = instance.archive
+        super().perform_destroy(instance)
+        record_change(buckets(instance), [])
+        if archive:
+            transaction.on_commit(lambda: archive.delete(save=False))
+
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop("partial", False)
         assessment = self.get_object()
@@ -88,7 +181,12 @@ class RetrieveUpdateDestroyAssessment(
             if not can_reassign:
                 return Response({"detail": message}, status.HTTP_400_BAD_REQUEST)
 
+        previous_data = assessment.data
+        previous_buckets = buckets(assessment)
         serializer.save()
+        if "data" in request.data:
+            record_revision(assessment, previous_data, user=request.user)
+        record_change(previous_buckets, buckets(assessment))
 
         non_data_fields = {*request.data.keys()} - {"data"}
         if len(non_data_fields) > 0:
@@ -102,7 +200,9 @@ class RetrieveUpdateDestroyAssessment(
             return Response(None, status.HTTP_204_NO_CONTENT)
 
 
-class ShareUnshareAssessment(AssessmentQuerySetMixin, generics.GenericAPIView):
+class ShareUnshareAssessment(
+    AssessmentWithoutDataQuerySetMixin, generics.GenericAPIView
+):
     permission_classes = [
         IsAuthenticated,
         IsInOrganisation,
@@ -136,23 +236,62 @@ class ShareUnshareAssessment(AssessmentQuerySetMixin, generics.GenericAPIView):
         return Response(get_access(assessment), status.HTTP_200_OK)
 
 
-class DuplicateAssessment(AssessmentQuerySetMixin, generics.GenericAPIView):
+class DuplicateAssessment(AssessmentWithoutDataQuerySetMixin, generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pk):
-        assessment = self.get_object()
+        original = self.get_object()
+        if original.archived_at is not None:
+            restore_assessment(original)
 
-        assessment.pk = None
-        assessment.name = f"Copy of {assessment.name}"
-        assessment.owner = request.user
-        assessment.save()
+        new_id = duplicate_assessment(
+            original, name=f"Copy of {original.name}", owner_id=request.user.pk
+        )
+        assessment = (
+            Assessment.objects.select_related("owner", "organisation")
+            .defer("data")
+            .get(pk=new_id)
+        )
+        record_change([], buckets(assessment))
 
         response = AssessmentMetadataSerializer(assessment).data
 
         return Response(response, status.HTTP_200_OK)
 
 
-class SetFeaturedImage(AssessmentQuerySetMixin, generics.GenericAPIView):
+class ListAssessmentRevisions(generics.ListAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = AssessmentRevisionSerializer
+
+    def get_queryset(self):
+        assessment = generics.get_object_or_404(
+            get_assessments_for_user(self.request.user), pk=self.kwargs["pk"]
+        )
+        return (
+            assessment.revisions.select_related("created_by")
+            .defer("data")
+            .order_by("-number")
+        )
+
+
+class RetrieveAssessmentRevision(generics.RetrieveAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = AssessmentRevisionDetailSerializer
+
+    def get_object(self):
+        assessment = generics.get_object_or_404(
+            get_assessments_for_user(self.request.user), pk=self.kwargs["pk"]
+        )
+        revision = generics.get_object_or_404(
+            AssessmentRevision.objects.select_related("created_by").defer("data"),
+            assessment=assessment,
+            number=self.kwargs["number"],
+        )
+        revision.full_data = materialise(revision)
+        return revision
+
+
+class SetFeaturedImage(AssessmentWithoutDataQuerySetMixin, generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pk):
@@ -169,20 +308,25 @@ class SetFeaturedImage(AssessmentQuerySetMixin, generics.GenericAPIView):
                 {"detail": "image ID doesn't exist"}, status.HTTP_400_BAD_REQUEST
             )
 
-        if image not in assessment.images.all():
+        if image.assessment_id != assessment.pk:
             return Response(
                 {"detail": "image ID provided doesn't belong to this assessment"},
                 status.HTTP_400_BAD_REQUEST,
             )
 
-        assessment.featured_image = image
+        previous_buckets = buckets(assessment)
         assessment.updated_at = timezone.now()
-        assessment.save(update_fields=["updated_at", "featured_image"])
+        Assessment.objects.filter(pk=assessment.pk).update(
+            featured_image=image, updated_at=assessment.updated_at
+        )
+        record_change(previous_buckets, buckets(assessment))
 
         return Response(None, status.HTTP_204_NO_CONTENT)
 
 
-class UploadAssessmentImage(AssessmentQuerySetMixin, generics.GenericAPIView):
+class UploadAssessmentImage(
+    AssessmentWithoutDataQuerySetMixin, generics.GenericAPIView
+):
     parser_class = [parsers.FileUploadParser]
     permission_classes = [IsAuthenticated]
 
@@ -235,18 +379,25 @@ class UploadAssessmentImage(AssessmentQuerySetMixin, generics.GenericAPIView):
         except PIL.UnidentifiedImageError:
             raise exceptions.ParseError(detail="Could not process image format")
 
-        self._make_thumbnail(image, record)
+        with metrics.IMAGE_PROCESSING_DURATION.time():
+            self._make_thumbnail(image, record)
         self._set_note(record)
         record.save()
         response = ImageSerializer(record).data
 
+        previous_buckets = buckets(assessment)
         assessment.updated_at = timezone.now()
-        assessment.save(update_fields=["updated_at"])
+        Assessment.objects.filter(pk=assessment.pk).update(
+            updated_at=assessment.updated_at
+        )
+        record_change(previous_buckets, buckets(assessment))
 
         return Response(response, status.HTTP_200_OK)
 
 
-class ListCreateAssessmentReports(AssessmentQuerySetMixin, generics.ListCreateAPIView):
+class ListCreateAssessmentReports(
+    AssessmentWithoutDataQuerySetMixin, generics.ListCreateAPIView
+):
     permission_classes = [
         IsAuthenticated,
         IsMemberOfAssessmentOrganisation,
@@ -261,7 +412,9 @@ class ListCreateAssessmentReports(AssessmentQuerySetMixin, generics.ListCreateAP
         serializer = AssessmentReportInputSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        assessment = get_assessments_for_user(request.user).get(pk=assessmentid)
+        assessment = (
+            get_assessments_for_user(request.user).defer("data").get(pk=assessmentid)
+        )
         organisation = assessment.organisation
 
         html = render_template(
@@ -296,7 +449,9 @@ class PreviewAssessmentReport(APIView):
         serializer = AssessmentReportInputSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        assessment = get_assessments_for_user(request.user).get(pk=assessmentid)
+        assessment = (
+            get_assessments_for_user(request.user).defer("data").get(pk=assessmentid)
+        )
         organisation = assessment.organisation
 
         html = render_template(
@@ -1,14 +1,16 @@
+import functools
+import json
 import logging
 import os
 from os.path import abspath, dirname, join
 
-from django.db.models import Q
+from django.conf import settings
 from django.templatetags.static import static
 from rest_framework.exceptions import NotAuthenticated, PermissionDenied
 
 from macquette.users import models as user_models
 
-from .. import VERSION, models
+from .. import models
 
 
 def build_static_dictionary():
@@ -29,6 +31,22 @@ def build_static_dictionary():
     return {filename: static(filename) for filename in find_app_static_files()}
 
 
+@functools.cache
+def static_urls_json() -> str:
+    """
+    returns build_static_dictionary() serialised as JSON, read from the manifest that
+    `manage.py build_static_manifest` writes at build time.
+
+    if there's no manifest, e.g. in development, the dictionary is built instead.
+    either way this only happens once per process.
+    """
+    try:
+        with open(settings.STATIC_URLS_MANIFEST) as f:
+            return f.read()
+    except FileNotFoundError:
+        return json.dumps(build_static_dictionary())
+
+
 def find_app_static_files():
     """
     traverses the directory tree inside {app}/static/{VERSION}, yielding filenames like
@@ -172,14 +190,28 @@ def check_assessment_reassign_permissions(assessment, request, user_id):
 
 
 def get_assessments_for_user(user: user_models.User):
-    """Return a list of all assessments a user can access."""
+    """Return a list of all assessments a user can access.
+
+    Access is resolved as a UNION of ID-only subqueries, each of which can be answered
+    from an index (owner, the shares through-table, organisation).  Filtering on
+    `id IN (...)` means we never need a DISTINCT over full rows, which would otherwise
+    drag the large `data` column through a hash or sort.
+    """
 
-    my_assessments = Q(owner=user)
-    assessments_shared_with_me = Q(shared_with=user)
-    in_organisations_i_administrate = Q(
-        organisation__in=getattr(user, f"{VERSION}_organisations_where_admin").all()
+    my_assessments = models.Assessment.objects.filter(owner=user).values("id")
+    assessments_shared_with_me = (
+        models.Assessment.shared_with.through._default_manager.filter(user=user).values(
+            "assessment_id"
+        )
     )
+    in_organisations_i_administrate = models.Assessment.objects.filter(
+        organisation__in=models.Organisation.admins.through._default_manager.filter(
+            user=user
+        ).values("organisation_id")
+    ).values("id")
 
     return models.Assessment.objects.filter(
-        my_assessments | in_organisations_i_administrate | assessments_shared_with_me
-    ).distinct()
+        id__in=my_assessments.union(
+            assessments_shared_with_me, in_organisations_i_administrate
+        )
+    )
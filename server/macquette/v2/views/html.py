@@ -1,32 +1,14 @@
-import json
-
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import DetailView
 from django.views.generic.base import TemplateView
-from waffle import get_waffle_flag_model
-from waffle.models import Sample, Switch
+
+from macquette.features import active_features
 
 from .. import VERSION
 from ..models import Assessment
-from .helpers import build_static_dictionary
-from .mixins import AssessmentQuerySetMixin
-
-STATIC_URLS = build_static_dictionary()
-
-
-def _waffle_features(request) -> list[str]:
-    """Get a list of enabled feature flags from Waffle."""
-    flags = get_waffle_flag_model().get_all()
-    flag_values = [f.name for f in flags if f.is_active(request)]
-
-    switches = Switch.get_all()
-    switch_values = [s.name for s in switches if s.is_active()]
-
-    samples = Sample.get_all()
-    sample_values = [s.name for s in samples if s.is_active()]
-
-    return [*flag_values, *switch_values, *sample_values]
+from .helpers import static_urls_json
+from .mixins import AssessmentWithoutDataQuerySetMixin
 
 
 class CommonContextMixin:
@@ -34,14 +16,17 @@ class CommonContextMixin:
         context = super().get_context_data(**kwargs)
         context["VERSION"] = VERSION
         context["appname"] = settings.APP_NAME
-        context["static_urls"] = json.dumps(STATIC_URLS, indent=4)
-        context["features"] = _waffle_features(self.request)
+        context["static_urls"] = static_urls_json()
+        context["features"] = sorted(active_features(self.request))
 
         return context
 
 
 class AssessmentHTMLView(
-    CommonContextMixin, AssessmentQuerySetMixin, LoginRequiredMixin, DetailView
+    CommonContextMixin,
+    AssessmentWithoutDataQuerySetMixin,
+    LoginRequiredMixin,
+    DetailView,
 ):
     template_name = f"{VERSION}/view.html"
     context_object_name = "assessment"
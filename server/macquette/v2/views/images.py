@@ -13,7 +13,7 @@ class UpdateDestroyImage(generics.GenericAPIView):
         image = self.get_object()
 
         allowed_assessments = helpers.get_assessments_for_user(request.user)
-        if image.assessment not in allowed_assessments:
+        if not allowed_assessments.filter(pk=image.assessment_id).exists():
             return Response(None, status.HTTP_403_FORBIDDEN)
 
         image.delete()
@@ -24,7 +24,7 @@ class UpdateDestroyImage(generics.GenericAPIView):
         image = self.get_object()
 
         allowed_assessments = helpers.get_assessments_for_user(request.user)
-        if image.assessment not in allowed_assessments:
+        if not allowed_assessments.filter(pk=image.assessment_id).exists():
             return Response(None, status.HTTP_403_FORBIDDEN)
 
         serializer = serializers.ImageUpdateSerializer(data=request.data)
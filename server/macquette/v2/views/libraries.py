@@ -1,51 +1,146 @@
-import json
 import logging
 
-from django.db.models import Q
-from rest_framework import exceptions, generics, status
+from django.db import IntegrityError, transaction
+from rest_framework import exceptions, generics, serializers, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from macquette.parsers import StreamingJSONParser
+
 from .. import VERSION
+from ..imports import import_libraries
 from ..models import Library
 from ..permissions import CanReadLibrary, CanWriteLibrary, IsReadRequest, IsWriteRequest
-from ..serializers import LibraryItemSerializer, LibrarySerializer
+from ..serializers import (
+    LibraryItemSerializer,
+    LibraryMetadataSerializer,
+    LibrarySerializer,
+)
 from .exceptions import BadRequest
-from .helpers import build_static_dictionary
-
-STATIC_URLS = build_static_dictionary()
 
 
 class MyLibrariesMixin:
     def my_libraries(self):
+        """
+        Return the libraries the current user can access.
+
+        Like `get_assessments_for_user`, this is an `id IN (...)` over a UNION of
+        ID-only subqueries so that each branch can use its own index (including
+        the partial index on global libraries) and no DISTINCT is needed.
+        """
         user = self.request.user
-        user_v_libraries = getattr(user, f"{VERSION}_libraries")
-        user_v_organisations = getattr(user, f"{VERSION}_organisations")
+        user_v_organisations = getattr(user, f"{VERSION}_organisations").values("id")
+
+        user_libraries = Library.objects.filter(owner_user=user).values("id")
+        org_libraries = Library.objects.filter(
+            owner_organisation__in=user_v_organisations
+        ).values("id")
+        shared_libraries = Library.shared_with.through._default_manager.filter(
+            organisation__in=user_v_organisations
+        ).values("library_id")
+        global_libraries = Library.objects.filter(
+            owner_user=None, owner_organisation=None
+        ).values("id")
+
+        return Library.objects.filter(
+            id__in=user_libraries.union(
+                global_libraries, shared_libraries, org_libraries
+            )
+        ).order_by("id")
 
-        user_libraries = Q(id__in=user_v_libraries.values("id"))
-        org_libraries = Q(owner_organisation__in=user_v_organisations.values("id"))
-        shared_libraries = Q(shared_with__in=user_v_organisations.values("id"))
-        global_libraries = Q(owner_user=None, owner_organisation=None)
 
-        return (
-            Library.objects.filter(
-                user_libraries | global_libraries | shared_libraries | org_libraries
-            )
-            .distinct()
-            .order_by("id")
-        )
+def _prefetch_owners(libraries):
+    # Used by LibrarySerializer's `owner` and `permissions` fields
+    return libraries.prefetch_related(
+        "owner_user",
+        "owner_organisation",
+        "owner_organisation__librarians",
+        "owner_organisation__admins",
+    )
 
 
 class ListCreateLibraries(MyLibrariesMixin, generics.ListCreateAPIView):
-    serializer_class = LibrarySerializer
     permission_classes = [IsAuthenticated]
 
+    class InputSerializer(serializers.Serializer):
+        include_data = serializers.BooleanField(default=True)
+
+    def include_data(self):
+        serializer = self.InputSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data["include_data"]
+
+    def get_serializer_class(self):
+        if self.request.method == "GET" and not self.include_data():
+            return LibraryMetadataSerializer
+        return LibrarySerializer
+
     def get_queryset(self, *args, **kwargs):
-        return self.my_libraries().prefetch_related(
-            "owner_user",
-            "owner_organisation",
-            "owner_organisation__librarians",
-            "owner_organisation__admins",
+        libraries = self.my_libraries()
+        if self.include_data():
+            libraries = libraries.with_data()
+        return _prefetch_owners(libraries)
+
+
+class SyncLibraries(MyLibrariesMixin, generics.GenericAPIView):
+    """
+    Return only the libraries that have changed since the client last saw them.
+
+    The client sends the `id` and `updated_at` of every library it has cached and
+    gets back every accessible library that it doesn't have or whose `updated_at`
+    differs, plus the IDs of cached libraries that it can no longer access.
+    Sharing or unsharing a library bumps its `updated_at` too.
+    """
+
+    serializer_class = LibrarySerializer
+    permission_classes = [IsAuthenticated]
+
+    class InputSerializer(serializers.Serializer):
+        class KnownLibrarySerializer(serializers.Serializer):
+            id = serializers.IntegerField()
+            updated_at = serializers.DateTimeField()
+
+        libraries = KnownLibrarySerializer(many=True)
+
+    def post(self, request):
+        serializer = self.InputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        known = {
+            library["id"]: library["updated_at"]
+            for library in serializer.validated_data["libraries"]
+        }
+        current = dict(self.my_libraries().values_list("id", "updated_at"))
+
+        changed_ids = [
+            id for id, updated_at in current.items() if known.get(id) != updated_at
+        ]
+        deleted_ids = sorted(known.keys() - current.keys())
+
+        changed = _prefetch_owners(
+            Library.objects.filter(id__in=changed_ids).with_data().order_by("id")
+        )
+        return Response(
+            {
+                "changed": self.get_serializer(changed, many=True).data,
+                "deleted": [f"{id}" for id in deleted_ids],
+            }
+        )
+
+
+class ImportLibraries(generics.GenericAPIView):
+    """
+    Create personal libraries from a JSON array of them, reading the body as it
+    arrives (see macquette.v2.imports).
+    """
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = [StreamingJSONParser]
+
+    def post(self, request):
+        ids = import_libraries(request.data, request)
+        return Response(
+            {"ids": [f"{id}" for id in ids]}, status=status.HTTP_201_CREATED
         )
 
 
@@ -85,7 +180,6 @@ class CreateUpdateDeleteLibraryItem(MyLibrariesMixin, generics.GenericAPIView):
     def post(self, request, pk):
         serializer = self.get_serializer_class()(data=request.data)
         if not serializer.is_valid():
-            print(serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         tag = serializer.validated_data["tag"]
@@ -93,48 +187,32 @@ class CreateUpdateDeleteLibraryItem(MyLibrariesMixin, generics.GenericAPIView):
 
         library = self.get_object()
 
-        if isinstance(library.data, str):
-            d = json.loads(library.data)
-        else:
-            d = library.data
-
-        if tag in d:
+        try:
+            with transaction.atomic():
+                library.items.create(tag=tag, data=item)
+        except IntegrityError:
             logging.warning(f"tag {tag} already exists in library {library.id}")
             raise BadRequest(f"tag `{tag}` already exists in library {library.id}")
 
-        d[tag] = item
-        library.data = d
-        library.save()
+        library.touch()
         return Response("", status=status.HTTP_204_NO_CONTENT)
 
     def delete(self, request, pk, tag):
         library = self.get_object()
 
-        if isinstance(library.data, str):
-            d = json.loads(library.data)
-        else:
-            d = library.data
-
-        if tag not in d:
+        deleted, _ = library.items.filter(tag=tag).delete()
+        if not deleted:
             raise exceptions.NotFound(f"tag `{tag}` not found in library {library.id}")
 
-        del d[tag]
-        library.data = d
-        library.save()
+        library.touch()
         return Response("", status=status.HTTP_204_NO_CONTENT)
 
     def put(self, request, pk, tag):
         library = self.get_object()
 
-        if isinstance(library.data, str):
-            d = json.loads(library.data)
-        else:
-            d = library.data
-
-        if tag not in d:
+        updated = library.items.filter(tag=tag).update(data=request.data)
+        if not updated:
             raise exceptions.NotFound(f"tag `{tag}` not found in library {library.id}")
 
-        d[tag] = request.data
-        library.data = d
-        library.save()
+        library.touch()
         return Response("", status=status.HTTP_204_NO_CONTENT)
@@ -4,3 +4,10 @@ from . import helpers
 class AssessmentQuerySetMixin:
     def get_queryset(self, *args, **kwargs):
         return helpers.get_assessments_for_user(self.request.user)
+
+
+class AssessmentWithoutDataQuerySetMixin(AssessmentQuerySetMixin):
+    """For views that don't use an assessment's data, which can be very large."""
+
+    def get_queryset(self, *args, **kwargs):
+        return super().get_queryset(*args, **kwargs).defer("data")
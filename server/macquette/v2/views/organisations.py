@@ -7,12 +7,16 @@ from rest_framework.views import APIView
 from macquette.users import services as user_services
 
 from .. import VERSION
+from ..dashboard_statistics import buckets, record_change
+from ..filters import AssessmentFilter
 from ..models import Assessment, Library, Organisation
+from ..pagination import AssessmentKeysetPagination
 from ..permissions import (
     IsAdminOfOrganisation,
     IsLibrarianOfOrganisation,
     IsMemberOfOrganisation,
 )
+from ..revisions import record_revision
 from ..serializers import (
     AssessmentMetadataSerializer,
     LibrarySerializer,
@@ -55,6 +59,8 @@ class ListCreateOrganisationAssessments(
 ):
     permission_classes = [IsAuthenticated, IsMemberOfOrganisation]
     serializer_class = AssessmentMetadataSerializer
+    filter_backends = [AssessmentFilter]
+    pagination_class = AssessmentKeysetPagination
 
     def get_queryset(self, **kwargs):
         try:
@@ -89,6 +95,8 @@ class ListCreateOrganisationAssessments(
             owner=request.user,
             organisation_id=self.kwargs["pk"],
         )
+        record_revision(assessment, user=request.user)
+        record_change([], buckets(assessment))
 
         result = AssessmentMetadataSerializer(assessment)
         return Response(result.data, status=status.HTTP_201_CREATED)
@@ -227,6 +235,7 @@ class ShareUnshareOrganisationLibraries(
         library = self._get_organisation_library(share_from_org, libraryid)
 
         library.shared_with.add(share_to_org)
+        library.touch()
         return Response("", status=status.HTTP_204_NO_CONTENT)
 
     def delete(self, request, pk, otherorgid, libraryid):
@@ -237,6 +246,7 @@ class ShareUnshareOrganisationLibraries(
         library = self._get_organisation_library(share_from_org, libraryid)
 
         library.shared_with.remove(share_to_org)
+        library.touch()
         return Response("", status=status.HTTP_204_NO_CONTENT)
 
 